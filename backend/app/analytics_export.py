@@ -0,0 +1,141 @@
+"""Columnar export of calls joined with their newest QA report.
+
+Rows come from a server-side cursor and are written as Parquet row groups
+or Arrow IPC record batches of `analytics_export_batch_rows` rows. Each
+group is handed to the response as soon as it is encoded. `qa_scores` is
+flattened into one float column per QA_SCORE_DIMENSIONS entry
+(`score_<dimension>`), so analysts get typed columns instead of JSON.
+"""
+import logging
+from typing import Any, Dict, Iterable, Iterator, List
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+from .config import settings
+from .models import Call, QAReport
+from .qa_service import QA_SCORE_DIMENSIONS
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+CALL_FIELDS = [
+    ("call_id", Call.id, pa.int64()),
+    ("project_id", Call.project_id, pa.int32()),
+    ("filename", Call.filename, pa.string()),
+    ("agent_name", Call.agent_name, pa.string()),
+    ("customer_name", Call.customer_name, pa.string()),
+    ("status", Call.status, pa.string()),
+    ("uploaded_at", Call.uploaded_at, TIMESTAMP),
+    ("processed_at", Call.processed_at, TIMESTAMP),
+    ("call_duration", Call.call_duration, pa.float64()),
+]
+
+REPORT_FIELDS = [
+    ("report_id", QAReport.id, pa.int64()),
+    ("overall_score", QAReport.overall_score, pa.float64()),
+    ("positive_count", QAReport.positive_count, pa.int32()),
+    ("negative_count", QAReport.negative_count, pa.int32()),
+    ("neutral_count", QAReport.neutral_count, pa.int32()),
+    ("model_used", QAReport.model_used, pa.string()),
+    ("pipeline_mode", QAReport.pipeline_mode, pa.string()),
+    ("prompt_version", QAReport.prompt_version, pa.string()),
+    ("processing_time_seconds", QAReport.processing_time_seconds, pa.float64()),
+    ("prompt_tokens", QAReport.prompt_tokens, pa.int64()),
+    ("completion_tokens", QAReport.completion_tokens, pa.int64()),
+    ("report_created_at", QAReport.created_at, TIMESTAMP),
+]
+
+SCORE_COLUMNS = [f"score_{dimension}" for dimension in QA_SCORE_DIMENSIONS]
+
+SCHEMA = pa.schema(
+    [pa.field(name, arrow_type) for name, _, arrow_type in CALL_FIELDS + REPORT_FIELDS]
+    + [pa.field(name, pa.float64()) for name in SCORE_COLUMNS]
+)
+
+def joined_rows(calls: Query) -> Query:
+    """Narrow a Call query to export columns, outer-joined with each call's newest report"""
+    db = calls.session
+    latest = db.query(QAReport.call_id, func.max(QAReport.id).label("report_id")).group_by(
+        QAReport.call_id
+    ).subquery()
+    columns = [column for _, column, _ in CALL_FIELDS + REPORT_FIELDS] + [QAReport.qa_scores]
+    return calls.outerjoin(latest, latest.c.call_id == Call.id).outerjoin(
+        QAReport, QAReport.id == latest.c.report_id
+    ).with_entities(*columns)
+
+def _score(scores: Any, dimension: str):
+    value = scores.get(dimension) if isinstance(scores, dict) else None
+    return float(value) if isinstance(value, (int, float)) else None
+
+def _record_batch(rows: List[tuple]) -> pa.RecordBatch:
+    width = len(CALL_FIELDS) + len(REPORT_FIELDS)
+    columns: Dict[str, list] = {name: [row[i] for row in rows] for i, name in enumerate(SCHEMA.names[:width])}
+    for dimension, name in zip(QA_SCORE_DIMENSIONS, SCORE_COLUMNS):
+        columns[name] = [_score(row[width], dimension) for row in rows]
+    return pa.RecordBatch.from_pydict(columns, schema=SCHEMA)
+
+def _batches(rows: Iterable[tuple]) -> Iterator[pa.RecordBatch]:
+    size = settings.analytics_export_batch_rows
+    pending: List[tuple] = []
+    for row in rows:
+        pending.append(row)
+        if len(pending) >= size:
+            yield _record_batch(pending)
+            pending = []
+    if pending:
+        yield _record_batch(pending)
+
+class _Sink:
+    """Write-only file object whose buffered bytes are drained after every row group"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+        self.position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+def stream(rows: Iterable[tuple], export_format: str) -> Iterator[bytes]:
+    """Encode rows as Parquet (one row group per batch) or an Arrow IPC stream"""
+    sink = _Sink()
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(sink, SCHEMA, compression="zstd")
+        write = writer.write_table
+        wrap = lambda batch: pa.Table.from_batches([batch])  # noqa: E731
+    else:
+        writer = pa.ipc.new_stream(sink, SCHEMA)
+        write = writer.write_batch
+        wrap = lambda batch: batch  # noqa: E731
+    batches = 0
+    for batch in _batches(rows):
+        write(wrap(batch))
+        batches += 1
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+    logger.info(f"Analytics export ({export_format}) finished: {batches} batches")
@@ -4,9 +4,12 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from .config import settings
-from .database import get_db
+from .database import get_async_db
+from .auth_cache import get_auth_cache
+from .hashing import get_hashing_pool
 import os
 import json
 from .models import User
@@ -43,16 +46,20 @@ def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    """bcrypt hash, computed on the hashing pool; raises HashingBusy when it is full"""
+    return get_hashing_pool().submit(pwd_context.hash, password).result()
 
-def get_user(db: Session, email: str):
-    return db.query(User).filter(User.email == email).first()
+async def get_user(db: AsyncSession, email: str):
+    return (await db.execute(select(User).where(User.email == email))).scalars().first()
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user(db, email)
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    # Turn a storm away before the lookup; bcrypt itself runs on the hashing pool.
+    # Both raise HashingBusy when the pool is full.
+    get_hashing_pool().ensure_capacity()
+    user = await get_user(db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await get_hashing_pool().run(verify_password, password, user.hashed_password):
         return False
     return user
 
@@ -66,12 +73,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    cache = get_auth_cache() if settings.auth_cache_enabled else None
+    if cache is not None:
+        user = cache.get(token)
+        if user is not None:
+            return user
+        generation = cache.generation()
     try:
         # Try validate with primary key, then optional secondary key (for rotation safety)
         payload = None
@@ -95,9 +108,13 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    user = get_user(db, email=token_data.email)
+    user = await get_user(db, email=token_data.email)
     if user is None:
         raise credentials_exception
+    if cache is not None:
+        # Detach so the cached row outlives this request's session
+        db.expunge(user)
+        cache.put(token, user, token_data.email, payload.get("exp"), generation)
     return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
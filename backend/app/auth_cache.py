@@ -0,0 +1,235 @@
+"""Cache of verified bearer tokens and the users they resolve to.
+
+get_current_user checks here before decoding the JWT and loading the user.
+Entries are keyed by a digest of the token, live for auth_cache_ttl_seconds
+but never past the token's own `exp`, and the cache is LRU bounded by
+auth_cache_max_entries. Cached users are detached User rows; treat them as
+read-only.
+
+Committing an ORM change to a user's role, company, active flag, email or
+password (or deleting the user) drops that user's entries. With
+auth_cache_pubsub enabled the drop is published on a pub/sub channel so
+every subscribed cache drops it too; the bundled LocalPubSub only reaches
+caches in this process and stands in for a shared broker (e.g. Redis
+pub/sub), which plugs in through set_pubsub.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+from sqlalchemy import event, inspect
+from .config import settings
+from .database import SessionLocal
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "auth-cache-invalidate"
+
+# Columns that change what a user may do, or which tokens resolve to them
+_WATCHED_ATTRIBUTES = ("role", "is_active", "company_id", "email", "hashed_password")
+
+class LocalPubSub:
+    """In-process publish/subscribe with the shape of a broker client"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Callable[[dict], None]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel: str, callback: Callable[[dict], None]):
+        with self._lock:
+            self._subscribers[channel].append(callback)
+
+    def publish(self, channel: str, message: dict):
+        with self._lock:
+            callbacks = list(self._subscribers[channel])
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.warning(f"Pub/sub subscriber on {channel} failed: {e}")
+
+class _Entry(NamedTuple):
+    user: User
+    email: str
+    expires_at: float
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+class AuthCache:
+    """LRU of token digest -> verified user, with per-user invalidation"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, pubsub=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.pubsub = pubsub
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._keys_by_email: Dict[str, Set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._generation = 0
+        if pubsub is not None:
+            pubsub.subscribe(INVALIDATION_CHANNEL, self._on_message)
+
+    def get(self, token: str) -> Optional[User]:
+        key = _digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.user
+
+    def generation(self) -> int:
+        """Invalidation counter; read it before loading the user and hand it to put()"""
+        with self._lock:
+            return self._generation
+
+    def put(self, token: str, user: User, email: str, exp: Optional[float], generation: int):
+        """Remember a verified token until the TTL or the token's `exp`, whichever is first.
+
+        Skipped if anything was invalidated since `generation` was read, as
+        the user may have been loaded before the change committed.
+        """
+        ttl = self.ttl_seconds
+        if exp is not None:
+            ttl = min(ttl, float(exp) - time.time())
+        if ttl <= 0:
+            return
+        key = _digest(token)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._remove(key)
+            self._entries[key] = _Entry(user, email, time.monotonic() + ttl)
+            self._keys_by_email[email].add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, email: str):
+        """Drop every cached token of this user, here and on subscribed caches"""
+        if self.pubsub is not None:
+            self.pubsub.publish(INVALIDATION_CHANNEL, {"email": email})
+        else:
+            self._drop_user(email)
+
+    def clear(self):
+        """Drop everything, here and on subscribed caches"""
+        if self.pubsub is not None:
+            self.pubsub.publish(INVALIDATION_CHANNEL, {"all": True})
+        else:
+            self._drop_all()
+
+    def _on_message(self, message: dict):
+        if message.get("all"):
+            self._drop_all()
+        elif message.get("email"):
+            self._drop_user(message["email"])
+
+    def _drop_user(self, email: str):
+        with self._lock:
+            for key in list(self._keys_by_email.get(email, ())):
+                self._remove(key)
+            self._generation += 1
+            self.invalidations += 1
+
+    def _drop_all(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_email.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_email.get(entry.email)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_email[entry.email]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "capacity": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+_pubsub = None
+_cache: Optional[AuthCache] = None
+_cache_lock = threading.Lock()
+
+def set_pubsub(pubsub):
+    """Use a shared broker for invalidations; call before the cache is first used"""
+    global _pubsub
+    _pubsub = pubsub
+
+def get_auth_cache() -> AuthCache:
+    """Process-wide cache, created lazily on first use"""
+    global _cache, _pubsub
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if settings.auth_cache_pubsub and _pubsub is None:
+                    _pubsub = LocalPubSub()
+                _cache = AuthCache(
+                    settings.auth_cache_max_entries,
+                    settings.auth_cache_ttl_seconds,
+                    _pubsub if settings.auth_cache_pubsub else None
+                )
+    return _cache
+
+def _changed_emails(user: User, deleted: bool) -> Set[str]:
+    state = inspect(user)
+    emails = {user.email} if user.email else set()
+    email_history = state.attrs.email.history
+    emails.update(value for value in email_history.deleted if value)
+    if deleted or any(state.attrs[name].history.has_changes() for name in _WATCHED_ATTRIBUTES):
+        return emails
+    return set()
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_user_changes(session, flush_context):
+    changed = session.info.setdefault("auth_cache_emails", set())
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            changed.update(_changed_emails(obj, deleted=False))
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            changed.update(_changed_emails(obj, deleted=True))
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidate_changed_users(session):
+    emails = session.info.pop("auth_cache_emails", None)
+    if not emails or _cache is None:
+        return
+    for email in emails:
+        _cache.invalidate_user(email)
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _discard_user_changes(session, previous_transaction):
+    session.info.pop("auth_cache_emails", None)
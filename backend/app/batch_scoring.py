@@ -0,0 +1,282 @@
+"""Bulk re-scoring through the OpenAI Batch API.
+
+Re-scoring a project after a rubric change would otherwise send one
+interactive request per call and run into rate limits. Instead, the latest
+transcript of every call is written as one request line (or one line per
+chunk for long transcripts) of a JSONL batch file, uploaded, and tracked
+until OpenAI reports the batch finished; the output file is then fanned back
+into new QAReport rows.
+"""
+import json
+import re
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from .config import settings
+from .clients import get_openai_client
+from .database import pipeline_session
+from .models import Call, QAReport, ReportTranscript, ScoringBatch
+from .llm_cache import cache_key, get_llm_cache
+from .qa_service import (
+    PROMPT_VERSION, feedback_messages, is_long_transcript, merge_chunk_feedback,
+    parse_feedback_content, split_transcript
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+SCORING_TEMPERATURE = 0.3
+PIPELINE_MODE = "batch"
+# Batches OpenAI will not progress any further
+FINISHED_STATUSES = {"completed", "failed", "expired", "cancelled"}
+OPEN_STATUSES = {"submitted", "validating", "in_progress", "finalizing", "cancelling"}
+# Held only inside the ingest transaction; never committed
+INGESTING_STATUS = "ingesting"
+
+_CUSTOM_ID = re.compile(r"^call-(\d+)-report-(\d+)-part-(\d+)-of-(\d+)$")
+
+def _chunks(transcript: str) -> List[str]:
+    if is_long_transcript(transcript):
+        return split_transcript(transcript, settings.long_transcript_chunk_tokens)
+    return [transcript]
+
+def _chunk_messages(chunks: List[str], index: int) -> List[Dict[str, str]]:
+    part = (index + 1, len(chunks)) if len(chunks) > 1 else None
+    return feedback_messages(chunks[index], part)
+
+def _source_text(report: QAReport) -> str:
+    return report.corrected_transcript or report.transcript
+
+def build_batch_lines(reports: List[QAReport], model: str) -> List[Dict[str, Any]]:
+    """One chat completion request per transcript chunk, in OpenAI batch format"""
+    lines = []
+    for report in reports:
+        chunks = _chunks(_source_text(report))
+        for index in range(len(chunks)):
+            lines.append({
+                "custom_id": f"call-{report.call_id}-report-{report.id}-part-{index + 1}-of-{len(chunks)}",
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": {
+                    "model": model,
+                    "temperature": SCORING_TEMPERATURE,
+                    "messages": _chunk_messages(chunks, index)
+                }
+            })
+    return lines
+
+def _latest_reports(db: Session, project_id: int, call_ids: Optional[List[int]]) -> List[QAReport]:
+    """Newest report with a transcript for each completed call not already queued"""
+    latest = db.query(func.max(QAReport.id).label("id")).join(Call, QAReport.call_id == Call.id).filter(
+        Call.project_id == project_id,
+        Call.status == "completed",
+        Call.scoring_batch_id.is_(None),
+        QAReport.transcript_blob.has(ReportTranscript.transcript.isnot(None))
+    )
+    if call_ids:
+        latest = latest.filter(Call.id.in_(call_ids))
+    latest = latest.group_by(QAReport.call_id).subquery()
+    return db.query(QAReport).options(selectinload(QAReport.transcript_blob)).filter(
+        QAReport.id.in_(db.query(latest.c.id))
+    ).order_by(QAReport.call_id).all()
+
+def submit_scoring_batches(db: Session, project_id: int, model: str,
+                           call_ids: Optional[List[int]] = None) -> List[ScoringBatch]:
+    """Queue every eligible call of a project for bulk re-scoring"""
+    reports = _latest_reports(db, project_id, call_ids)
+    batches = []
+    group: List[QAReport] = []
+    group_requests = 0
+    for report in reports:
+        requests = len(_chunks(_source_text(report)))
+        if group and group_requests + requests > settings.batch_scoring_max_requests:
+            batches.append(_submit_batch(db, project_id, model, group))
+            group, group_requests = [], 0
+        group.append(report)
+        group_requests += requests
+    if group:
+        batches.append(_submit_batch(db, project_id, model, group))
+    return batches
+
+def _submit_batch(db: Session, project_id: int, model: str, reports: List[QAReport]) -> ScoringBatch:
+    lines = build_batch_lines(reports, model)
+    batch = ScoringBatch(project_id=project_id, model=model, call_count=len(reports), request_count=len(lines))
+    db.add(batch)
+    db.flush()
+
+    client = get_openai_client()
+    payload = "\n".join(json.dumps(line) for line in lines).encode("utf-8")
+    input_file = client.files.create(file=(f"scoring-batch-{batch.id}.jsonl", payload), purpose="batch")
+    # openai 1.3.x has no batches resource; the raw endpoint behaves the same
+    remote = client.post("/batches", cast_to=Dict[str, Any], body={
+        "input_file_id": input_file.id,
+        "endpoint": BATCH_ENDPOINT,
+        "completion_window": settings.batch_scoring_completion_window,
+        "metadata": {"scoring_batch_id": str(batch.id), "project_id": str(project_id)}
+    })
+
+    batch.input_file_id = input_file.id
+    batch.openai_batch_id = remote["id"]
+    batch.status = remote.get("status", "validating")
+    call_ids = [report.call_id for report in reports]
+    db.query(Call).filter(Call.id.in_(call_ids)).update(
+        {Call.scoring_batch_id: batch.id}, synchronize_session=False
+    )
+    db.commit()
+    db.refresh(batch)
+    logger.info(f"Submitted scoring batch {batch.id} ({batch.openai_batch_id}): {len(reports)} calls, {len(lines)} requests")
+    return batch
+
+def refresh_scoring_batch(db: Session, batch: ScoringBatch) -> ScoringBatch:
+    """Pull the remote batch status and ingest the results once it has finished"""
+    if batch.status not in OPEN_STATUSES:
+        return batch
+    client = get_openai_client()
+    remote = client.get(f"/batches/{batch.openai_batch_id}", cast_to=Dict[str, Any])
+    status = remote.get("status", batch.status)
+    if status not in FINISHED_STATUSES:
+        batch.status = status
+        batch.output_file_id = remote.get("output_file_id")
+        batch.error_file_id = remote.get("error_file_id")
+        db.commit()
+        return batch
+
+    lines = _read_lines(client, remote.get("output_file_id")) + _read_lines(client, remote.get("error_file_id"))
+    # The claim shares the ingest transaction: another poller or refresh blocks on
+    # the row and then matches nothing, and a crash rolls the claim back with the
+    # reports, leaving the batch open for the next poll
+    claimed = db.query(ScoringBatch).filter(
+        ScoringBatch.id == batch.id, ScoringBatch.status.in_(OPEN_STATUSES)
+    ).update({ScoringBatch.status: INGESTING_STATUS}, synchronize_session=False)
+    if claimed != 1:
+        db.rollback()
+        db.refresh(batch)
+        return batch
+
+    batch.output_file_id = remote.get("output_file_id")
+    batch.error_file_id = remote.get("error_file_id")
+    if status != "completed":
+        errors = (remote.get("errors") or {}).get("data") or []
+        batch.error_message = "; ".join(e.get("message", "") for e in errors) or f"Batch {status}"
+    _ingest(db, batch, status, lines)
+    return batch
+
+def _read_lines(client, file_id: Optional[str]) -> List[Dict[str, Any]]:
+    if not file_id:
+        return []
+    text = client.files.content(file_id).text
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+def _ingest(db: Session, batch: ScoringBatch, status: str, lines: List[Dict[str, Any]]):
+    """Turn output lines into QAReport rows; calls without a usable result keep their old report.
+
+    Commits once, so the reports land together with the batch's final status.
+    """
+    parts: Dict[Tuple[int, int], Dict[int, Optional[Dict[str, Any]]]] = {}
+    expected: Dict[Tuple[int, int], int] = {}
+    for line in lines:
+        match = _CUSTOM_ID.match(line.get("custom_id", ""))
+        if not match:
+            continue
+        call_id, report_id, part, total = (int(g) for g in match.groups())
+        response = line.get("response") or {}
+        ok = response.get("status_code") == 200 and not line.get("error")
+        parts.setdefault((call_id, report_id), {})[part] = response.get("body") if ok else None
+        expected[(call_id, report_id)] = total
+
+    scored, failed = 0, 0
+    cacheable: List[Tuple[str, str]] = []
+    for (call_id, report_id), bodies in parts.items():
+        source = db.query(QAReport).filter(QAReport.id == report_id).first()
+        try:
+            if source is None:
+                raise ValueError(f"Source report {report_id} no longer exists")
+            if len(bodies) != expected[(call_id, report_id)] or any(b is None for b in bodies.values()):
+                raise ValueError("Batch request failed")
+            qa_result, prompt_tokens, completion_tokens = _merge_parts(source, bodies, batch.model, cacheable)
+        except Exception as e:
+            logger.error(f"Batch {batch.id} could not score call {call_id}: {e}")
+            db.query(Call).filter(Call.id == call_id).update(
+                {Call.error_message: f"Bulk re-scoring failed: {e}"}, synchronize_session=False
+            )
+            failed += 1
+            continue
+
+        db.add(QAReport(
+            call_id=call_id,
+            transcript=source.transcript,
+            corrected_transcript=source.corrected_transcript,
+            agent_summary=qa_result.get("agent_summary", ""),
+            qa_scores=qa_result.get("qa_scores", {}),
+            qa_feedback=qa_result.get("qa_feedback", ""),
+            overall_score=qa_result.get("overall_score", 0),
+            positive_count=qa_result.get("positive_count", 0),
+            negative_count=qa_result.get("negative_count", 0),
+            neutral_count=qa_result.get("neutral_count", 0),
+            model_used=batch.model,
+            processing_time_seconds=0,
+            pipeline_mode=PIPELINE_MODE,
+            prompt_version=PROMPT_VERSION,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens
+        ))
+        db.query(Call).filter(Call.id == call_id).update(
+            {Call.processed_at: datetime.now(), Call.error_message: None}, synchronize_session=False
+        )
+        scored += 1
+
+    # Anything still pointing at this batch got no result at all
+    missing = db.query(Call).filter(Call.scoring_batch_id == batch.id).count() - scored - failed
+    db.query(Call).filter(Call.scoring_batch_id == batch.id).update(
+        {Call.scoring_batch_id: None}, synchronize_session=False
+    )
+    batch.scored_count = scored
+    batch.failed_count = failed + max(missing, 0)
+    batch.completed_at = datetime.now()
+    batch.status = "ingested" if status == "completed" else status
+    db.commit()
+
+    if settings.llm_cache_enabled:
+        # Later interactive analyses of the same transcripts reuse the batch answers
+        cache = get_llm_cache()
+        for key, content in cacheable:
+            cache.store(key, batch.model, SCORING_TEMPERATURE, content)
+    logger.info(f"Ingested scoring batch {batch.id}: {scored} scored, {batch.failed_count} failed")
+
+def _merge_parts(source: QAReport, bodies: Dict[int, Dict[str, Any]], model: str,
+                 cacheable: List[Tuple[str, str]]):
+    chunks = _chunks(_source_text(source))
+    if len(chunks) != len(bodies):
+        # Chunking settings changed since submission; weight parts equally
+        chunks = [""] * len(bodies)
+    partials = []
+    prompt_tokens, completion_tokens = 0, 0
+    for index, part in enumerate(sorted(bodies)):
+        body = bodies[part]
+        content = body["choices"][0]["message"]["content"]
+        partials.append(parse_feedback_content(content))
+        usage = body.get("usage") or {}
+        prompt_tokens += usage.get("prompt_tokens", 0)
+        completion_tokens += usage.get("completion_tokens", 0)
+        if chunks[index]:
+            cacheable.append((cache_key(model, _chunk_messages(chunks, index), SCORING_TEMPERATURE), content))
+    if len(partials) == 1:
+        return partials[0], prompt_tokens, completion_tokens
+    weights = [max(len(chunk), 1) for chunk in chunks]
+    return merge_chunk_feedback(partials, weights, model), prompt_tokens, completion_tokens
+
+def poll_scoring_batches():
+    """Refresh every open batch; run from the scheduler"""
+    db = pipeline_session()
+    try:
+        batches = db.query(ScoringBatch).filter(ScoringBatch.status.in_(OPEN_STATUSES)).all()
+        for batch in batches:
+            try:
+                refresh_scoring_batch(db, batch)
+            except Exception as e:
+                logger.error(f"Failed to refresh scoring batch {batch.id}: {e}")
+                db.rollback()
+    finally:
+        db.close()
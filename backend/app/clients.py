@@ -0,0 +1,107 @@
+import threading
+import logging
+from typing import Any, Dict, Optional
+import boto3
+import httpx
+from botocore.config import Config
+from openai import OpenAI
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+class ClientRegistry:
+    """Long-lived, connection-pooled AWS and OpenAI clients shared by the process.
+
+    boto3 clients and the OpenAI client are thread-safe once built, but
+    building them resolves credentials and loads endpoint data, so each one
+    is created lazily exactly once and then reused by routers, the scheduler,
+    the transcription tracker and the analysis pipeline.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, factory):
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = factory()
+                    self._clients[name] = client
+                    logger.info(f"Created shared {name} client")
+        return client
+
+    def _boto_config(self) -> Config:
+        return Config(
+            region_name=settings.aws_region,
+            max_pool_connections=settings.aws_max_pool_connections,
+            retries={"max_attempts": settings.aws_max_retry_attempts, "mode": "standard"}
+        )
+
+    def s3(self):
+        return self._get("s3", lambda: boto3.client('s3', region_name=settings.aws_region, config=self._boto_config()))
+
+    def transcribe(self):
+        return self._get("transcribe", lambda: boto3.client('transcribe', region_name=settings.aws_region, config=self._boto_config()))
+
+    def openai(self) -> OpenAI:
+        return self._get("openai", self._build_openai)
+
+    def _build_openai(self) -> OpenAI:
+        from .qa_service import resolve_openai_api_key
+
+        openai_key = resolve_openai_api_key()
+        # Avoid logging secrets
+        if not openai_key:
+            logger.warning("OpenAI API key is not configured; QA feedback generation may fail.")
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_keepalive_connections
+            ),
+            timeout=settings.openai_request_timeout_seconds
+        )
+        return OpenAI(
+            api_key=openai_key,
+            base_url=settings.openai_base_url or None,
+            max_retries=settings.openai_max_retries,
+            timeout=settings.openai_request_timeout_seconds,
+            http_client=http_client
+        )
+
+    def close(self):
+        with self._lock:
+            client = self._clients.pop("openai", None)
+            self._clients.clear()
+        if client is not None:
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close OpenAI client: {e}")
+
+_registry: Optional[ClientRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_client_registry() -> ClientRegistry:
+    """Process-wide registry, created lazily on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ClientRegistry()
+    return _registry
+
+def get_s3_client():
+    return get_client_registry().s3()
+
+def get_transcribe_client():
+    return get_client_registry().transcribe()
+
+def get_openai_client() -> OpenAI:
+    return get_client_registry().openai()
+
+def close_clients():
+    if _registry is not None:
+        _registry.close()
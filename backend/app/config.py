@@ -5,27 +5,109 @@ import os
 class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./qa_system.db"
+    # Connection pool for API requests
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    # Separate pool for pipeline, dispatcher and scheduler sessions
+    db_pipeline_pool_size: int = 5
+    db_pipeline_max_overflow: int = 5
     
     # JWT
     secret_key: str = "your-secret-key-here"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # Verified-token cache in front of get_current_user; entries never outlive the token's exp
+    auth_cache_enabled: bool = True
+    auth_cache_max_entries: int = 10000
+    auth_cache_ttl_seconds: float = 60.0
+    # Publish user invalidations on a pub/sub channel (see app.auth_cache.set_pubsub)
+    auth_cache_pubsub: bool = False
+    # bcrypt hashing/verification pool; logins beyond workers + max_queued get a 429
+    password_hash_workers: int = 2
+    password_hash_max_queued: int = 16
     
     # AWS
     aws_region: str = "us-east-1"
     aws_s3_bucket_input: str = "qa-system-input"
     aws_s3_bucket_output: str = "qa-system-output"
+    # Shared boto3 clients: connection pool size per client and retry budget
+    aws_max_pool_connections: int = 50
+    aws_max_retry_attempts: int = 3
     
     # OpenAI
     openai_api_key: str = ""
     openai_max_retries: int = 3
     openai_backoff_base_seconds: float = 2.0
     openai_request_timeout_seconds: int = 45
+    openai_base_url: str = ""
+    # Connection pool limits, applied to both the sync and the async client
+    openai_max_connections: int = 100
+    openai_max_keepalive_connections: int = 20
+    # Async path: one pooled AsyncOpenAI client shared by the whole process
+    openai_async_enabled: bool = False
+    openai_async_max_concurrency: int = 200
+    
+    # LLM response cache: in-memory LRU backed by the llm_cache_entries table
+    llm_cache_enabled: bool = True
+    llm_cache_memory_entries: int = 1024
+    llm_cache_max_rows: int = 100000
+    
+    # Long transcripts are split on speaker turns and scored chunk by chunk
+    long_transcript_threshold_tokens: int = 12000
+    long_transcript_chunk_tokens: int = 4000
+    long_transcript_chunk_workers: int = 16
+    
+    # Dispatcher: continuously claims uploaded calls sized to free pipeline capacity.
+    # Off by default: when on, every uploaded call goes through Transcribe and OpenAI
+    # without anyone asking for it. Set DISPATCHER_ENABLED=true to opt in.
+    dispatcher_enabled: bool = False
+    dispatcher_max_claim: int = 100
+    # Calls younger than this may still be uploading to S3
+    dispatcher_min_age_seconds: int = 300
+    dispatcher_idle_seconds: float = 0.5
+    dispatcher_max_idle_seconds: float = 15.0
+    # Calls still processing this long after transcribe_max_wait_seconds were lost with
+    # their worker (restart, crash) and go back to uploaded; process-pending does the same
+    dispatcher_stale_claim_margin_seconds: int = 1800
+    
+    # Bulk re-scoring through the OpenAI Batch API
+    batch_scoring_max_requests: int = 50000
+    batch_scoring_completion_window: str = "24h"
+    batch_scoring_poll_interval_seconds: int = 300
+    # Scheduler job that ingests finished batches; off = refresh by hand via /scoring-batches/{id}/refresh
+    batch_scoring_poll_enabled: bool = True
     
     # Transcribe
     transcribe_max_wait_seconds: int = 900
     transcribe_poll_interval_seconds: float = 5.0
     
+    # Analysis pipeline: per-stage worker limits and admission cap
+    pipeline_max_in_flight: int = 500
+    pipeline_transcribe_start_workers: int = 4
+    pipeline_transcript_wait_limit: int = 200
+    pipeline_llm_correction_workers: int = 8
+    pipeline_llm_scoring_workers: int = 8
+    pipeline_db_write_workers: int = 2
+    # two_pass (correct, then score), single_pass (one structured call) or score_only
+    pipeline_default_mode: str = "two_pass"
+    
+    # /calls/upload-url/batch and /calls/analyze/batch: files or call ids per request
+    upload_batch_max_files: int = 5000
+    # /calls/page include_total: exact counts stop here outside PostgreSQL
+    calls_page_count_cap: int = 10000
+    # /calls/export: rows fetched per server-side cursor batch and per streamed chunk
+    calls_export_batch_size: int = 1000
+    # /calls/export/analytics: rows per Parquet row group / Arrow record batch
+    analytics_export_batch_rows: int = 50000
+    # /dashboard stats and agent performance: cached per tenant + filters, dropped when
+    # that tenant's calls or reports change; the TTL bounds staleness from other instances
+    dashboard_cache_enabled: bool = True
+    dashboard_cache_max_entries: int = 2048
+    dashboard_cache_ttl_seconds: float = 300.0
+    
     # CORS
     allowed_origins: List[str] = ["http://localhost:3000"]
     
@@ -0,0 +1,159 @@
+"""Result cache for the dashboard endpoints.
+
+Entries are keyed by endpoint, tenant and normalized filters, plus the
+tenant's data version. Every flush through SessionLocal that adds, changes
+or deletes a call or a QA report (uploads, analysis results, re-scoring),
+or moves a project to another company, bumps the version of the companies
+it touched (before and after a move) when it commits, so later
+lookups miss and re-aggregate. Admins see every tenant and key on a global
+version bumped by any such commit.
+
+Versions are per process. Entries also expire after
+dashboard_cache_ttl_seconds, which bounds staleness from writes made by
+other instances or by bulk UPDATEs that bypass the ORM.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, NamedTuple, Optional, Set, Tuple
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+from .config import settings
+from .database import SessionLocal
+from .models import Call, Project, QAReport, User
+
+ALL_TENANTS = "all"
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    expires_at: float
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def serialize(value) -> bytes:
+    """Compact JSON body for a response model (or list of them)"""
+    return json.dumps(jsonable_encoder(value), separators=(",", ":")).encode()
+
+def normalize_filters(**filters) -> Tuple:
+    """Filters in a canonical form, so equivalent requests share an entry"""
+    normalized = []
+    for name in sorted(filters):
+        value = filters[name]
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            value = value.isoformat()
+        elif isinstance(value, str):
+            # Agent filters are case-insensitive substring matches
+            value = value.strip().lower() or None
+        normalized.append((name, value))
+    return tuple(normalized)
+
+class DashboardCache:
+    """LRU of serialized dashboard responses under versioned tenant keys"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+        self._versions: Dict[object, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bumps = 0
+
+    def key(self, endpoint: str, user: User, filters: Tuple) -> Tuple:
+        """Cache key for this user's tenant at its current data version"""
+        tenant = ALL_TENANTS if user.role == "admin" else user.company_id
+        with self._lock:
+            return (endpoint, tenant, self._versions.get(tenant, 0), filters)
+
+    def get(self, key: Tuple) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple, body: bytes) -> CachedResponse:
+        entry = CachedResponse(body, etag_for(body), time.monotonic() + self.ttl_seconds)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def bump(self, company_ids: Set[Optional[int]]):
+        """Mark these tenants' dashboards (and the all-tenant view) as changed"""
+        with self._lock:
+            for tenant in set(company_ids) | {ALL_TENANTS}:
+                self._versions[tenant] = self._versions.get(tenant, 0) + 1
+            self.bumps += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "capacity": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "version_bumps": self.bumps,
+            }
+
+_cache: Optional[DashboardCache] = None
+_cache_lock = threading.Lock()
+
+def get_dashboard_cache() -> DashboardCache:
+    """Process-wide cache, created lazily on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DashboardCache(settings.dashboard_cache_max_entries, settings.dashboard_cache_ttl_seconds)
+    return _cache
+
+def _companies(obj) -> Set[Optional[int]]:
+    """The tenant an object belongs to now and, if it just moved, the one it left"""
+    return {obj.company_id, *get_history(obj, "company_id").deleted}
+
+def _track_old_value(target, value, oldvalue, initiator):
+    return value
+
+# Projects are usually expired when reassigned; load the tenant being left.
+# rollup does the same for Call.company_id
+event.listen(Project.company_id, "set", _track_old_value, active_history=True, retval=True)
+
+@event.listens_for(SessionLocal, "before_flush")
+def _collect_changed_tenants(session: Session, flush_context, instances):
+    """Runs after models._stamp_tenants, so calls and reports already carry company_id"""
+    changed = session.info.setdefault("dashboard_companies", set())
+    with session.no_autoflush:
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if obj in session.dirty and not session.is_modified(obj):
+                continue
+            if isinstance(obj, (Call, QAReport, Project)):
+                # A moved project re-keys its calls with a Core UPDATE, so bump it here
+                changed |= _companies(obj)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _bump_changed_tenants(session: Session):
+    changed = session.info.pop("dashboard_companies", None)
+    if changed:
+        get_dashboard_cache().bump(changed)
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _discard_changed_tenants(session: Session, previous_transaction):
+    session.info.pop("dashboard_companies", None)
@@ -1,11 +1,18 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Dict, Optional
 from .config import settings
 import boto3
 import json
 import logging
 import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -36,13 +43,128 @@ def get_secret_value(secret_name: str, key: str = None) -> str:
 # Get database URL preferring environment variable and settings; avoid network calls at import time
 database_url = os.getenv("DATABASE_URL") or settings.database_url
 
-engine = create_engine(database_url)
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except PoolTimeout:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._metrics_lock:
+                self.checkouts += 1
+                self.timeouts += int(timed_out)
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+class MeteredAsyncQueuePool(MeteredQueuePool, AsyncAdaptedQueuePool):
+    """MeteredQueuePool for asyncio drivers"""
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def async_database_url(url: str) -> str:
+    """The same database through its asyncio driver (asyncpg, aiosqlite)"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        query = dict(parsed.query)
+        # libpq's sslmode is spelled ssl for asyncpg
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+def _create_engine(url: str, pool_size: int, max_overflow: int):
+    if _is_memory_sqlite(make_url(url)):
+        # In-memory SQLite keeps one connection per thread; pool sizing does not apply
+        return create_engine(url)
+    return create_engine(
+        url,
+        poolclass=MeteredQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping
+    )
+
+# Synchronous request work (streamed exports, threadpool handlers) uses `engine`;
+# pipeline, dispatcher and scheduler work uses `pipeline_engine`, so long
+# background sessions never starve requests
+engine = _create_engine(database_url, settings.db_pool_size, settings.db_max_overflow)
+pipeline_engine = _create_engine(database_url, settings.db_pipeline_pool_size, settings.db_pipeline_max_overflow)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+def _create_async_engine(url: str, pool_size: int, max_overflow: int):
+    if _is_memory_sqlite(make_url(url)):
+        return create_async_engine(url)
+    return create_async_engine(
+        url,
+        poolclass=MeteredAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping
+    )
+
+# Request handlers await `async_engine`, so a query no longer blocks the event
+# loop. Its sessions wrap SessionLocal's class and fire the same listeners.
+async_engine = _create_async_engine(async_database_url(database_url), settings.db_pool_size, settings.db_max_overflow)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, sync_session_class=SessionLocal.class_, autoflush=False, expire_on_commit=False
+)
+
+def pipeline_session() -> Session:
+    """A session on the background-work pool (same listeners as SessionLocal)"""
+    return SessionLocal(bind=pipeline_engine)
+
+def pool_stats(pool) -> Dict[str, Optional[float]]:
+    """Live occupancy and checkout-wait counters of one engine's pool"""
+    stats: Dict[str, Optional[float]] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    if isinstance(pool, MeteredQueuePool):
+        with pool._metrics_lock:
+            stats.update({
+                "checkouts": pool.checkouts,
+                "timeouts": pool.timeouts,
+                "average_wait_ms": pool.wait_seconds_total * 1000 / pool.checkouts if pool.checkouts else 0.0,
+                "max_wait_ms": pool.wait_seconds_max * 1000,
+            })
+    return stats
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,175 @@
+"""Local OpenAI-compatible stand-in for throughput and batch scoring tests.
+
+Run it next to the API and point the service at it:
+
+    python -m uvicorn app.fake_openai:app --app-dir backend --port 8001
+    OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=fake ...
+
+Responses are deterministic and arrive after FAKE_OPENAI_LATENCY_SECONDS, so
+the numbers measure our concurrency, not the model. Batch files uploaded to
+/v1/files are executed line by line by /v1/batches, so bulk scoring can run
+end to end offline. Files and batches live in memory.
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import Response
+from .qa_service import CORRECTION_SYSTEM_PROMPT, SINGLE_PASS_SYSTEM_PROMPT
+
+LATENCY_SECONDS = float(os.getenv("FAKE_OPENAI_LATENCY_SECONDS", "0.5"))
+
+app = FastAPI(title="Fake OpenAI")
+
+FILES = {}
+BATCHES = {}
+# The loop only holds weak references to tasks; keep running batches alive
+_BATCH_TASKS = set()
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+def _transcript_from(messages) -> str:
+    content = messages[-1]["content"] if messages else ""
+    return content.split("\n\n", 1)[1] if "\n\n" in content else content
+
+def fake_completion_content(messages) -> str:
+    """Echo the transcript for correction prompts, synthetic QA JSON otherwise"""
+    system = messages[0]["content"] if messages else ""
+    transcript = _transcript_from(messages)
+    if system == CORRECTION_SYSTEM_PROMPT:
+        return transcript
+    score = 60 + len(transcript) % 40
+    result = {
+        "agent_summary": "Agent handled the call adequately.",
+        "qa_scores": {
+            "professionalism": score,
+            "communication": score,
+            "problem_solving": score,
+            "compliance": score,
+            "customer_satisfaction": score
+        },
+        "qa_feedback": "Synthetic feedback from the fake OpenAI endpoint.",
+        "overall_score": score,
+        "positive_count": 2,
+        "negative_count": 1,
+        "neutral_count": 1
+    }
+    if system == SINGLE_PASS_SYSTEM_PROMPT:
+        result["corrected_transcript"] = transcript
+    return json.dumps(result)
+
+def fake_chat_completion(body: dict) -> dict:
+    messages = body.get("messages", [])
+    content = fake_completion_content(messages)
+    prompt_tokens = sum(_estimate_tokens(m.get("content", "")) for m in messages)
+    completion_tokens = _estimate_tokens(content)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    await asyncio.sleep(LATENCY_SECONDS)
+    return fake_chat_completion(body)
+
+@app.post("/v1/files")
+async def upload_file(file: UploadFile = File(...), purpose: str = Form(...)):
+    content = await file.read()
+    file_id = f"file-{uuid.uuid4().hex}"
+    FILES[file_id] = content
+    return {
+        "id": file_id,
+        "object": "file",
+        "bytes": len(content),
+        "created_at": int(time.time()),
+        "filename": file.filename,
+        "purpose": purpose,
+        "status": "processed"
+    }
+
+@app.get("/v1/files/{file_id}/content")
+async def file_content(file_id: str):
+    if file_id not in FILES:
+        raise HTTPException(status_code=404, detail="No such file")
+    return Response(content=FILES[file_id], media_type="application/octet-stream")
+
+def run_batch_file(content: bytes) -> bytes:
+    """Execute every request line of a batch input file, OpenAI output format"""
+    output = []
+    for line in content.decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        output.append(json.dumps({
+            "id": f"batch_req_{uuid.uuid4().hex}",
+            "custom_id": request["custom_id"],
+            "response": {
+                "status_code": 200,
+                "request_id": uuid.uuid4().hex,
+                "body": fake_chat_completion(request["body"])
+            },
+            "error": None
+        }))
+    return ("\n".join(output) + "\n").encode("utf-8")
+
+async def _execute_batch(batch_id: str):
+    batch = BATCHES[batch_id]
+    await asyncio.sleep(LATENCY_SECONDS)
+    output = run_batch_file(FILES[batch["input_file_id"]])
+    output_file_id = f"file-{uuid.uuid4().hex}"
+    FILES[output_file_id] = output
+    total = output.count(b"\n")
+    batch.update({
+        "status": "completed",
+        "output_file_id": output_file_id,
+        "completed_at": int(time.time()),
+        "request_counts": {"total": total, "completed": total, "failed": 0}
+    })
+
+@app.post("/v1/batches")
+async def create_batch(request: Request):
+    body = await request.json()
+    if body.get("input_file_id") not in FILES:
+        raise HTTPException(status_code=400, detail="Unknown input_file_id")
+    batch_id = f"batch_{uuid.uuid4().hex}"
+    BATCHES[batch_id] = {
+        "id": batch_id,
+        "object": "batch",
+        "endpoint": body.get("endpoint"),
+        "input_file_id": body["input_file_id"],
+        "completion_window": body.get("completion_window", "24h"),
+        "status": "in_progress",
+        "output_file_id": None,
+        "error_file_id": None,
+        "created_at": int(time.time()),
+        "completed_at": None,
+        "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        "metadata": body.get("metadata")
+    }
+    task = asyncio.create_task(_execute_batch(batch_id))
+    _BATCH_TASKS.add(task)
+    task.add_done_callback(_BATCH_TASKS.discard)
+    return BATCHES[batch_id]
+
+@app.get("/v1/batches/{batch_id}")
+async def get_batch(batch_id: str):
+    if batch_id not in BATCHES:
+        raise HTTPException(status_code=404, detail="No such batch")
+    return BATCHES[batch_id]
@@ -0,0 +1,111 @@
+"""Bounded worker pool for password hashing and verification.
+
+bcrypt costs a few hundred milliseconds of CPU per call. Run on the event
+loop, one login stalls every other request on the worker, so hashing goes
+through a small dedicated thread pool instead (bcrypt releases the GIL).
+Admission is bounded: once password_hash_workers calls are running and
+password_hash_max_queued are waiting, submit() raises HashingBusy and the
+login endpoint answers 429 immediately rather than queueing without limit.
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool cannot admit more work"""
+
+class HashingPool:
+    """Fixed-size hashing executor that rejects work beyond a queue limit"""
+
+    def __init__(self, workers: int, max_queued: int):
+        self.workers = workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hashing")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        # Moving average of one call's run time, for Retry-After estimates
+        self.average_seconds = 0.25
+
+    def ensure_capacity(self):
+        """Raise HashingBusy now if submit() would, before spending work on the request"""
+        with self._lock:
+            self._check_capacity()
+
+    def submit(self, fn, *args) -> Future:
+        with self._lock:
+            self._check_capacity()
+            self.in_flight += 1
+        future = self._executor.submit(self._timed, fn, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def retry_after_seconds(self) -> int:
+        """Whole seconds until the current backlog should have drained"""
+        with self._lock:
+            return max(1, math.ceil(self.in_flight * self.average_seconds / self.workers))
+
+    def _check_capacity(self):
+        if self.in_flight >= self.workers + self.max_queued:
+            self.rejected += 1
+            raise HashingBusy(f"Password hashing pool is full ({self.in_flight} in flight)")
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.average_seconds += (elapsed - self.average_seconds) * 0.1
+
+    async def run(self, fn, *args):
+        """Await fn(*args) on the pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def _done(self, future: Future):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queued": self.max_queued,
+                "in_flight": self.in_flight,
+                "queued": max(self.in_flight - self.workers, 0),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "average_ms": self.average_seconds * 1000,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+_pool: Optional[HashingPool] = None
+_pool_lock = threading.Lock()
+
+def get_hashing_pool() -> HashingPool:
+    """Process-wide pool, created lazily on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(settings.password_hash_workers, settings.password_hash_max_queued)
+    return _pool
+
+def shutdown_hashing_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Optional
+import httpx
+from openai import AsyncOpenAI
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+class AsyncLLMRunner:
+    """One event loop thread and one pooled AsyncOpenAI client per process.
+
+    Pipeline threads hand coroutines to `submit()` and get a concurrent Future
+    back, so hundreds of in-flight LLM requests share a single loop and a
+    bounded set of keep-alive connections instead of one thread each.
+    """
+
+    def __init__(self):
+        from .qa_service import resolve_openai_api_key
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="llm-async", daemon=True)
+        self._thread.start()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+        async def _build():
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.openai_max_connections,
+                    max_keepalive_connections=settings.openai_max_keepalive_connections
+                ),
+                timeout=settings.openai_request_timeout_seconds
+            )
+            client = AsyncOpenAI(
+                api_key=resolve_openai_api_key(),
+                base_url=settings.openai_base_url or None,
+                max_retries=settings.openai_max_retries,
+                timeout=settings.openai_request_timeout_seconds,
+                http_client=http_client
+            )
+            # Created on the loop so the pool and semaphore bind to it
+            return client, asyncio.Semaphore(settings.openai_async_max_concurrency)
+
+        self.client, self.limiter = asyncio.run_coroutine_threadsafe(_build(), self.loop).result()
+
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the runner loop from any thread"""
+        with self._lock:
+            self._in_flight += 1
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, _future: Future):
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "max_concurrency": settings.openai_async_max_concurrency,
+                "max_connections": settings.openai_max_connections,
+            }
+
+    def close(self):
+        async def _close():
+            await self.client.close()
+        try:
+            asyncio.run_coroutine_threadsafe(_close(), self.loop).result(timeout=5)
+        except Exception as e:
+            logger.warning(f"Failed to close async OpenAI client: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+_runner: Optional[AsyncLLMRunner] = None
+_runner_lock = threading.Lock()
+
+def get_llm_runner() -> AsyncLLMRunner:
+    """Process-wide runner, created lazily on first use"""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = AsyncLLMRunner()
+    return _runner
+
+def shutdown_llm_runner():
+    if _runner is not None:
+        _runner.close()
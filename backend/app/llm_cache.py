@@ -0,0 +1,155 @@
+import hashlib
+import json
+import threading
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy.exc import IntegrityError
+from .config import settings
+from .database import pipeline_session
+from .models import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def cache_key(model: str, messages: List[Dict[str, str]], temperature: float,
+              options: Optional[Dict[str, Any]] = None) -> str:
+    """Key on model, system prompt version, temperature, transcript digest and any
+    other request options (response_format, max_tokens, ...)"""
+    system_prompt = "".join(m["content"] for m in messages if m["role"] == "system")
+    user_content = "".join(m["content"] for m in messages if m["role"] != "system")
+    parts = [model, _digest(system_prompt)[:12], f"{temperature:.3f}", _digest(user_content)]
+    if options:
+        # Canonical form so equal options hash the same; keys without options are unchanged
+        parts.append(json.dumps(options, sort_keys=True, separators=(",", ":"), default=str))
+    return _digest(json.dumps(parts))
+
+class LLMResponseCache:
+    """In-memory LRU in front of the llm_cache_entries table.
+
+    Both layers are size bounded: the LRU by entry count, the table by
+    periodically trimming the least recently used rows.
+    """
+
+    def __init__(self, memory_entries: int, max_rows: int, trim_every: int = 100):
+        self.memory_entries = memory_entries
+        self.max_rows = max_rows
+        self.trim_every = trim_every
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stores_since_trim = 0
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            content = self._memory.get(key)
+            if content is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return content
+
+        db = pipeline_session()
+        try:
+            entry = db.query(LLMCacheEntry).filter(LLMCacheEntry.cache_key == key).first()
+            if entry is None:
+                with self._lock:
+                    self.misses += 1
+                return None
+            entry.last_used_at = datetime.now(timezone.utc)
+            entry.hits = (entry.hits or 0) + 1
+            content = entry.response
+            db.commit()
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            with self._lock:
+                self.misses += 1
+            return None
+        finally:
+            db.close()
+
+        with self._lock:
+            self.db_hits += 1
+        self._remember(key, content)
+        return content
+
+    def store(self, key: str, model: str, temperature: float, content: str):
+        self._remember(key, content)
+        db = pipeline_session()
+        try:
+            db.add(LLMCacheEntry(cache_key=key, model=model, temperature=temperature, response=content))
+            db.commit()
+        except IntegrityError:
+            # Another worker cached the same request first
+            db.rollback()
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._stores_since_trim += 1
+            due = self._stores_since_trim >= self.trim_every
+            if due:
+                self._stores_since_trim = 0
+        if due:
+            self.trim()
+
+    def trim(self):
+        """Delete the least recently used rows beyond max_rows"""
+        db = pipeline_session()
+        try:
+            excess = db.query(LLMCacheEntry).count() - self.max_rows
+            if excess <= 0:
+                return
+            stale = db.query(LLMCacheEntry.cache_key).order_by(
+                LLMCacheEntry.last_used_at.asc()
+            ).limit(excess).subquery()
+            deleted = db.query(LLMCacheEntry).filter(
+                LLMCacheEntry.cache_key.in_(db.query(stale.c.cache_key))
+            ).delete(synchronize_session=False)
+            db.commit()
+            with self._lock:
+                self.evictions += deleted
+        except Exception as e:
+            logger.warning(f"LLM cache trim failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def _remember(self, key: str, content: str):
+        with self._lock:
+            self._memory[key] = content
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_capacity": self.memory_entries,
+                "max_rows": self.max_rows,
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide cache, created lazily on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache(settings.llm_cache_memory_entries, settings.llm_cache_max_rows)
+    return _cache
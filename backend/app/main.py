@@ -5,9 +5,14 @@ from datetime import datetime, timezone
 import logging
 from .config import settings
 from .database import engine, Base
-from .routers import auth, calls, dashboard, projects
-from .scheduler import start_scheduler
+from .routers import auth, calls, dashboard, metrics, projects, scoring_batches
+from .pipeline import shutdown_pipeline
+from .llm_async import shutdown_llm_runner
+from .hashing import shutdown_hashing_pool
+from .clients import close_clients
+from .scheduler import start_dispatcher, start_scheduler, stop_dispatcher, stop_scheduler
 from .seeder import seed_demo_data
+from . import rollup  # noqa: F401  keeps agent_daily_stats in step with every flush
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,8 +31,11 @@ async def lifespan(app: FastAPI):
         logger.info("Seeding demo data...")
         seed_demo_data()
     
-    # start_scheduler()
-    # logger.info("Background scheduler started")
+    if settings.batch_scoring_poll_enabled:
+        start_scheduler()
+    
+    if settings.dispatcher_enabled:
+        start_dispatcher()
     
     logger.info("QA System API started successfully (minimal mode)")
     
@@ -35,6 +43,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down QA System API...")
+    stop_dispatcher()
+    stop_scheduler()
+    shutdown_pipeline()
+    shutdown_llm_runner()
+    shutdown_hashing_pool()
+    close_clients()
 
 app = FastAPI(
     title="AI Call Center QA System",
@@ -63,6 +77,8 @@ app.include_router(auth.router, prefix="/auth", tags=["authentication"])
 app.include_router(calls.router, prefix="/calls", tags=["calls"])
 app.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
 app.include_router(projects.router, prefix="/projects", tags=["projects"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+app.include_router(scoring_batches.router, prefix="/scoring-batches", tags=["scoring batches"])
 
 @app.get("/")
 async def root():
@@ -1,7 +1,21 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Boolean, Float, ForeignKey, JSON, Index, LargeBinary, UniqueConstraint, event, select, text, update
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import get_history
 from sqlalchemy.sql import func
-from .database import Base
+from sqlalchemy.types import TypeDecorator
+from .database import Base, SessionLocal
+import zlib
+
+class CompressedText(TypeDecorator):
+    """Text stored zlib-compressed as bytes"""
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else zlib.compress(value.encode("utf-8"), 6)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else zlib.decompress(value).decode("utf-8")
 
 class Company(Base):
     __tablename__ = "companies"
@@ -37,6 +51,7 @@ class Project(Base):
     name = Column(String(255), nullable=False)
     description = Column(Text)
     company_id = Column(Integer, ForeignKey("companies.id"))
+    pipeline_mode = Column(String(20))  # two_pass, single_pass, score_only; null = settings default
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Boolean, default=True)
     
@@ -46,11 +61,35 @@ class Project(Base):
 
 class Call(Base):
     __tablename__ = "calls"
+    __table_args__ = (
+        # Dispatcher claim and pending-queue stats: only the backlog is indexed
+        Index("ix_calls_pending_queue", "uploaded_at", "id",
+              postgresql_where=text("status = 'uploaded'"), sqlite_where=text("status = 'uploaded'")),
+        # Status filters and dashboard status buckets
+        Index("ix_calls_status_uploaded_at", "status", "uploaded_at"),
+        # Per-project call list, export and dashboard filters, newest first;
+        # id breaks ties for keyset pagination
+        Index("ix_calls_project_uploaded_at", "project_id", "uploaded_at", "id"),
+        # Unscoped (admin) call list, newest first
+        Index("ix_calls_uploaded_at", "uploaded_at", "id"),
+        # Agent performance grouping
+        Index("ix_calls_agent_uploaded_at", "agent_name", "uploaded_at",
+              postgresql_where=text("agent_name IS NOT NULL"), sqlite_where=text("agent_name IS NOT NULL")),
+        # Tenant-scoped call list, export, search and dashboards, newest first
+        Index("ix_calls_company_uploaded_at", "company_id", "uploaded_at", "id"),
+        # Tenant-scoped status filters and dashboard status buckets
+        Index("ix_calls_company_status_uploaded_at", "company_id", "status", "uploaded_at"),
+        # Tenant-scoped agent performance; date range first, agent_name covers the grouping
+        Index("ix_calls_company_uploaded_agent", "company_id", "uploaded_at", "agent_name",
+              postgresql_where=text("agent_name IS NOT NULL"), sqlite_where=text("agent_name IS NOT NULL")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
+    company_id = Column(Integer, ForeignKey("companies.id"))  # copy of project.company_id, see _stamp_tenants
     filename = Column(String(255), nullable=False)
     s3_key = Column(String(500), nullable=False)
+    content_fingerprint = Column(String(100), index=True)  # S3 ETag + size of the audio
     s3_output_key = Column(String(500))
     transcription_job_name = Column(String(255))
     status = Column(String(50), default="uploaded")  # uploaded, processing, completed, failed
@@ -59,19 +98,27 @@ class Call(Base):
     call_duration = Column(Float)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_at = Column(DateTime(timezone=True))
+    claimed_at = Column(DateTime(timezone=True))  # last move to processing; stale claims are requeued
     error_message = Column(Text)
+    scoring_batch_id = Column(Integer, ForeignKey("scoring_batches.id"), index=True)  # set while queued for bulk re-scoring
     
     # Relationships
     project = relationship("Project", back_populates="calls")
     qa_reports = relationship("QAReport", back_populates="call")
+    scoring_batch = relationship("ScoringBatch", back_populates="calls")
 
 class QAReport(Base):
     __tablename__ = "qa_reports"
+    __table_args__ = (
+        # Newest report per call and every calls -> reports join
+        Index("ix_qa_reports_call_created_at", "call_id", "created_at"),
+        # Tenant-scoped report lookups
+        Index("ix_qa_reports_company_call_created_at", "company_id", "call_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     call_id = Column(Integer, ForeignKey("calls.id"))
-    transcript = Column(Text)
-    corrected_transcript = Column(Text)
+    company_id = Column(Integer, ForeignKey("companies.id"))  # copy of call.company_id
     agent_summary = Column(Text)
     qa_scores = Column(JSON)
     qa_feedback = Column(Text)
@@ -81,7 +128,175 @@ class QAReport(Base):
     neutral_count = Column(Integer, default=0)
     model_used = Column(String(100))
     processing_time_seconds = Column(Float)
+    pipeline_mode = Column(String(20))
+    prompt_version = Column(String(20))
+    llm_latency_seconds = Column(Float)
+    prompt_tokens = Column(Integer)
+    completion_tokens = Column(Integer)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     call = relationship("Call", back_populates="qa_reports")
+    # Transcripts live in their own compressed row and load on first access
+    transcript_blob = relationship(
+        "ReportTranscript", uselist=False, back_populates="report", cascade="all, delete-orphan"
+    )
+
+    def _transcript_row(self) -> "ReportTranscript":
+        if self.transcript_blob is None:
+            self.transcript_blob = ReportTranscript()
+        return self.transcript_blob
+
+    @property
+    def transcript(self):
+        return self.transcript_blob.transcript if self.transcript_blob else None
+
+    @transcript.setter
+    def transcript(self, value):
+        if value is not None or self.transcript_blob is not None:
+            self._transcript_row().transcript = value
+
+    @property
+    def corrected_transcript(self):
+        return self.transcript_blob.corrected_transcript if self.transcript_blob else None
+
+    @corrected_transcript.setter
+    def corrected_transcript(self, value):
+        if value is not None or self.transcript_blob is not None:
+            self._transcript_row().corrected_transcript = value
+
+class ReportTranscript(Base):
+    __tablename__ = "report_transcripts"
+    
+    report_id = Column(Integer, ForeignKey("qa_reports.id", ondelete="CASCADE"), primary_key=True)
+    transcript = Column(CompressedText)
+    corrected_transcript = Column(CompressedText)
+    
+    report = relationship("QAReport", back_populates="transcript_blob")
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache_entries"
+    
+    cache_key = Column(String(64), primary_key=True)  # sha256 of model, prompt version, temperature, input digest, options
+    model = Column(String(100))
+    temperature = Column(Float)
+    response = Column(Text, nullable=False)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+class ScoringBatch(Base):
+    __tablename__ = "scoring_batches"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"))
+    model = Column(String(100), nullable=False)
+    status = Column(String(20), default="submitted")  # OpenAI batch status, then ingested
+    openai_batch_id = Column(String(100), index=True)
+    input_file_id = Column(String(100))
+    output_file_id = Column(String(100))
+    error_file_id = Column(String(100))
+    call_count = Column(Integer, default=0)
+    request_count = Column(Integer, default=0)
+    scored_count = Column(Integer, default=0)
+    failed_count = Column(Integer, default=0)
+    error_message = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True))
+    
+    # Relationships
+    calls = relationship("Call", back_populates="scoring_batch")
+
+class AgentDailyStats(Base):
+    """Per agent and UTC upload day rollup behind the agent performance dashboard"""
+    __tablename__ = "agent_daily_stats"
+    __table_args__ = (
+        UniqueConstraint("company_id", "project_id", "agent_name", "day", name="uq_agent_daily_stats_key"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    agent_name = Column(String(255), nullable=False)
+    day = Column(Date, nullable=False)
+    total_calls = Column(Integer, nullable=False, default=0)
+    completed_calls = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0)
+    score_count = Column(Integer, nullable=False, default=0)  # reports with a score
+
+# calls.company_id and qa_reports.company_id denormalize the project's tenant
+# so scoped queries filter on an indexed column instead of joining projects.
+# Every SessionLocal flush stamps new and moved calls and new reports, looking
+# each project up once; moving a project re-keys its calls, reports and rollup
+# rows. Core INSERTs and UPDATEs that bypass the ORM must set them themselves.
+
+def _project_company_ids(session, project_ids):
+    if not project_ids:
+        return {}
+    return dict(session.execute(select(Project.id, Project.company_id).where(Project.id.in_(project_ids))).all())
+
+def _call_company_ids(session, call_ids):
+    if not call_ids:
+        return {}
+    return dict(session.execute(select(Call.id, Call.company_id).where(Call.id.in_(call_ids))).all())
+
+@event.listens_for(SessionLocal, "before_flush")
+def _stamp_tenants(session, flush_context, instances):
+    """Runs ahead of the rollup and dashboard listeners, which read company_id"""
+    with session.no_autoflush:
+        calls = [obj for obj in session.new if isinstance(obj, Call)]
+        calls += [
+            obj for obj in session.dirty
+            if isinstance(obj, Call) and get_history(obj, "project_id").has_changes()
+        ]
+        pending = {}
+        for call in calls:
+            project = call.__dict__.get("project")
+            if project is not None:
+                call.company_id = project.company_id
+            elif call.project_id is not None:
+                pending.setdefault(call.project_id, []).append(call)
+            else:
+                call.company_id = None
+        for project_id, company_id in _project_company_ids(session, list(pending)).items():
+            for call in pending.pop(project_id):
+                call.company_id = company_id
+        for orphans in pending.values():
+            for call in orphans:
+                call.company_id = None
+
+        reports = {}
+        for report in session.new:
+            if not isinstance(report, QAReport):
+                continue
+            call = report.__dict__.get("call")
+            if call is None and report.call_id is not None:
+                call = session.identity_map.get(session.identity_key(Call, report.call_id))
+            if call is not None:
+                report.company_id = call.company_id
+            elif report.call_id is not None:
+                reports.setdefault(report.call_id, []).append(report)
+        for call_id, company_id in _call_company_ids(session, list(reports)).items():
+            for report in reports[call_id]:
+                report.company_id = company_id
+
+@event.listens_for(Call, "before_update")
+def _move_call_company(mapper, connection, call):
+    if not get_history(call, "project_id").has_changes():
+        return
+    connection.execute(
+        update(QAReport.__table__).where(QAReport.__table__.c.call_id == call.id).values(company_id=call.company_id)
+    )
+
+@event.listens_for(Project, "before_update")
+def _move_project_company(mapper, connection, project):
+    if not get_history(project, "company_id").has_changes():
+        return
+    calls, reports, stats = Call.__table__, QAReport.__table__, AgentDailyStats.__table__
+    connection.execute(update(calls).where(calls.c.project_id == project.id).values(company_id=project.company_id))
+    connection.execute(
+        update(reports).where(reports.c.call_id.in_(select(calls.c.id).where(calls.c.project_id == project.id)))
+        .values(company_id=project.company_id)
+    )
+    # Rollup rows are unique per project, so they move without merging
+    connection.execute(update(stats).where(stats.c.project_id == project.id).values(company_id=project.company_id))
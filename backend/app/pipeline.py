@@ -0,0 +1,417 @@
+import sys
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+from .config import settings
+from .database import pipeline_session
+from .models import Call, QAReport, ReportTranscript
+from .qa_service import LLMUsage, PROMPT_VERSION, get_qa_service
+from .llm_async import get_llm_runner
+from .transcription_tracker import JOB_NAME_PREFIX, get_transcription_tracker
+
+logger = logging.getLogger(__name__)
+
+class PipelineBusy(Exception):
+    """Raised when the pipeline cannot admit more calls"""
+
+class StageExecutor:
+    """Fixed-size worker pool for one pipeline stage, with queue visibility"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"qa-{name}")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, fn, *args) -> Future:
+        with self._lock:
+            self.queued += 1
+        try:
+            return self._executor.submit(self._run, fn, *args)
+        except RuntimeError:
+            # Shut down; nothing was queued
+            with self._lock:
+                self.queued -= 1
+            raise
+
+    def _run(self, fn, *args):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            result = fn(*args)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.running -= 1
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def shutdown(self, wait: bool = False):
+        if sys.version_info >= (3, 9):
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        else:
+            # cancel_futures is 3.9+; apprunner.yaml still deploys 3.8
+            self._executor.shutdown(wait=wait)
+
+class AnalysisJob:
+    """State carried through the pipeline for one call"""
+
+    def __init__(self, call_id: int, model: str, mode: Optional[str]):
+        self.call_id = call_id
+        self.model = model
+        self.mode = mode
+        self.usage = LLMUsage()
+        self.transcript: Optional[str] = None
+        self.corrected_transcript: Optional[str] = None
+        self.qa_result: Optional[dict] = None
+        # Set when the report is copied from an earlier analysis of the same audio
+        self.reused_report_id: Optional[int] = None
+
+class AnalysisPipeline:
+    """Runs call analysis as a chain of bounded stages.
+
+    transcribe-start -> transcript wait -> LLM correction -> LLM scoring -> DB write
+
+    Each stage has its own worker limit, so a large batch queues inside the
+    pipeline instead of occupying the web threadpool. Admission is capped by
+    `pipeline_max_in_flight`; `submit` raises PipelineBusy past that point so
+    callers can push back instead of growing the queues without bound.
+
+    The LLM part depends on the job's mode: "two_pass" corrects then scores,
+    "single_pass" does both in one structured call and "score_only" skips
+    correction.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, StageExecutor] = {
+            "transcribe_start": StageExecutor("transcribe_start", settings.pipeline_transcribe_start_workers),
+            "llm_correction": StageExecutor("llm_correction", settings.pipeline_llm_correction_workers),
+            "llm_scoring": StageExecutor("llm_scoring", settings.pipeline_llm_scoring_workers),
+            "db_write": StageExecutor("db_write", settings.pipeline_db_write_workers),
+        }
+        self.max_in_flight = settings.pipeline_max_in_flight
+        # Outstanding Transcribe jobs count against the account's concurrency quota
+        self.transcript_wait_limit = settings.pipeline_transcript_wait_limit
+        self._transcript_slots = threading.BoundedSemaphore(self.transcript_wait_limit)
+        self._transcript_waiting = 0
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.finished = 0
+
+    def free_capacity(self) -> int:
+        with self._lock:
+            return max(0, self.max_in_flight - self._in_flight)
+
+    def submit(self, call_id: int, model: str = "gpt-4o", mode: Optional[str] = None):
+        """Admit a call into the pipeline or raise PipelineBusy.
+
+        `mode` overrides the project's pipeline mode for this run.
+        """
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self.rejected += 1
+                raise PipelineBusy(f"Analysis pipeline is full ({self._in_flight} calls in flight)")
+            self._in_flight += 1
+            self.admitted += 1
+        self._submit_step("transcribe_start", self._start_transcription, AnalysisJob(call_id, model, mode))
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            summary = {
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "finished": self.finished,
+            }
+            waiting = self._transcript_waiting
+        stages = {name: stage.stats() for name, stage in self.stages.items()}
+        stages["transcript_wait"] = {"limit": self.transcript_wait_limit, "waiting": waiting}
+        if settings.openai_async_enabled:
+            stages["llm_async"] = get_llm_runner().stats()
+        summary["stages"] = stages
+        return summary
+
+    def shutdown(self, wait: bool = False):
+        for stage in self.stages.values():
+            stage.shutdown(wait=wait)
+
+    def _submit_step(self, stage: str, fn, job: AnalysisJob):
+        self.stages[stage].submit(self._guard, fn, job)
+
+    def _guard(self, fn, job: AnalysisJob):
+        """Run one step; any unexpected error fails the call and frees its slot"""
+        try:
+            fn(job)
+        except Exception as e:
+            logger.error(f"Call analysis failed for {job.call_id}: {e}")
+            self._fail_later(job.call_id, str(e))
+            raise
+
+    def _fail_later(self, call_id: int, error_message: str):
+        """Fail the call on the db_write stage, or inline once the pipeline is shut down"""
+        try:
+            self.stages["db_write"].submit(self._fail, call_id, error_message)
+        except RuntimeError:
+            self._fail(call_id, error_message)
+
+    def _finish(self):
+        with self._lock:
+            self._in_flight -= 1
+            self.finished += 1
+
+    def _start_transcription(self, job: AnalysisJob):
+        service = get_qa_service()
+        db = pipeline_session()
+        try:
+            call = db.query(Call).filter(Call.id == job.call_id).first()
+            if not call:
+                self._finish()
+                return
+            s3_key = call.s3_key
+            project_mode = call.project.pipeline_mode if call.project else None
+            job.mode = job.mode or project_mode or settings.pipeline_default_mode
+
+            # Re-uploaded audio reuses the earlier transcript instead of a new Transcribe job
+            call.content_fingerprint = service.content_fingerprint(s3_key)
+            prior = _find_prior_report(db, call) if call.content_fingerprint else None
+            db.commit()
+            if prior is not None:
+                logger.info(f"Call {job.call_id} duplicates report {prior.id}; skipping Transcribe")
+                job.transcript = prior.transcript
+                if _feedback_reusable(prior, job):
+                    job.reused_report_id = prior.id
+                    job.corrected_transcript = prior.corrected_transcript
+                    job.qa_result = _qa_result_from_report(prior)
+                    self._submit_step("db_write", self._write_report, job)
+                else:
+                    self._dispatch_llm(job)
+                return
+        finally:
+            db.close()
+
+        # Blocks this stage's workers when too many Transcribe jobs are outstanding
+        self._transcript_slots.acquire()
+        try:
+            job_name = f"{JOB_NAME_PREFIX}{job.call_id}-{int(datetime.now().timestamp())}"
+            s3_output_key = service.start_transcription(s3_key, job_name)
+            db = pipeline_session()
+            try:
+                call = db.query(Call).filter(Call.id == job.call_id).first()
+                call.transcription_job_name = job_name
+                call.s3_output_key = s3_output_key
+                db.commit()
+            finally:
+                db.close()
+        except Exception:
+            self._transcript_slots.release()
+            raise
+
+        with self._lock:
+            self._transcript_waiting += 1
+        future = get_transcription_tracker().watch(job_name)
+        future.add_done_callback(lambda f: self._on_transcript(job, f))
+
+    def _on_transcript(self, job: AnalysisJob, future: Future):
+        """Runs on the tracker thread; hand off without doing any work here"""
+        with self._lock:
+            self._transcript_waiting -= 1
+        self._transcript_slots.release()
+        # concurrent.futures only logs what a done callback raises, which would
+        # leave the call processing and its admission slot taken
+        try:
+            transcript = future.result()
+            if not transcript:
+                self._fail_later(job.call_id, "Transcription failed")
+                return
+            job.transcript = transcript
+            self._dispatch_llm(job)
+        except Exception as e:
+            logger.error(f"Call analysis failed for {job.call_id}: {e}")
+            self._fail_later(job.call_id, str(e))
+
+    def _dispatch_llm(self, job: AnalysisJob):
+        if settings.openai_async_enabled:
+            self._analyze_async(job)
+        elif job.mode == "two_pass":
+            self._submit_step("llm_correction", self._correct, job)
+        else:
+            self._submit_step("llm_scoring", self._score, job)
+
+    def _correct(self, job: AnalysisJob):
+        job.corrected_transcript = get_qa_service().correct_transcript(job.transcript, job.usage)
+        self._submit_step("llm_scoring", self._score, job)
+
+    def _score(self, job: AnalysisJob):
+        service = get_qa_service()
+        if job.mode == "single_pass":
+            job.qa_result = service.correct_and_score(job.transcript, job.model, job.usage)
+            job.corrected_transcript = job.qa_result.pop("corrected_transcript", None)
+        else:
+            job.qa_result = service.generate_feedback(job.corrected_transcript or job.transcript, job.model, job.usage)
+        self._submit_step("db_write", self._write_report, job)
+
+    def _analyze_async(self, job: AnalysisJob):
+        """LLM stages on the shared event loop; no pipeline thread waits on OpenAI"""
+        service = get_qa_service()
+
+        def scored(qa_result: dict):
+            if job.mode == "single_pass":
+                job.corrected_transcript = qa_result.pop("corrected_transcript", None)
+            job.qa_result = qa_result
+            self._submit_step("db_write", self._write_report, job)
+
+        def corrected(corrected_transcript: str):
+            job.corrected_transcript = corrected_transcript
+            self._then(job, service.agenerate_feedback(corrected_transcript, job.model, job.usage), scored)
+
+        if job.mode == "two_pass":
+            self._then(job, service.acorrect_transcript(job.transcript, job.usage), corrected)
+        elif job.mode == "single_pass":
+            self._then(job, service.acorrect_and_score(job.transcript, job.model, job.usage), scored)
+        else:
+            self._then(job, service.agenerate_feedback(job.transcript, job.model, job.usage), scored)
+
+    def _then(self, job: AnalysisJob, coro, on_result):
+        def done(future: Future):
+            try:
+                on_result(future.result())
+            except Exception as e:
+                logger.error(f"Call analysis failed for {job.call_id}: {e}")
+                self._fail_later(job.call_id, str(e))
+
+        get_llm_runner().submit(coro).add_done_callback(done)
+
+    def _write_report(self, job: AnalysisJob):
+        qa_result = job.qa_result
+        db = pipeline_session()
+        try:
+            call = db.query(Call).filter(Call.id == job.call_id).first()
+            if not call:
+                self._finish()
+                return
+            qa_report = QAReport(
+                call_id=job.call_id,
+                transcript=job.transcript,
+                corrected_transcript=job.corrected_transcript,
+                agent_summary=qa_result.get("agent_summary", ""),
+                qa_scores=qa_result.get("qa_scores", {}),
+                qa_feedback=qa_result.get("qa_feedback", ""),
+                overall_score=qa_result.get("overall_score", 0),
+                positive_count=qa_result.get("positive_count", 0),
+                negative_count=qa_result.get("negative_count", 0),
+                neutral_count=qa_result.get("neutral_count", 0),
+                model_used=qa_result.get("model_used", job.model),
+                processing_time_seconds=qa_result.get("processing_time_seconds", 0),
+                pipeline_mode=job.mode,
+                prompt_version=PROMPT_VERSION
+            )
+            # Copied reports made no LLM calls; keep them out of the per-mode averages
+            if job.reused_report_id is None:
+                qa_report.llm_latency_seconds = job.usage.latency_seconds
+                qa_report.prompt_tokens = job.usage.prompt_tokens
+                qa_report.completion_tokens = job.usage.completion_tokens
+
+            db.add(qa_report)
+            call.status = "completed"
+            call.processed_at = datetime.now()
+            db.commit()
+
+            logger.info(f"Call {job.call_id} analysis completed ({job.mode}, {job.usage.latency_seconds:.2f}s LLM)")
+        finally:
+            db.close()
+        self._finish()
+
+    def _fail(self, call_id: int, error_message: str):
+        db = pipeline_session()
+        try:
+            _mark_call_failed(db, call_id, error_message)
+        except Exception as e:
+            logger.error(f"Could not mark call {call_id} as failed: {e}")
+        finally:
+            db.close()
+            self._finish()
+
+def _find_prior_report(db: Session, call: Call) -> Optional[QAReport]:
+    """Latest report with a transcript for the same audio within the same company"""
+    query = db.query(QAReport).join(Call, QAReport.call_id == Call.id).filter(
+        Call.content_fingerprint == call.content_fingerprint,
+        Call.id != call.id,
+        QAReport.transcript_blob.has(ReportTranscript.transcript.isnot(None))
+    )
+    if call.company_id is not None:
+        query = query.filter(Call.company_id == call.company_id)
+    return query.order_by(QAReport.created_at.desc(), QAReport.id.desc()).first()
+
+def _feedback_reusable(report: QAReport, job: AnalysisJob) -> bool:
+    """Stored feedback is only valid for the same model, prompts and mode"""
+    return (
+        report.model_used == job.model
+        and report.prompt_version == PROMPT_VERSION
+        and report.pipeline_mode == job.mode
+        and report.agent_summary != "Analysis failed"
+    )
+
+def _qa_result_from_report(report: QAReport) -> dict:
+    return {
+        "agent_summary": report.agent_summary,
+        "qa_scores": report.qa_scores,
+        "qa_feedback": report.qa_feedback,
+        "overall_score": report.overall_score,
+        "positive_count": report.positive_count,
+        "negative_count": report.negative_count,
+        "neutral_count": report.neutral_count,
+        "model_used": report.model_used,
+        "processing_time_seconds": 0
+    }
+
+def _mark_call_failed(db: Session, call_id: int, error_message: str):
+    call = db.query(Call).filter(Call.id == call_id).first()
+    if call:
+        call.status = "failed"
+        call.error_message = error_message
+        db.commit()
+
+_pipeline: Optional[AnalysisPipeline] = None
+_pipeline_lock = threading.Lock()
+
+def get_pipeline() -> AnalysisPipeline:
+    """Process-wide pipeline, created lazily on first use"""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = AnalysisPipeline()
+    return _pipeline
+
+def shutdown_pipeline():
+    if _pipeline is not None:
+        _pipeline.shutdown()
+
+def process_call_analysis(call_id: int, model: str = "gpt-4o", mode: Optional[str] = None):
+    """Queue a call for analysis; raises PipelineBusy when the pipeline is full"""
+    get_pipeline().submit(call_id, model, mode)
@@ -1,49 +1,263 @@
-import boto3
+import asyncio
+import hashlib
 import json
 import time
 import logging
-from typing import Dict, Any, Optional
-from openai import OpenAI
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from .config import settings
+from .clients import get_openai_client, get_s3_client, get_transcribe_client
+from .llm_cache import cache_key, get_llm_cache
 import os
 
 logger = logging.getLogger(__name__)
 
+CORRECTION_SYSTEM_PROMPT = "You are a transcript correction assistant. Fix grammar, punctuation, and obvious transcription errors while preserving the original meaning and conversational tone. Do not add or remove content, only correct errors."
+
+FEEDBACK_SYSTEM_PROMPT = """You are a call center QA analyst. Analyze the call transcript and provide detailed feedback.
+
+Return your analysis as a JSON object with these exact fields:
+{
+    "agent_summary": "Brief summary of agent performance",
+    "qa_scores": {
+        "professionalism": 85,
+        "communication": 90,
+        "problem_solving": 75,
+        "compliance": 95,
+        "customer_satisfaction": 80
+    },
+    "qa_feedback": "Detailed feedback with specific examples",
+    "overall_score": 85,
+    "positive_count": 3,
+    "negative_count": 1,
+    "neutral_count": 2
+}
+
+Scores should be 0-100. Counts should reflect positive, negative, and neutral aspects found."""
+
+SINGLE_PASS_SYSTEM_PROMPT = """You are a call center QA analyst. First correct the call transcript: fix grammar, punctuation, and obvious transcription errors while preserving the original meaning and conversational tone. Then analyze the corrected transcript and provide detailed feedback.
+
+Return a JSON object with these exact fields:
+{
+    "corrected_transcript": "The full corrected transcript",
+    "agent_summary": "Brief summary of agent performance",
+    "qa_scores": {
+        "professionalism": 85,
+        "communication": 90,
+        "problem_solving": 75,
+        "compliance": 95,
+        "customer_satisfaction": 80
+    },
+    "qa_feedback": "Detailed feedback with specific examples",
+    "overall_score": 85,
+    "positive_count": 3,
+    "negative_count": 1,
+    "neutral_count": 2
+}
+
+Scores should be 0-100. Counts should reflect positive, negative, and neutral aspects found."""
+
+QA_SCORE_DIMENSIONS = ("professionalism", "communication", "problem_solving", "compliance", "customer_satisfaction")
+
+class LLMUsage:
+    """Accumulates latency and token counts across the LLM calls for one analysis"""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency_seconds = 0.0
+        self.requests = 0
+        # Chunked scoring records from several threads at once
+        self._lock = threading.Lock()
+
+    def record(self, response, elapsed: float):
+        usage = getattr(response, "usage", None)
+        with self._lock:
+            if usage is not None:
+                self.prompt_tokens += usage.prompt_tokens or 0
+                self.completion_tokens += usage.completion_tokens or 0
+            self.latency_seconds += elapsed
+            self.requests += 1
+
+# Changes whenever any prompt text changes; stored on reports and used to decide
+# whether earlier LLM output for the same audio can be reused
+PROMPT_VERSION = hashlib.sha256(
+    "\n".join([CORRECTION_SYSTEM_PROMPT, FEEDBACK_SYSTEM_PROMPT, SINGLE_PASS_SYSTEM_PROMPT]).encode("utf-8")
+).hexdigest()[:12]
+
+def resolve_openai_api_key() -> str:
+    """Get OpenAI API key from environment or settings (no network calls)"""
+    raw_openai_key = os.getenv("OPENAI_API_KEY") or settings.openai_api_key
+    openai_key = raw_openai_key
+    # If the env var contains a JSON object (common when storing secrets as JSON), extract the value
+    if openai_key and isinstance(openai_key, str):
+        cleaned = openai_key.strip()
+        if cleaned.startswith("{"):
+            try:
+                obj = json.loads(cleaned)
+                if isinstance(obj, dict):
+                    # Common keys to look for
+                    for k in ("OPENAI_API_KEY", "openai_api_key", "api_key", "key", "OPENAI", "token"):
+                        if k in obj and obj[k]:
+                            openai_key = obj[k]
+                            break
+            except Exception:
+                # Leave openai_key as-is if parsing fails
+                pass
+        # If wrapped in quotes, strip them
+        if isinstance(openai_key, str) and openai_key.startswith('"') and openai_key.endswith('"'):
+            openai_key = openai_key.strip('"')
+    return openai_key
+
+def correction_messages(transcript: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": CORRECTION_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Please correct this call center transcript:\n\n{transcript}"}
+    ]
+
+def _part_note(part: Optional[Tuple[int, int]]) -> str:
+    if part is None:
+        return ""
+    return f" (part {part[0]} of {part[1]}; judge only what this part shows)"
+
+def feedback_messages(transcript: str, part: Optional[Tuple[int, int]] = None) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": FEEDBACK_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Analyze this call transcript{_part_note(part)}:\n\n{transcript}"}
+    ]
+
+def single_pass_messages(transcript: str, part: Optional[Tuple[int, int]] = None) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": SINGLE_PASS_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Correct and analyze this call transcript{_part_note(part)}:\n\n{transcript}"}
+    ]
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English)"""
+    return len(text) // 4 + 1
+
+def is_long_transcript(transcript: str) -> bool:
+    return estimate_tokens(transcript) > settings.long_transcript_threshold_tokens
+
+# A new speaker turn: a line break, or a "Speaker:" style label mid-paragraph
+_TURN_BOUNDARY = re.compile(r"\n+|(?<=[.!?])\s+(?=(?:[A-Z][\w ]{0,30}|spk_\d+):\s)")
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+def split_transcript(transcript: str, max_tokens: int) -> List[str]:
+    """Split on speaker turns into chunks of at most ~max_tokens.
+
+    Turns are packed greedily in order. A single turn longer than the budget
+    is split on sentences, and as a last resort on a hard character limit.
+    """
+    max_chars = max_tokens * 4
+    pieces: List[str] = []
+    for turn in _TURN_BOUNDARY.split(transcript):
+        turn = turn.strip()
+        if not turn:
+            continue
+        if len(turn) <= max_chars:
+            pieces.append(turn)
+            continue
+        for sentence in _SENTENCE_BOUNDARY.split(turn):
+            while len(sentence) > max_chars:
+                pieces.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            if sentence:
+                pieces.append(sentence)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    for piece in pieces:
+        if current and current_len + len(piece) + 1 > max_chars:
+            chunks.append("\n".join(current))
+            current, current_len = [], 0
+        current.append(piece)
+        current_len += len(piece) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+def merge_chunk_feedback(partials: List[Dict[str, Any]], weights: List[int], model: str) -> Dict[str, Any]:
+    """Reduce per-chunk QA results into one, deterministically.
+
+    Scores are averaged weighted by chunk length, counts are summed, and
+    summaries/feedback are concatenated in transcript order. Failed chunks
+    are left out; if every chunk failed the first failure is returned.
+    """
+    ok = [(i, p, w) for i, (p, w) in enumerate(zip(partials, weights)) if p.get("agent_summary") != "Analysis failed"]
+    if not ok:
+        return partials[0]
+    total_weight = sum(w for _, _, w in ok)
+    count = len(partials)
+
+    dimensions = sorted({dim for _, p, _ in ok for dim in (p.get("qa_scores") or {})},
+                        key=lambda d: (QA_SCORE_DIMENSIONS.index(d) if d in QA_SCORE_DIMENSIONS else len(QA_SCORE_DIMENSIONS), d))
+    qa_scores = {}
+    for dim in dimensions:
+        scored = [(float(p["qa_scores"][dim]), w) for _, p, w in ok
+                  if isinstance((p.get("qa_scores") or {}).get(dim), (int, float))]
+        if scored:
+            qa_scores[dim] = round(sum(v * w for v, w in scored) / sum(w for _, w in scored), 1)
+
+    merged = {
+        "agent_summary": "\n".join(f"Part {i + 1}/{count}: {p.get('agent_summary', '')}" for i, p, _ in ok),
+        "qa_scores": qa_scores,
+        "qa_feedback": "\n\n".join(f"Part {i + 1}/{count}:\n{p.get('qa_feedback', '')}" for i, p, _ in ok),
+        "overall_score": round(sum(float(p.get("overall_score") or 0) * w for _, p, w in ok) / total_weight, 1),
+        "positive_count": sum(int(p.get("positive_count") or 0) for _, p, _ in ok),
+        "negative_count": sum(int(p.get("negative_count") or 0) for _, p, _ in ok),
+        "neutral_count": sum(int(p.get("neutral_count") or 0) for _, p, _ in ok),
+        "model_used": model
+    }
+    if any("corrected_transcript" in p for p in partials):
+        merged["corrected_transcript"] = "\n".join(p.get("corrected_transcript", "") for p in partials)
+    return merged
+
+_chunk_executor: Optional[ThreadPoolExecutor] = None
+_chunk_executor_lock = threading.Lock()
+
+def _get_chunk_executor() -> ThreadPoolExecutor:
+    global _chunk_executor
+    if _chunk_executor is None:
+        with _chunk_executor_lock:
+            if _chunk_executor is None:
+                _chunk_executor = ThreadPoolExecutor(
+                    max_workers=settings.long_transcript_chunk_workers,
+                    thread_name_prefix="qa-chunk"
+                )
+    return _chunk_executor
+
+def parse_feedback_content(content: str) -> Dict[str, Any]:
+    """Parse the model's JSON answer, tolerating a markdown code fence"""
+    content = content.strip()
+    if content.startswith("```json"):
+        content = content[7:-3]
+    elif content.startswith("```"):
+        content = content[3:-3]
+    return json.loads(content)
+
+def failed_feedback(error: Exception, model: str, elapsed: float) -> Dict[str, Any]:
+    return {
+        "agent_summary": "Analysis failed",
+        "qa_scores": {},
+        "qa_feedback": f"Error generating feedback: {str(error)}",
+        "overall_score": 0,
+        "positive_count": 0,
+        "negative_count": 0,
+        "neutral_count": 0,
+        "processing_time_seconds": elapsed,
+        "model_used": model
+    }
+
 class EnhancedQAService:
     def __init__(self):
-        # Get OpenAI API key from environment or settings (no network calls)
-        raw_openai_key = os.getenv("OPENAI_API_KEY") or settings.openai_api_key
-        openai_key = raw_openai_key
-        # If the env var contains a JSON object (common when storing secrets as JSON), extract the value
-        if openai_key and isinstance(openai_key, str):
-            cleaned = openai_key.strip()
-            if cleaned.startswith("{"):
-                try:
-                    obj = json.loads(cleaned)
-                    if isinstance(obj, dict):
-                        # Common keys to look for
-                        for k in ("OPENAI_API_KEY", "openai_api_key", "api_key", "key", "OPENAI", "token"):
-                            if k in obj and obj[k]:
-                                openai_key = obj[k]
-                                break
-                except Exception:
-                    # Leave openai_key as-is if parsing fails
-                    pass
-            # If wrapped in quotes, strip them
-            if isinstance(openai_key, str) and openai_key.startswith('"') and openai_key.endswith('"'):
-                openai_key = openai_key.strip('"')
-
-        # Initialize client (avoid logging secrets)
-        if not openai_key:
-            logger.warning("OpenAI API key is not configured; QA feedback generation may fail.")
-        self.openai_client = OpenAI(
-            api_key=openai_key,
-            max_retries=settings.openai_max_retries,
-            timeout=settings.openai_request_timeout_seconds
-        )
-        
-        self.s3_client = boto3.client('s3', region_name=settings.aws_region)
-        self.transcribe_client = boto3.client('transcribe', region_name=settings.aws_region)
+        # Shared, pooled clients; constructing a service is cheap
+        self.openai_client = get_openai_client()
+        self.s3_client = get_s3_client()
+        self.transcribe_client = get_transcribe_client()
     
     def start_transcription(self, s3_key: str, job_name: str) -> str:
         """Start AWS Transcribe job"""
@@ -77,74 +291,101 @@ class EnhancedQAService:
             logger.error(f"Failed to start transcription: {e}")
             raise
     
+    def content_fingerprint(self, s3_key: str) -> Optional[str]:
+        """Fingerprint uploaded audio from its S3 ETag and size (no download)"""
+        try:
+            head = self.s3_client.head_object(Bucket=settings.aws_s3_bucket_input, Key=s3_key)
+            etag = head['ETag'].strip('"')
+            return f"{etag}-{head['ContentLength']}"
+        except Exception as e:
+            logger.warning(f"Could not fingerprint {s3_key}: {e}")
+            return None
+    
+    def fetch_transcript(self, job_name: str) -> str:
+        """Read a completed job's transcript from the output bucket"""
+        output_key = f"transcriptions/{job_name}.json"
+        obj = self.s3_client.get_object(
+            Bucket=settings.aws_s3_bucket_output,
+            Key=output_key
+        )
+        transcript_data = json.loads(obj['Body'].read())
+        return transcript_data['results']['transcripts'][0]['transcript']
+    
     def get_transcription(self, job_name: str) -> Optional[str]:
-        """Poll for transcription completion and return transcript"""
-        max_wait = settings.transcribe_max_wait_seconds
-        poll_interval = settings.transcribe_poll_interval_seconds
-        elapsed = 0
+        """Wait for transcription completion and return transcript.
+
+        Blocks the caller; the pipeline should use the tracker's Future instead.
+        """
+        from .transcription_tracker import get_transcription_tracker
+        future = get_transcription_tracker().watch(job_name)
+        return future.result(timeout=settings.transcribe_max_wait_seconds + 2 * settings.transcribe_poll_interval_seconds)
+    
+    def _chat(self, model: str, messages: List[Dict[str, str]], temperature: float,
+              usage: Optional[LLMUsage] = None, validate=None, **kwargs) -> str:
+        """One chat completion, served from the response cache when possible.
+
+        `validate` parses the content; only responses it accepts are cached.
+        """
+        cache = get_llm_cache() if settings.llm_cache_enabled else None
+        key = cache_key(model, messages, temperature, kwargs) if cache else None
+        if cache:
+            content = cache.lookup(key)
+            if content is not None:
+                return content
         
-        while elapsed < max_wait:
-            try:
-                response = self.transcribe_client.get_transcription_job(
-                    TranscriptionJobName=job_name
-                )
-                
-                status = response['TranscriptionJob']['TranscriptionJobStatus']
-                
-                if status == 'COMPLETED':
-                    # Get transcript from S3
-                    output_key = f"transcriptions/{job_name}.json"
-                    
-                    try:
-                        obj = self.s3_client.get_object(
-                            Bucket=settings.aws_s3_bucket_output,
-                            Key=output_key
-                        )
-                        transcript_data = json.loads(obj['Body'].read())
-                        transcript = transcript_data['results']['transcripts'][0]['transcript']
-                        logger.info(f"Transcription completed for job: {job_name}")
-                        return transcript
-                    except Exception as e:
-                        logger.error(f"Failed to retrieve transcript: {e}")
-                        time.sleep(poll_interval)
-                        elapsed += poll_interval
-                        continue
-                        
-                elif status == 'FAILED':
-                    logger.error(f"Transcription failed for job: {job_name}")
-                    return None
-                else:
-                    logger.info(f"Transcription in progress: {status}")
-                    time.sleep(poll_interval)
-                    elapsed += poll_interval
-                    
-            except Exception as e:
-                logger.error(f"Error polling transcription: {e}")
-                time.sleep(poll_interval)
-                elapsed += poll_interval
+        start_time = time.time()
+        response = self.openai_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            **kwargs
+        )
+        if usage is not None:
+            usage.record(response, time.time() - start_time)
+        content = response.choices[0].message.content.strip()
+        if validate is not None:
+            validate(content)
+        if cache:
+            cache.store(key, model, temperature, content)
+        return content
+    
+    async def _achat(self, model: str, messages: List[Dict[str, str]], temperature: float,
+                     usage: Optional[LLMUsage] = None, validate=None, **kwargs) -> str:
+        """Async `_chat` on the shared client; cache DB access runs off the loop"""
+        from .llm_async import get_llm_runner
+        runner = get_llm_runner()
+        loop = asyncio.get_running_loop()
+        cache = get_llm_cache() if settings.llm_cache_enabled else None
+        key = cache_key(model, messages, temperature, kwargs) if cache else None
+        if cache:
+            content = await loop.run_in_executor(None, cache.lookup, key)
+            if content is not None:
+                return content
         
-        logger.error(f"Transcription timeout for job: {job_name}")
-        return None
+        start_time = time.time()
+        async with runner.limiter:
+            response = await runner.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                **kwargs
+            )
+        if usage is not None:
+            usage.record(response, time.time() - start_time)
+        content = response.choices[0].message.content.strip()
+        if validate is not None:
+            validate(content)
+        if cache:
+            await loop.run_in_executor(None, cache.store, key, model, temperature, content)
+        return content
     
-    def correct_transcript(self, transcript: str) -> str:
+    def correct_transcript(self, transcript: str, usage: Optional[LLMUsage] = None) -> str:
         """Use OpenAI to correct transcript errors"""
+        if is_long_transcript(transcript):
+            chunks = split_transcript(transcript, settings.long_transcript_chunk_tokens)
+            return "\n".join(_get_chunk_executor().map(lambda chunk: self.correct_transcript(chunk, usage), chunks))
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a transcript correction assistant. Fix grammar, punctuation, and obvious transcription errors while preserving the original meaning and conversational tone. Do not add or remove content, only correct errors."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Please correct this call center transcript:\n\n{transcript}"
-                    }
-                ],
-                temperature=0.1
-            )
-            
-            corrected = response.choices[0].message.content.strip()
+            corrected = self._chat("gpt-4o", correction_messages(transcript), 0.1, usage)
             logger.info("Transcript corrected successfully")
             return corrected
             
@@ -152,70 +393,130 @@ class EnhancedQAService:
             logger.error(f"Failed to correct transcript: {e}")
             return transcript
     
-    def generate_feedback(self, transcript: str, model: str = "gpt-4o") -> Dict[str, Any]:
+    def generate_feedback(self, transcript: str, model: str = "gpt-4o", usage: Optional[LLMUsage] = None) -> Dict[str, Any]:
         """Generate QA feedback using OpenAI"""
+        if is_long_transcript(transcript):
+            return self._score_chunked(transcript, model, usage, single_pass=False)
+        return self._score_part(transcript, model, usage, single_pass=False)
+    
+    def correct_and_score(self, transcript: str, model: str = "gpt-4o", usage: Optional[LLMUsage] = None) -> Dict[str, Any]:
+        """Correct and score in a single structured OpenAI call"""
+        if is_long_transcript(transcript):
+            return self._score_chunked(transcript, model, usage, single_pass=True)
+        return self._score_part(transcript, model, usage, single_pass=True)
+    
+    def _score_part(self, transcript: str, model: str, usage: Optional[LLMUsage], single_pass: bool,
+                    part: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
         start_time = time.time()
-        
         try:
-            response = self.openai_client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are a call center QA analyst. Analyze the call transcript and provide detailed feedback.
-
-Return your analysis as a JSON object with these exact fields:
-{
-    "agent_summary": "Brief summary of agent performance",
-    "qa_scores": {
-        "professionalism": 85,
-        "communication": 90,
-        "problem_solving": 75,
-        "compliance": 95,
-        "customer_satisfaction": 80
-    },
-    "qa_feedback": "Detailed feedback with specific examples",
-    "overall_score": 85,
-    "positive_count": 3,
-    "negative_count": 1,
-    "neutral_count": 2
-}
-
-Scores should be 0-100. Counts should reflect positive, negative, and neutral aspects found."""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Analyze this call transcript:\n\n{transcript}"
-                    }
-                ],
-                temperature=0.3
-            )
+            if single_pass:
+                content = self._chat(model, single_pass_messages(transcript, part), 0.2, usage, parse_feedback_content,
+                                     response_format={"type": "json_object"})
+            else:
+                content = self._chat(model, feedback_messages(transcript, part), 0.3, usage, parse_feedback_content)
+            return self._feedback_result(content, transcript, model, start_time, single_pass)
             
-            content = response.choices[0].message.content.strip()
-            
-            # Parse JSON response
-            if content.startswith("```json"):
-                content = content[7:-3]
-            elif content.startswith("```"):
-                content = content[3:-3]
-            
-            result = json.loads(content)
-            result["processing_time_seconds"] = time.time() - start_time
-            result["model_used"] = model
+        except Exception as e:
+            return self._failed_result(e, transcript, model, start_time, single_pass)
+    
+    def _score_chunked(self, transcript: str, model: str, usage: Optional[LLMUsage], single_pass: bool) -> Dict[str, Any]:
+        """Map: score turn-aligned chunks concurrently. Reduce: merge_chunk_feedback"""
+        start_time = time.time()
+        chunks = split_transcript(transcript, settings.long_transcript_chunk_tokens)
+        partials = list(_get_chunk_executor().map(
+            lambda indexed: self._score_part(indexed[1], model, usage, single_pass, (indexed[0] + 1, len(chunks))),
+            enumerate(chunks)
+        ))
+        return self._merged_result(partials, chunks, transcript, model, start_time, single_pass)
+    
+    async def acorrect_transcript(self, transcript: str, usage: Optional[LLMUsage] = None) -> str:
+        """Async variant of correct_transcript; run it on the LLM runner loop"""
+        if is_long_transcript(transcript):
+            chunks = split_transcript(transcript, settings.long_transcript_chunk_tokens)
+            return "\n".join(await asyncio.gather(*(self.acorrect_transcript(chunk, usage) for chunk in chunks)))
+        try:
+            corrected = await self._achat("gpt-4o", correction_messages(transcript), 0.1, usage)
+            logger.info("Transcript corrected successfully")
+            return corrected
             
-            logger.info(f"QA analysis completed in {result['processing_time_seconds']:.2f}s")
-            return result
+        except Exception as e:
+            logger.error(f"Failed to correct transcript: {e}")
+            return transcript
+    
+    async def agenerate_feedback(self, transcript: str, model: str = "gpt-4o", usage: Optional[LLMUsage] = None) -> Dict[str, Any]:
+        """Async variant of generate_feedback; run it on the LLM runner loop"""
+        if is_long_transcript(transcript):
+            return await self._ascore_chunked(transcript, model, usage, single_pass=False)
+        return await self._ascore_part(transcript, model, usage, single_pass=False)
+    
+    async def acorrect_and_score(self, transcript: str, model: str = "gpt-4o", usage: Optional[LLMUsage] = None) -> Dict[str, Any]:
+        """Async variant of correct_and_score; run it on the LLM runner loop"""
+        if is_long_transcript(transcript):
+            return await self._ascore_chunked(transcript, model, usage, single_pass=True)
+        return await self._ascore_part(transcript, model, usage, single_pass=True)
+    
+    async def _ascore_part(self, transcript: str, model: str, usage: Optional[LLMUsage], single_pass: bool,
+                           part: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+        start_time = time.time()
+        try:
+            if single_pass:
+                content = await self._achat(model, single_pass_messages(transcript, part), 0.2, usage, parse_feedback_content,
+                                            response_format={"type": "json_object"})
+            else:
+                content = await self._achat(model, feedback_messages(transcript, part), 0.3, usage, parse_feedback_content)
+            return self._feedback_result(content, transcript, model, start_time, single_pass)
             
         except Exception as e:
-            logger.error(f"Failed to generate QA feedback: {e}")
-            return {
-                "agent_summary": "Analysis failed",
-                "qa_scores": {},
-                "qa_feedback": f"Error generating feedback: {str(e)}",
-                "overall_score": 0,
-                "positive_count": 0,
-                "negative_count": 0,
-                "neutral_count": 0,
-                "processing_time_seconds": time.time() - start_time,
-                "model_used": model
-            }
+            return self._failed_result(e, transcript, model, start_time, single_pass)
+    
+    async def _ascore_chunked(self, transcript: str, model: str, usage: Optional[LLMUsage], single_pass: bool) -> Dict[str, Any]:
+        start_time = time.time()
+        chunks = split_transcript(transcript, settings.long_transcript_chunk_tokens)
+        partials = await asyncio.gather(*(
+            self._ascore_part(chunk, model, usage, single_pass, (i + 1, len(chunks)))
+            for i, chunk in enumerate(chunks)
+        ))
+        return self._merged_result(list(partials), chunks, transcript, model, start_time, single_pass)
+    
+    def _feedback_result(self, content: str, transcript: str, model: str, start_time: float,
+                         single_pass: bool = False) -> Dict[str, Any]:
+        result = parse_feedback_content(content)
+        if single_pass:
+            result["corrected_transcript"] = result.get("corrected_transcript") or transcript
+        result["processing_time_seconds"] = time.time() - start_time
+        result["model_used"] = model
+        
+        logger.info(f"QA analysis completed in {result['processing_time_seconds']:.2f}s")
+        return result
+    
+    def _failed_result(self, error: Exception, transcript: str, model: str, start_time: float,
+                       single_pass: bool) -> Dict[str, Any]:
+        if single_pass:
+            logger.error(f"Failed to generate single-pass QA feedback: {error}")
+        else:
+            logger.error(f"Failed to generate QA feedback: {error}")
+        result = failed_feedback(error, model, time.time() - start_time)
+        if single_pass:
+            result["corrected_transcript"] = transcript
+        return result
+    
+    def _merged_result(self, partials: List[Dict[str, Any]], chunks: List[str], transcript: str, model: str,
+                       start_time: float, single_pass: bool) -> Dict[str, Any]:
+        result = dict(merge_chunk_feedback(partials, [len(chunk) for chunk in chunks], model))
+        if single_pass and "corrected_transcript" not in result:
+            result["corrected_transcript"] = transcript
+        result["processing_time_seconds"] = time.time() - start_time
+        logger.info(f"Chunked QA analysis of {len(chunks)} parts completed in {result['processing_time_seconds']:.2f}s")
+        return result
+
+_service: Optional[EnhancedQAService] = None
+_service_lock = threading.Lock()
+
+def get_qa_service() -> EnhancedQAService:
+    """Process-wide service, created lazily on first use"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = EnhancedQAService()
+    return _service
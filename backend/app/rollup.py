@@ -0,0 +1,201 @@
+"""Incrementally maintained agent_daily_stats rollup.
+
+Every flush through SessionLocal turns new, changed and deleted calls and
+reports into per (company, project, agent, UTC day) deltas and upserts them
+in the same transaction, so the rollup commits or rolls back with the data.
+Bulk UPDATEs that bypass the ORM only touch statuses the rollup does not
+count (uploaded/processing/failed). Backfill or repair with:
+
+    python -m app.rollup rebuild
+"""
+import sys
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import case, delete, distinct, event, func, insert, literal_column, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+from .database import SessionLocal
+from .models import AgentDailyStats, Call, QAReport
+
+logger = logging.getLogger(__name__)
+
+RollupKey = Tuple[int, int, str, date]
+# total_calls, completed_calls, score_sum, score_count
+COUNTERS = ("total_calls", "completed_calls", "score_sum", "score_count")
+
+def utc_day(value: Optional[datetime]) -> date:
+    if value is None:
+        # Not flushed yet; uploaded_at defaults to now()
+        return datetime.now(timezone.utc).date()
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+def day_expression(dialect_name: str, column=Call.uploaded_at):
+    if dialect_name == "postgresql":
+        return func.date(func.timezone(literal_column("'UTC'"), column))
+    return func.date(column)
+
+def _key(company_id, project_id, agent_name, uploaded_at) -> Optional[RollupKey]:
+    if not agent_name or project_id is None or company_id is None:
+        return None
+    return (company_id, project_id, agent_name, utc_day(uploaded_at))
+
+def _old(obj, attr):
+    history = get_history(obj, attr)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, attr)
+
+def _call_key(call: Call, old: bool = False) -> Optional[RollupKey]:
+    """Keyed on the denormalized tenant, stamped by models._stamp_tenants earlier in the flush"""
+    if old:
+        return _key(
+            _old(call, "company_id"), _old(call, "project_id"), _old(call, "agent_name"), _old(call, "uploaded_at")
+        )
+    return _key(call.company_id, call.project_id, call.agent_name, call.uploaded_at)
+
+def _report_totals(session: Session, call_id: int) -> Tuple[float, int]:
+    score_sum, score_count = session.query(
+        func.coalesce(func.sum(QAReport.overall_score), 0), func.count(QAReport.overall_score)
+    ).filter(QAReport.call_id == call_id).one()
+    return float(score_sum), score_count
+
+def collect_deltas(session: Session) -> Dict[RollupKey, List[float]]:
+    deltas: Dict[RollupKey, List[float]] = defaultdict(lambda: [0, 0, 0.0, 0])
+
+    def add(key, total=0, completed=0, score_sum=0.0, score_count=0):
+        if key is None:
+            return
+        delta = deltas[key]
+        delta[0] += total
+        delta[1] += completed
+        delta[2] += score_sum
+        delta[3] += score_count
+
+    def report_call_key(report: QAReport) -> Optional[RollupKey]:
+        call = session.get(Call, report.call_id) if report.call_id is not None else report.call
+        return _call_key(call) if call is not None else None
+
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, Call):
+                add(_call_key(obj), total=1, completed=int(obj.status == "completed"))
+            elif isinstance(obj, QAReport) and obj.overall_score is not None:
+                add(report_call_key(obj), score_sum=obj.overall_score, score_count=1)
+
+        for obj in session.dirty:
+            if not session.is_modified(obj):
+                continue
+            if isinstance(obj, Call):
+                old_key, new_key = _call_key(obj, old=True), _call_key(obj)
+                old_completed = int(_old(obj, "status") == "completed")
+                new_completed = int(obj.status == "completed")
+                if old_key != new_key:
+                    # Re-keyed (agent, project or day changed): move the whole call
+                    score_sum, score_count = _report_totals(session, obj.id)
+                    add(old_key, -1, -old_completed, -score_sum, -score_count)
+                    add(new_key, 1, new_completed, score_sum, score_count)
+                else:
+                    add(new_key, completed=new_completed - old_completed)
+            elif isinstance(obj, QAReport):
+                old_score, new_score = _old(obj, "overall_score"), obj.overall_score
+                if old_score != new_score:
+                    key = report_call_key(obj)
+                    if old_score is not None:
+                        add(key, score_sum=-old_score, score_count=-1)
+                    if new_score is not None:
+                        add(key, score_sum=new_score, score_count=1)
+
+        for obj in session.deleted:
+            if isinstance(obj, Call):
+                add(_call_key(obj, old=True), total=-1, completed=-int(_old(obj, "status") == "completed"))
+            elif isinstance(obj, QAReport) and obj.overall_score is not None:
+                add(report_call_key(obj), score_sum=-obj.overall_score, score_count=-1)
+
+    return {key: delta for key, delta in deltas.items() if any(delta)}
+
+def apply_deltas(connection, deltas: Dict[RollupKey, List[float]]):
+    """Upsert counter deltas; ON CONFLICT where the dialect has it"""
+    table = AgentDailyStats.__table__
+    dialect_name = connection.dialect.name
+    for (company_id, project_id, agent_name, day), delta in deltas.items():
+        values = dict(zip(COUNTERS, delta))
+        row = dict(company_id=company_id, project_id=project_id, agent_name=agent_name, day=day, **values)
+        if dialect_name in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+            stmt = dialect_insert(table).values(**row)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["company_id", "project_id", "agent_name", "day"],
+                set_={name: table.c[name] + stmt.excluded[name] for name in COUNTERS}
+            )
+            connection.execute(stmt)
+            continue
+        result = connection.execute(
+            update(table).where(
+                table.c.company_id == company_id, table.c.project_id == project_id,
+                table.c.agent_name == agent_name, table.c.day == day
+            ).values({name: table.c[name] + value for name, value in values.items()})
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(**row))
+
+def _track_old_value(target, value, oldvalue, initiator):
+    return value
+
+# Committed objects are expired; without active history a plain assignment
+# does not load the previous value and the delta would be lost
+for _attribute in (Call.status, Call.agent_name, Call.project_id, Call.company_id, Call.uploaded_at,
+                   QAReport.overall_score):
+    event.listen(_attribute, "set", _track_old_value, active_history=True, retval=True)
+
+@event.listens_for(SessionLocal, "before_flush")
+def _maintain_rollup(session: Session, flush_context, instances):
+    deltas = collect_deltas(session)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+def rebuild_statement(dialect_name: str):
+    """INSERT ... SELECT of the full rollup from calls and reports"""
+    day = day_expression(dialect_name).label("day")
+    source = select(
+        Call.company_id,
+        Call.project_id,
+        Call.agent_name,
+        day,
+        func.count(distinct(Call.id)),
+        func.count(distinct(case((Call.status == "completed", Call.id)))),
+        func.coalesce(func.sum(QAReport.overall_score), 0),
+        func.count(QAReport.overall_score)
+    ).select_from(Call).outerjoin(QAReport, QAReport.call_id == Call.id).where(
+        Call.agent_name.isnot(None), Call.company_id.isnot(None)
+    ).group_by(Call.company_id, Call.project_id, Call.agent_name, day)
+    return insert(AgentDailyStats).from_select(
+        ["company_id", "project_id", "agent_name", "day", *COUNTERS], source
+    )
+
+def rebuild(db: Session):
+    """Recompute the whole rollup in one transaction"""
+    db.execute(delete(AgentDailyStats))
+    db.execute(rebuild_statement(db.bind.dialect.name))
+    db.commit()
+    return db.query(AgentDailyStats).count()
+
+def main(argv: List[str]):
+    if argv[1:] != ["rebuild"]:
+        print("usage: python -m app.rollup rebuild")
+        return 2
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        rows = rebuild(db)
+    finally:
+        db.close()
+    logger.info(f"Rebuilt agent_daily_stats: {rows} rows")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -1,37 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import String, cast, func, insert, literal, select, text, tuple_
+from typing import Callable, Iterable, Iterator, List, Literal, Optional, Tuple
+import base64
+import json
 import uuid
-import boto3
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi.responses import StreamingResponse
 import io
 import csv
-from ..database import get_db
-from ..models import Call, QAReport, User, Project
-from ..schemas import Call as CallSchema, QAReport as QAReportSchema, UploadRequest, UploadResponse
+import zlib
+from ..database import SessionLocal, get_async_db
+from ..models import Call, Project, QAReport, User
+from ..schemas import (
+    AnalyzeBatchRequest, Call as CallSchema, CallPage, CallSearchHit, QAReport as QAReportSchema, UploadBatchRequest,
+    UploadBatchResponse, UploadRequest, UploadResponse, PipelineMode
+)
 from ..auth import get_current_active_user, require_company_manager
-from ..qa_service import EnhancedQAService
+from ..pipeline import PipelineBusy, get_pipeline
+from ..scheduler import claim_calls, release_call, requeue_stale_calls, stale_claim_seconds
 from ..config import settings
+from ..clients import get_s3_client
+from ..search import agent_filter, calls_text_filter, search_reports
+from ..dashboard_cache import get_dashboard_cache
+from .. import analytics_export
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Lazy initialization to avoid startup-time side effects
-def get_s3_client():
-    return boto3.client('s3', region_name=settings.aws_region)
-
-def get_qa_service():
-    return EnhancedQAService()
-
 @router.post("/upload-url", response_model=UploadResponse)
 async def create_upload_url(
     request: UploadRequest,
     project_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create presigned URL for S3 upload and call record"""
     try:
@@ -58,8 +63,8 @@ async def create_upload_url(
             status="uploaded"
         )
         db.add(call)
-        db.commit()
-        db.refresh(call)
+        await db.commit()
+        await db.refresh(call)
         
         return UploadResponse(
             upload_url=upload_url,
@@ -71,101 +76,327 @@ async def create_upload_url(
         logger.error(f"Failed to create upload URL: {e}")
         raise HTTPException(status_code=500, detail="Failed to create upload URL")
 
+def _check_batch_size(count: int):
+    if count > settings.upload_batch_max_files:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.upload_batch_max_files} items per batch request"
+        )
+
+def _presign_uploads(project_id: int, files: List[UploadRequest]) -> List[Tuple[str, str]]:
+    """(s3_key, upload_url) per file; signing is local CPU work, no S3 round trip"""
+    s3 = get_s3_client()
+    presigned = []
+    for file in files:
+        s3_key = f"uploads/{project_id}/{uuid.uuid4()}_{file.filename}"
+        upload_url = s3.generate_presigned_url(
+            'put_object',
+            Params={'Bucket': settings.aws_s3_bucket_input, 'Key': s3_key, 'ContentType': file.content_type},
+            ExpiresIn=3600
+        )
+        presigned.append((s3_key, upload_url))
+    return presigned
+
+@router.post("/upload-url/batch", response_model=UploadBatchResponse)
+async def create_upload_urls(
+    request: UploadBatchRequest,
+    project_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Presigned S3 URLs and call records for many files in one request"""
+    _check_batch_size(len(request.files))
+    project = await db.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if current_user.role != "admin" and current_user.company_id != project.company_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    if not request.files:
+        return UploadBatchResponse(uploads=[])
+    
+    try:
+        # Thousands of signatures would otherwise hold up the event loop
+        presigned = await run_in_threadpool(_presign_uploads, project_id, request.files)
+        
+        # One multi-row INSERT ... RETURNING for the whole batch. Bulk inserts
+        # skip the mapper events, so the tenant key is set here.
+        result = await db.execute(
+            insert(Call).returning(Call.id, sort_by_parameter_order=True),
+            [
+                {"project_id": project_id, "company_id": project.company_id, "filename": file.filename,
+                 "s3_key": s3_key, "status": "uploaded"}
+                for file, (s3_key, _upload_url) in zip(request.files, presigned)
+            ]
+        )
+        call_ids = result.scalars().all()
+        await db.commit()
+    except Exception as e:
+        logger.error(f"Failed to create {len(request.files)} upload URLs: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create upload URLs")
+    
+    # Bulk inserts bypass the flush hooks that invalidate cached dashboards
+    get_dashboard_cache().bump({project.company_id})
+    return UploadBatchResponse(uploads=[
+        UploadResponse(upload_url=upload_url, s3_key=s3_key, call_id=call_id)
+        for (s3_key, upload_url), call_id in zip(presigned, call_ids)
+    ])
+
+def _filtered_calls(db: Session, current_user: User, project_id: Optional[int], status: Optional[str],
+                    start_date: Optional[datetime], end_date: Optional[datetime], agent: Optional[str],
+                    q: Optional[str]):
+    """Calls visible to the user, narrowed by the list/export filters"""
+    query = db.query(Call)
+    if current_user.role != "admin":
+        query = query.filter(Call.company_id == current_user.company_id)
+    
+    if project_id:
+        query = query.filter(Call.project_id == project_id)
+    if status:
+        query = query.filter(Call.status == status)
+    if start_date:
+        query = query.filter(Call.uploaded_at >= start_date)
+    if end_date:
+        query = query.filter(Call.uploaded_at <= end_date)
+    if agent:
+        query = query.filter(agent_filter(db, agent))
+    if q:
+        query = query.filter(calls_text_filter(db, q))
+    return query
+
+def _encode_cursor(db: Session, call: Call) -> str:
+    if db.bind.dialect.name == 'sqlite':
+        # SQLite compares timestamps as text; keep the stored form so ties seek exactly
+        uploaded_at = db.query(cast(Call.uploaded_at, String)).filter(Call.id == call.id).scalar()
+    else:
+        uploaded_at = call.uploaded_at.isoformat()
+    raw = json.dumps([uploaded_at, call.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _cursor_filter(db: Session, cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        uploaded_at, call_id = json.loads(raw)
+        call_id = int(call_id)
+        if db.bind.dialect.name == 'sqlite':
+            boundary = literal(str(uploaded_at), String)
+        else:
+            boundary = literal(datetime.fromisoformat(uploaded_at), Call.uploaded_at.type)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Row-value comparison seeks past the previous page on the (uploaded_at, id) index
+    return tuple_(Call.uploaded_at, Call.id) < tuple_(boundary, literal(call_id))
+
+def _estimate_count(db: Session, query) -> Tuple[int, bool]:
+    """Planner row estimate on PostgreSQL; elsewhere an exact count capped at calls_page_count_cap"""
+    if db.bind.dialect.name == 'postgresql':
+        # Render values inline for the planner probe: the driver's placeholders ($1
+        # on asyncpg) do not survive being spliced into a second statement
+        sql = str(query.statement.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}))
+        plan = db.execute(text("EXPLAIN (FORMAT JSON) " + sql.replace(":", "\\:"))).scalar()
+        if isinstance(plan, str):
+            # asyncpg hands json back undecoded
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"]), True
+    cap = settings.calls_page_count_cap
+    capped = db.query(func.count()).select_from(query.with_entities(Call.id).limit(cap + 1).subquery()).scalar()
+    return min(capped, cap), capped > cap
+
+@router.get("/page", response_model=CallPage)
+async def list_calls_page(
+    project_id: Optional[int] = None,
+    status: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    agent: Optional[str] = None,
+    q: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    include_total: bool = False,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Page through calls newest first; pass next_cursor back as cursor for the next page"""
+    filters = (project_id, status, start_date, end_date, agent, q)
+    return await db.run_sync(_calls_page, current_user, filters, cursor, limit, include_total)
+
+def _calls_page(db: Session, current_user: User, filters: tuple, cursor: Optional[str], limit: int,
+                include_total: bool) -> CallPage:
+    query = _filtered_calls(db, current_user, *filters)
+    
+    total, total_is_estimate = None, False
+    if include_total and cursor is None:
+        total, total_is_estimate = _estimate_count(db, query)
+    
+    if cursor:
+        query = query.filter(_cursor_filter(db, cursor))
+    
+    rows = query.order_by(Call.uploaded_at.desc(), Call.id.desc()).limit(limit + 1).all()
+    items = rows[:limit]
+    return CallPage(
+        items=items,
+        next_cursor=_encode_cursor(db, items[-1]) if len(rows) > limit else None,
+        total=total,
+        total_is_estimate=total_is_estimate
+    )
+
+@router.get("/search", response_model=List[CallSearchHit])
+async def search_calls(
+    q: str = Query(..., min_length=2),
+    project_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ranked search of the current report's corrected transcript and feedback"""
+    company_id = current_user.company_id if current_user.role != "admin" else None
+    hits = await db.run_sync(search_reports, q, limit, project_id=project_id, company_id=company_id)
+    return [CallSearchHit(call=call, report_id=report_id, rank=rank) for call, report_id, rank in hits]
+
+EXPORT_HEADER = [
+    "id", "project_id", "filename", "agent_name", "customer_name", "status",
+    "uploaded_at", "processed_at", "call_duration", "error_message"
+]
+EXPORT_COLUMNS = (
+    Call.id, Call.project_id, Call.filename, Call.agent_name, Call.customer_name, Call.status,
+    Call.uploaded_at, Call.processed_at, Call.call_duration, Call.error_message
+)
+
+def _csv_columns(query):
+    return query.with_entities(*EXPORT_COLUMNS)
+
+def _export_rows(current_user: User, filters: tuple, columns: Callable) -> Iterator[tuple]:
+    """Filtered export rows, narrowed by `columns` and fetched in batches through a server-side cursor"""
+    # The request session is gone by the time the response streams; use our own
+    db = SessionLocal()
+    try:
+        query = columns(_filtered_calls(db, current_user, *filters))
+        query = query.order_by(Call.uploaded_at.desc(), Call.id.desc()).yield_per(settings.calls_export_batch_size)
+        yield from query
+    finally:
+        db.close()
+
+def _csv_chunks(rows: Iterable[tuple]) -> Iterator[bytes]:
+    """CSV text, one chunk per batch of rows; the header goes out before the first query"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADER)
+    yield buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    for n, (call_id, project_id, filename, agent_name, customer_name, status, uploaded_at, processed_at,
+            call_duration, error_message) in enumerate(rows, 1):
+        writer.writerow([
+            call_id,
+            project_id,
+            filename,
+            agent_name or "",
+            customer_name or "",
+            status,
+            uploaded_at.isoformat() if uploaded_at else "",
+            processed_at.isoformat() if processed_at else "",
+            call_duration if call_duration is not None else "",
+            error_message or "",
+        ])
+        if n % settings.calls_export_batch_size == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        # Sync-flush each batch so the client sees bytes as they are produced
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+@router.get("/export")
+async def export_calls(
+    project_id: Optional[int] = None,
+    status: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    agent: Optional[str] = None,
+    q: Optional[str] = None,
+    gzip: bool = False,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Export calls as CSV with current filters, streamed as it is read"""
+    filters = (project_id, status, start_date, end_date, agent, q)
+    chunks = _csv_chunks(_export_rows(current_user, filters, _csv_columns))
+
+    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    headers = {
+        "Content-Disposition": f"attachment; filename=calls_{ts}.csv"
+    }
+    if gzip:
+        chunks = _gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(chunks, media_type="text/csv", headers=headers)
+
+@router.get("/export/analytics")
+async def export_calls_analytics(
+    format: Literal["parquet", "arrow"] = "parquet",
+    project_id: Optional[int] = None,
+    status: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    agent: Optional[str] = None,
+    q: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Export calls with their newest report and flattened QA scores as Parquet or Arrow IPC"""
+    filters = (project_id, status, start_date, end_date, agent, q)
+    media_type, extension = analytics_export.FORMATS[format]
+    chunks = analytics_export.stream(_export_rows(current_user, filters, analytics_export.joined_rows), format)
+
+    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    headers = {
+        "Content-Disposition": f"attachment; filename=calls_{ts}.{extension}"
+    }
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
 @router.post("/{call_id}/analyze")
 async def analyze_call(
     call_id: int,
-    background_tasks: BackgroundTasks,
     model: str = "gpt-4o",
+    mode: Optional[PipelineMode] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Start call analysis"""
-    call = db.query(Call).filter(Call.id == call_id).first()
+    call = await db.get(Call, call_id)
     if not call:
         raise HTTPException(status_code=404, detail="Call not found")
     
     # Update status
+    previous_status = call.status
     call.status = "processing"
-    db.commit()
-    
-    # Start background analysis
-    background_tasks.add_task(process_call_analysis, call_id, model)
+    call.claimed_at = datetime.now(timezone.utc)
+    await db.commit()
     
-    return {"message": "Analysis started", "call_id": call_id}
-
-def process_call_analysis(call_id: int, model: str = "gpt-4o"):
-    """Background task to process call analysis"""
-    db = next(get_db())
+    # Hand off to the analysis pipeline
     try:
-        call = db.query(Call).filter(Call.id == call_id).first()
-        if not call:
-            return
-        
-        # Generate job name
-        job_name = f"qa-call-{call_id}-{int(datetime.now().timestamp())}"
-        
-        # Start transcription
-        qa_service = get_qa_service()
-        s3_output_key = qa_service.start_transcription(call.s3_key, job_name)
-        call.transcription_job_name = job_name
-        call.s3_output_key = s3_output_key
-        db.commit()
-        
-        # Wait for transcription
-        transcript = qa_service.get_transcription(job_name)
-        if not transcript:
-            call.status = "failed"
-            call.error_message = "Transcription failed"
-            db.commit()
-            return
-        
-        # Correct transcript
-        corrected_transcript = qa_service.correct_transcript(transcript)
-        
-        # Generate QA feedback
-        qa_result = qa_service.generate_feedback(corrected_transcript, model)
-        
-        # Create QA report
-        qa_report = QAReport(
-            call_id=call_id,
-            transcript=transcript,
-            corrected_transcript=corrected_transcript,
-            agent_summary=qa_result.get("agent_summary", ""),
-            qa_scores=qa_result.get("qa_scores", {}),
-            qa_feedback=qa_result.get("qa_feedback", ""),
-            overall_score=qa_result.get("overall_score", 0),
-            positive_count=qa_result.get("positive_count", 0),
-            negative_count=qa_result.get("negative_count", 0),
-            neutral_count=qa_result.get("neutral_count", 0),
-            model_used=qa_result.get("model_used", model),
-            processing_time_seconds=qa_result.get("processing_time_seconds", 0)
+        get_pipeline().submit(call_id, model, mode)
+    except PipelineBusy:
+        call.status = previous_status
+        await db.commit()
+        raise HTTPException(
+            status_code=503,
+            detail="Analysis queue is full, try again shortly",
+            headers={"Retry-After": "30"}
         )
-        
-        db.add(qa_report)
-        call.status = "completed"
-        call.processed_at = datetime.now()
-        db.commit()
-        
-        logger.info(f"Call {call_id} analysis completed")
-        
-    except Exception as e:
-        logger.error(f"Call analysis failed for {call_id}: {e}")
-        call = db.query(Call).filter(Call.id == call_id).first()
-        if call:
-            call.status = "failed"
-            call.error_message = str(e)
-            db.commit()
-    finally:
-        db.close()
+    
+    return {"message": "Analysis started", "call_id": call_id}
 
 @router.get("/{call_id}", response_model=CallSchema)
 async def get_call(
     call_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get call details"""
-    call = db.query(Call).filter(Call.id == call_id).first()
+    call = await db.get(Call, call_id)
     if not call:
         raise HTTPException(status_code=404, detail="Call not found")
     return call
@@ -174,10 +405,16 @@ async def get_call(
 async def get_call_report(
     call_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get QA report for call"""
-    report = db.query(QAReport).filter(QAReport.call_id == call_id).first()
+    # Re-scoring adds reports; the newest one is current
+    # Serialization cannot lazy-load on an AsyncSession; fetch the transcripts with the report
+    report = (await db.execute(
+        select(QAReport).where(QAReport.call_id == call_id).order_by(
+            QAReport.created_at.desc(), QAReport.id.desc()
+        ).limit(1).options(selectinload(QAReport.transcript_blob))
+    )).scalars().first()
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
     return report
@@ -192,124 +429,77 @@ async def list_calls(
     q: Optional[str] = None,
     limit: int = 50,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List calls with optional filtering"""
-    query = db.query(Call)
-    if current_user.role != "admin":
-        query = query.join(Project).filter(Project.company_id == current_user.company_id)
-    
-    if project_id:
-        query = query.filter(Call.project_id == project_id)
-    if status:
-        query = query.filter(Call.status == status)
-    if start_date:
-        query = query.filter(Call.uploaded_at >= start_date)
-    if end_date:
-        query = query.filter(Call.uploaded_at <= end_date)
-    if agent:
-        query = query.filter(Call.agent_name.ilike(f"%{agent}%"))
-    if q:
-        like = f"%{q}%"
-        query = query.filter(
-            or_(
-                Call.filename.ilike(like),
-                Call.agent_name.ilike(like),
-                Call.customer_name.ilike(like)
-            )
-        )
-    
-    return query.order_by(Call.uploaded_at.desc()).limit(limit).all()
+    filters = (project_id, status, start_date, end_date, agent, q)
+    return await db.run_sync(_list_calls, current_user, filters, limit)
 
-@router.get("/export")
-async def export_calls(
-    project_id: Optional[int] = None,
-    status: Optional[str] = None,
-    start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None,
-    agent: Optional[str] = None,
-    q: Optional[str] = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """Export calls as CSV with current filters"""
-    query = db.query(Call)
-    if current_user.role != "admin":
-        query = query.join(Project).filter(Project.company_id == current_user.company_id)
-    if project_id:
-        query = query.filter(Call.project_id == project_id)
-    if status:
-        query = query.filter(Call.status == status)
-    if start_date:
-        query = query.filter(Call.uploaded_at >= start_date)
-    if end_date:
-        query = query.filter(Call.uploaded_at <= end_date)
-    if agent:
-        query = query.filter(Call.agent_name.ilike(f"%{agent}%"))
-    if q:
-        like = f"%{q}%"
-        query = query.filter(
-            or_(
-                Call.filename.ilike(like),
-                Call.agent_name.ilike(like),
-                Call.customer_name.ilike(like)
-            )
-        )
-
-    rows = query.order_by(Call.uploaded_at.desc()).all()
-
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow([
-        "id", "project_id", "filename", "agent_name", "customer_name", "status",
-        "uploaded_at", "processed_at", "call_duration", "error_message"
-    ])
-    for c in rows:
-        writer.writerow([
-            c.id,
-            c.project_id,
-            c.filename,
-            c.agent_name or "",
-            c.customer_name or "",
-            c.status,
-            c.uploaded_at.isoformat() if c.uploaded_at else "",
-            c.processed_at.isoformat() if c.processed_at else "",
-            c.call_duration if c.call_duration is not None else "",
-            c.error_message or "",
-        ])
-
-    buffer.seek(0)
-    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    headers = {
-        "Content-Disposition": f"attachment; filename=calls_{ts}.csv"
-    }
-    return StreamingResponse(iter([buffer.getvalue()]), media_type="text/csv", headers=headers)
+def _list_calls(db: Session, current_user: User, filters: tuple, limit: int) -> List[Call]:
+    return _filtered_calls(db, current_user, *filters).order_by(Call.uploaded_at.desc()).limit(limit).all()
 
 @router.post("/process-pending")
 async def process_pending_calls(
-    background_tasks: BackgroundTasks,
     project_id: Optional[int] = None,
     limit: int = 20,
     current_user: User = Depends(require_company_manager),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Batch process pending calls"""
-    query = db.query(Call).filter(Call.status == "uploaded")
-    
-    if project_id:
-        query = query.filter(Call.project_id == project_id)
-    
-    if current_user.role != "admin":
-        # Filter by company
-        from ..models import Project
-        query = query.join(Project).filter(Project.company_id == current_user.company_id)
-    
-    pending_calls = query.limit(limit).all()
-    
-    for call in pending_calls:
-        background_tasks.add_task(process_call_analysis, call.id)
+    company_id = current_user.company_id if current_user.role != "admin" else None
+    return await db.run_sync(_process_pending, project_id, company_id, limit)
+
+def _process_pending(db: Session, project_id: Optional[int], company_id: Optional[int], limit: int) -> dict:
+    # Never claim more than the pipeline can admit; the rest stay pending.
+    # claim_calls is safe against the dispatcher and other instances.
+    # Calls stranded in processing by a restart are requeued first, so this
+    # also recovers them when the dispatcher is off.
+    requeue_stale_calls(db, stale_claim_seconds(), company_id=company_id)
+    pipeline = get_pipeline()
+    claimed = claim_calls(db, min(limit, pipeline.free_capacity()), project_id=project_id, company_id=company_id)
+    queued = _submit_claimed(db, claimed)
     
     return {
         "message": "Pending call processing started",
-        "calls_queued": len(pending_calls)
+        "calls_queued": queued,
+        "pipeline_free_capacity": pipeline.free_capacity()
+    }
+
+def _submit_claimed(db: Session, claimed: List[Tuple[int, datetime]], model: str = "gpt-4o",
+                    mode: Optional[str] = None) -> int:
+    """Hand claimed calls to the pipeline, releasing any it turns away; returns how many went in"""
+    pipeline = get_pipeline()
+    queued = 0
+    for call_id, _uploaded_at in claimed:
+        try:
+            pipeline.submit(call_id, model, mode)
+            queued += 1
+        except PipelineBusy:
+            release_call(db, call_id)
+    return queued
+
+@router.post("/analyze/batch")
+async def analyze_calls(
+    request: AnalyzeBatchRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Start analysis of uploaded calls, e.g. once a batch upload finishes"""
+    _check_batch_size(len(request.call_ids))
+    company_id = current_user.company_id if current_user.role != "admin" else None
+    return await db.run_sync(_analyze_batch, request, company_id)
+
+def _analyze_batch(db: Session, request: AnalyzeBatchRequest, company_id: Optional[int]) -> dict:
+    # Only calls still waiting are claimed, in one pass. Whatever the pipeline
+    # cannot admit now stays uploaded for the dispatcher (when enabled) or process-pending.
+    pipeline = get_pipeline()
+    claimed = claim_calls(db, min(len(request.call_ids), pipeline.free_capacity()),
+                          company_id=company_id, call_ids=request.call_ids)
+    queued = _submit_claimed(db, claimed, request.model, request.mode)
+    
+    return {
+        "message": "Analysis started",
+        "calls_requested": len(request.call_ids),
+        "calls_queued": queued,
+        "pipeline_free_capacity": pipeline.free_capacity()
     }
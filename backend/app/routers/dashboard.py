@@ -1,87 +1,155 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from typing import List, Optional
-from datetime import datetime
+from sqlalchemy import func, case, distinct, select
+from typing import Awaitable, Callable, List, Optional, Tuple
+from datetime import date, datetime, time, timezone
 import io
 import csv
-from ..database import get_db
-from ..models import Call, QAReport, User, Project
+from ..database import get_async_db
+from ..models import AgentDailyStats, Call, QAReport, User
 from ..schemas import DashboardStats, AgentPerformance
 from ..auth import get_current_active_user
+from ..config import settings
+from ..dashboard_cache import etag_for, get_dashboard_cache, normalize_filters, serialize
 
 router = APIRouter()
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    tags = request.headers.get("if-none-match")
+    if not tags:
+        return False
+    # Weak comparison, as If-None-Match requires
+    candidates = [tag.strip() for tag in tags.split(",")]
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+async def _cached_response(request: Request, endpoint: str, current_user: User, filters: tuple,
+                           compute: Callable[[], Awaitable[object]]) -> Response:
+    """Serve from the dashboard cache, re-aggregating on a miss; 304 when the client's ETag still matches"""
+    cache = get_dashboard_cache() if settings.dashboard_cache_enabled else None
+    key, entry = None, None
+    if cache is not None:
+        # Read the key (and so the tenant's version) before aggregating
+        key = cache.key(endpoint, current_user, filters)
+        entry = cache.get(key)
+    if entry is not None:
+        body, etag = entry.body, entry.etag
+    else:
+        body = serialize(await compute())
+        etag = cache.put(key, body).etag if cache is not None else etag_for(body)
+    
+    # Private: the body depends on the bearer token's tenant. no-cache: revalidate every time.
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
+    request: Request,
     project_id: int = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get dashboard statistics"""
-    query = db.query(Call)
+    filters = normalize_filters(project_id=project_id, start_date=start_date, end_date=end_date)
+    return await _cached_response(
+        request, "stats", current_user, filters,
+        lambda: _dashboard_stats(db, current_user, project_id, start_date, end_date)
+    )
+
+async def _dashboard_stats(db: AsyncSession, current_user: User, project_id: Optional[int],
+                           start_date: Optional[datetime], end_date: Optional[datetime]) -> DashboardStats:
+    # One pass over calls outer-joined to their reports. A call can have
+    # several reports once it is re-scored, so calls are counted distinct.
+    query = select(
+        func.count(distinct(Call.id)).label('total_calls'),
+        func.count(distinct(case((Call.status == "completed", Call.id)))).label('processed_calls'),
+        func.count(distinct(case((Call.status.in_(["uploaded", "processing"]), Call.id)))).label('pending_calls'),
+        func.count(distinct(case((Call.status == "failed", Call.id)))).label('failed_calls'),
+        func.avg(QAReport.overall_score).label('average_score'),
+        func.sum(QAReport.processing_time_seconds).label('total_processing_time')
+    ).select_from(Call).outerjoin(QAReport, QAReport.call_id == Call.id)
     
     # Filter by company for non-admin users
     if current_user.role != "admin":
-        query = query.join(Project).filter(Project.company_id == current_user.company_id)
+        query = query.where(Call.company_id == current_user.company_id)
     
     if project_id:
-        query = query.filter(Call.project_id == project_id)
+        query = query.where(Call.project_id == project_id)
     if start_date:
-        query = query.filter(Call.uploaded_at >= start_date)
+        query = query.where(Call.uploaded_at >= start_date)
     if end_date:
-        query = query.filter(Call.uploaded_at <= end_date)
+        query = query.where(Call.uploaded_at <= end_date)
     
-    total_calls = query.count()
-    processed_calls = query.filter(Call.status == "completed").count()
-    pending_calls = query.filter(Call.status.in_(["uploaded", "processing"])).count()
-    failed_calls = query.filter(Call.status == "failed").count()
-    
-    # Get average score
-    filtered_call_ids = [c.id for c in query.all()]
-    avg_score = None
-    total_time = None
-    if filtered_call_ids:
-        avg_score = db.query(func.avg(QAReport.overall_score)).join(Call).filter(
-            Call.id.in_(filtered_call_ids)
-        ).scalar()
-        # Get total processing time
-        total_time = db.query(func.sum(QAReport.processing_time_seconds)).join(Call).filter(
-            Call.id.in_(filtered_call_ids)
-        ).scalar()
+    stats = (await db.execute(query)).one()
     
     return DashboardStats(
-        total_calls=total_calls,
-        processed_calls=processed_calls,
-        pending_calls=pending_calls,
-        failed_calls=failed_calls,
-        average_score=avg_score,
-        total_processing_time=total_time
+        total_calls=stats.total_calls,
+        processed_calls=stats.processed_calls,
+        pending_calls=stats.pending_calls,
+        failed_calls=stats.failed_calls,
+        average_score=stats.average_score,
+        total_processing_time=stats.total_processing_time
     )
 
-@router.get("/agent-performance", response_model=List[AgentPerformance])
-async def get_agent_performance(
-    project_id: int = None,
-    start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None,
-    agent: Optional[str] = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """Get agent performance metrics"""
+def _day_range(start_date: Optional[datetime], end_date: Optional[datetime]) -> Optional[Tuple[Optional[date], Optional[date]]]:
+    """UTC days covered by the filters, or None unless they fall on day boundaries"""
+    def utc(value: datetime) -> datetime:
+        return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+    first = last = None
+    if start_date:
+        start_date = utc(start_date)
+        if start_date.time() != time.min:
+            return None
+        first = start_date.date()
+    if end_date:
+        end_date = utc(end_date)
+        if end_date.time().replace(microsecond=0) != time(23, 59, 59):
+            return None
+        last = end_date.date()
+    return first, last
+
+def _agent_performance_rows(db: Session, current_user: User, project_id: Optional[int],
+                            start_date: Optional[datetime], end_date: Optional[datetime], agent: Optional[str]):
+    """(agent_name, total_calls, average_score, recent_calls) rows, from the daily
+    rollup when the date filters line up with whole UTC days"""
+    days = _day_range(start_date, end_date)
+    if days is not None:
+        query = db.query(
+            AgentDailyStats.agent_name,
+            func.sum(AgentDailyStats.total_calls).label('total_calls'),
+            (func.sum(AgentDailyStats.score_sum) / func.nullif(func.sum(AgentDailyStats.score_count), 0)).label('average_score'),
+            func.sum(AgentDailyStats.completed_calls).label('recent_calls')
+        )
+        if current_user.role != "admin":
+            query = query.filter(AgentDailyStats.company_id == current_user.company_id)
+        if project_id:
+            query = query.filter(AgentDailyStats.project_id == project_id)
+        if days[0]:
+            query = query.filter(AgentDailyStats.day >= days[0])
+        if days[1]:
+            query = query.filter(AgentDailyStats.day <= days[1])
+        if agent:
+            query = query.filter(AgentDailyStats.agent_name.ilike(f"%{agent}%"))
+        return query.group_by(AgentDailyStats.agent_name).having(
+            func.sum(AgentDailyStats.total_calls) > 0
+        ).all()
+
     query = db.query(
         Call.agent_name,
-        func.count(Call.id).label('total_calls'),
+        func.count(distinct(Call.id)).label('total_calls'),
         func.avg(QAReport.overall_score).label('average_score'),
-        func.sum(case((Call.status == 'completed', 1), else_=0)).label('recent_calls')
+        func.count(distinct(case((Call.status == 'completed', Call.id)))).label('recent_calls')
     ).outerjoin(QAReport)
     
     # Filter by company for non-admin users
     if current_user.role != "admin":
-        query = query.join(Project).filter(Project.company_id == current_user.company_id)
+        query = query.filter(Call.company_id == current_user.company_id)
     
     if project_id:
         query = query.filter(Call.project_id == project_id)
@@ -92,7 +160,29 @@ async def get_agent_performance(
     if agent:
         query = query.filter(Call.agent_name.ilike(f"%{agent}%"))
 
-    results = query.filter(Call.agent_name.isnot(None)).group_by(Call.agent_name).all()
+    return query.filter(Call.agent_name.isnot(None)).group_by(Call.agent_name).all()
+
+@router.get("/agent-performance", response_model=List[AgentPerformance])
+async def get_agent_performance(
+    request: Request,
+    project_id: int = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    agent: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get agent performance metrics"""
+    filters = normalize_filters(project_id=project_id, start_date=start_date, end_date=end_date, agent=agent)
+    return await _cached_response(
+        request, "agent-performance", current_user, filters,
+        lambda: _agent_performance(db, current_user, project_id, start_date, end_date, agent)
+    )
+
+async def _agent_performance(db: AsyncSession, current_user: User, project_id: Optional[int],
+                             start_date: Optional[datetime], end_date: Optional[datetime],
+                             agent: Optional[str]) -> List[AgentPerformance]:
+    results = await db.run_sync(_agent_performance_rows, current_user, project_id, start_date, end_date, agent)
     
     return [
         AgentPerformance(
@@ -111,29 +201,10 @@ async def export_agent_performance(
     end_date: Optional[datetime] = None,
     agent: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Export agent performance as CSV"""
-    query = db.query(
-        Call.agent_name,
-        func.count(Call.id).label('total_calls'),
-        func.avg(QAReport.overall_score).label('average_score'),
-        func.sum(case((Call.status == 'completed', 1), else_=0)).label('recent_calls')
-    ).outerjoin(QAReport)
-
-    if current_user.role != "admin":
-        query = query.join(Project).filter(Project.company_id == current_user.company_id)
-
-    if project_id:
-        query = query.filter(Call.project_id == project_id)
-    if start_date:
-        query = query.filter(Call.uploaded_at >= start_date)
-    if end_date:
-        query = query.filter(Call.uploaded_at <= end_date)
-    if agent:
-        query = query.filter(Call.agent_name.ilike(f"%{agent}%"))
-
-    results = query.filter(Call.agent_name.isnot(None)).group_by(Call.agent_name).all()
+    results = await db.run_sync(_agent_performance_rows, current_user, project_id, start_date, end_date, agent)
 
     buffer = io.StringIO()
     writer = csv.writer(buffer)
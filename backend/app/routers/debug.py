@@ -11,8 +11,9 @@ import hashlib
 
 router = APIRouter()
 
+# The database handlers use the synchronous engine; as plain functions they run in the threadpool
 @router.get("/db")
-async def db_health():
+def db_health():
     """Return DB health: dialect, tables, and basic counts. No auth; remove after debugging."""
     info = {"ok": True, "errors": []}
     try:
@@ -54,7 +55,7 @@ async def db_health():
     return info
 
 @router.post("/seed-demo")
-async def seed_demo():
+def seed_demo():
     """Force re-seed demo data (admin, manager, agent, and a demo project). No auth; remove after debugging."""
     try:
         seed_demo_data()
@@ -63,7 +64,7 @@ async def seed_demo():
         return {"ok": False, "error": str(e)}
 
 @router.post("/create-tables")
-async def create_tables():
+def create_tables():
     """Create all ORM tables now (production DB). No auth; remove after debugging."""
     try:
         Base.metadata.create_all(bind=database.engine)
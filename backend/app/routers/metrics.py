@@ -0,0 +1,83 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from ..database import async_engine, engine, get_async_db, pipeline_engine, pool_stats
+from ..models import QAReport, User
+from ..schemas import PipelineModeStats
+from ..auth import require_admin
+from ..pipeline import get_pipeline
+from ..llm_cache import get_llm_cache
+from ..auth_cache import get_auth_cache
+from ..hashing import get_hashing_pool
+from ..dashboard_cache import get_dashboard_cache
+from ..scheduler import get_dispatcher, pending_queue_stats
+
+router = APIRouter()
+
+@router.get("/pipeline")
+async def pipeline_metrics(current_user: User = Depends(require_admin)):
+    """Analysis pipeline admission and per-stage queue depth"""
+    return get_pipeline().stats()
+
+@router.get("/dispatcher")
+async def dispatcher_metrics(
+    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Dispatcher claim rate, queue age and pipeline throughput"""
+    return {**get_dispatcher().stats(), **(await db.run_sync(pending_queue_stats))}
+
+@router.get("/db-pool")
+async def db_pool_metrics(current_user: User = Depends(require_admin)):
+    """Checked-out connections, overflow and checkout wait for the API (async and sync) and pipeline pools"""
+    return {
+        "api": pool_stats(async_engine.pool),
+        "api_sync": pool_stats(engine.pool),
+        "pipeline": pool_stats(pipeline_engine.pool)
+    }
+
+@router.get("/llm-cache")
+async def llm_cache_metrics(current_user: User = Depends(require_admin)):
+    """LLM response cache size and hit/miss counters"""
+    return get_llm_cache().stats()
+
+@router.get("/auth-cache")
+async def auth_cache_metrics(current_user: User = Depends(require_admin)):
+    """Verified-token cache size and hit/miss/invalidation counters"""
+    return get_auth_cache().stats()
+
+@router.get("/hashing")
+async def hashing_metrics(current_user: User = Depends(require_admin)):
+    """Password hashing pool occupancy and rejections"""
+    return get_hashing_pool().stats()
+
+@router.get("/dashboard-cache")
+async def dashboard_cache_metrics(current_user: User = Depends(require_admin)):
+    """Dashboard result cache size, hit/miss counters and version bumps"""
+    return get_dashboard_cache().stats()
+
+@router.get("/llm-modes", response_model=List[PipelineModeStats])
+async def llm_mode_metrics(
+    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Per pipeline mode LLM latency and token usage, for comparing modes"""
+    results = (await db.execute(select(
+        QAReport.pipeline_mode,
+        func.count(QAReport.id).label('reports'),
+        func.avg(QAReport.llm_latency_seconds).label('average_llm_latency_seconds'),
+        func.avg(QAReport.prompt_tokens).label('average_prompt_tokens'),
+        func.avg(QAReport.completion_tokens).label('average_completion_tokens')
+    ).where(QAReport.pipeline_mode.isnot(None)).group_by(QAReport.pipeline_mode))).all()
+    
+    return [
+        PipelineModeStats(
+            pipeline_mode=r.pipeline_mode,
+            reports=r.reports,
+            average_llm_latency_seconds=r.average_llm_latency_seconds,
+            average_prompt_tokens=r.average_prompt_tokens,
+            average_completion_tokens=r.average_completion_tokens
+        )
+        for r in results
+    ]
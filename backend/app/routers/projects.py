@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from ..database import get_db
+from ..database import get_async_db
 from ..models import Project, User
 from ..schemas import Project as ProjectSchema, ProjectCreate, ProjectUpdate
 from ..auth import get_current_active_user, require_company_manager
@@ -12,7 +13,7 @@ router = APIRouter()
 async def create_project(
     project: ProjectCreate,
     current_user: User = Depends(require_company_manager),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new project"""
     # Verify user can create project for this company
@@ -21,34 +22,34 @@ async def create_project(
     
     db_project = Project(**project.dict())
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     return db_project
 
 @router.get("/", response_model=List[ProjectSchema])
 async def list_projects(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List projects accessible to the user"""
-    query = db.query(Project)
+    query = select(Project)
     
     if current_user.role == "company_manager":
-        query = query.filter(Project.company_id == current_user.company_id)
+        query = query.where(Project.company_id == current_user.company_id)
     elif current_user.role == "agent":
         # Agents can see projects from their company
-        query = query.filter(Project.company_id == current_user.company_id)
+        query = query.where(Project.company_id == current_user.company_id)
     
-    return query.filter(Project.is_active == True).all()
+    return (await db.execute(query.where(Project.is_active == True))).scalars().all()
 
 @router.get("/{project_id}", response_model=ProjectSchema)
 async def get_project(
     project_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get project details"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -63,10 +64,10 @@ async def update_project(
     project_id: int,
     project_update: ProjectUpdate,
     current_user: User = Depends(require_company_manager),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update project"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -78,6 +79,6 @@ async def update_project(
     for field, value in project_update.dict(exclude_unset=True).items():
         setattr(project, field, value)
     
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     return project
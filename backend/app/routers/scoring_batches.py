@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import logging
+from ..database import get_async_db, get_db
+from ..models import Project, ScoringBatch, User
+from ..schemas import ScoringBatch as ScoringBatchSchema, ScoringBatchCreate
+from ..auth import get_current_active_user, require_company_manager
+from ..batch_scoring import refresh_scoring_batch, submit_scoring_batches
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def _get_batch(db: Session, batch_id: int, current_user: User) -> ScoringBatch:
+    batch = db.query(ScoringBatch).filter(ScoringBatch.id == batch_id).first()
+    if not batch:
+        raise HTTPException(status_code=404, detail="Scoring batch not found")
+
+    # Verify access
+    project = db.query(Project).filter(Project.id == batch.project_id).first()
+    if current_user.role != "admin" and (not project or current_user.company_id != project.company_id):
+        raise HTTPException(status_code=403, detail="Access denied")
+    return batch
+
+# Submitting and refreshing talk to the OpenAI API through its blocking client,
+# so those two handlers are plain functions and run in the threadpool
+@router.post("/", response_model=List[ScoringBatchSchema])
+def create_scoring_batches(
+    request: ScoringBatchCreate,
+    current_user: User = Depends(require_company_manager),
+    db: Session = Depends(get_db)
+):
+    """Re-score a project's completed calls through the OpenAI Batch API"""
+    project = db.query(Project).filter(Project.id == request.project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    # Verify access
+    if current_user.role != "admin" and current_user.company_id != project.company_id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    try:
+        batches = submit_scoring_batches(db, project.id, request.model, request.call_ids)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to submit scoring batch for project {project.id}: {e}")
+        raise HTTPException(status_code=502, detail="Failed to submit scoring batch")
+
+    if not batches:
+        raise HTTPException(status_code=400, detail="No completed calls with transcripts to re-score")
+    return batches
+
+@router.get("/", response_model=List[ScoringBatchSchema])
+async def list_scoring_batches(
+    project_id: Optional[int] = None,
+    limit: int = 50,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List bulk scoring batches, newest first"""
+    query = select(ScoringBatch).join(Project, ScoringBatch.project_id == Project.id)
+
+    if current_user.role != "admin":
+        query = query.where(Project.company_id == current_user.company_id)
+    if project_id:
+        query = query.where(ScoringBatch.project_id == project_id)
+
+    query = query.order_by(ScoringBatch.created_at.desc(), ScoringBatch.id.desc()).limit(limit)
+    return (await db.execute(query)).scalars().all()
+
+@router.get("/{batch_id}", response_model=ScoringBatchSchema)
+async def get_scoring_batch(
+    batch_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get scoring batch progress"""
+    return await db.run_sync(_get_batch, batch_id, current_user)
+
+@router.post("/{batch_id}/refresh", response_model=ScoringBatchSchema)
+def refresh_batch(
+    batch_id: int,
+    current_user: User = Depends(require_company_manager),
+    db: Session = Depends(get_db)
+):
+    """Check the batch now instead of waiting for the scheduler, ingesting results if finished"""
+    batch = _get_batch(db, batch_id, current_user)
+    try:
+        return refresh_scoring_batch(db, batch)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to refresh scoring batch {batch_id}: {e}")
+        raise HTTPException(status_code=502, detail="Failed to refresh scoring batch")
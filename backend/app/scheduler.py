@@ -1,88 +1,305 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import func, select, update
+import threading
+import time
 import logging
-from .database import SessionLocal
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+from .config import settings
+from .database import pipeline_session
 from .models import Call
-from .routers.calls import process_call_analysis
+from .pipeline import AnalysisPipeline, PipelineBusy, get_pipeline
+from .batch_scoring import poll_scoring_batches
 
 logger = logging.getLogger(__name__)
 scheduler = BackgroundScheduler()
 
-def process_pending_calls_job():
-    """Background job to process pending calls"""
-    db = SessionLocal()
-    try:
-        # Use row-level locking to safely claim calls
-        if db.bind.dialect.name == 'postgresql':
-            # PostgreSQL supports FOR UPDATE SKIP LOCKED
-            pending_calls = db.execute(
-                text("""
-                    SELECT id FROM calls 
-                    WHERE status = 'uploaded' 
-                    ORDER BY uploaded_at ASC 
-                    LIMIT 10 
-                    FOR UPDATE SKIP LOCKED
-                """)
-            ).fetchall()
-            
-            call_ids = [row[0] for row in pending_calls]
-            
-            # Update status to processing
-            if call_ids:
-                db.execute(
-                    text("UPDATE calls SET status = 'processing' WHERE id = ANY(:ids)"),
-                    {"ids": call_ids}
-                )
-                db.commit()
-        else:
-            # Fallback for other databases
-            pending_calls = db.query(Call).filter(
-                Call.status == "uploaded"
-            ).order_by(Call.uploaded_at.asc()).limit(10).all()
-            
-            call_ids = []
-            for call in pending_calls:
-                call.status = "processing"
-                call_ids.append(call.id)
-            
-            db.commit()
-        
-        # Process each call
-        for call_id in call_ids:
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive UTC timestamps
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def _cutoff(db: Session, seconds: float) -> datetime:
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+    # SQLite stores naive UTC timestamps
+    return cutoff if db.bind.dialect.name == 'postgresql' else cutoff.replace(tzinfo=None)
+
+def stale_claim_seconds() -> float:
+    """Age past which a processing call can no longer be running anywhere"""
+    return settings.transcribe_max_wait_seconds + settings.dispatcher_stale_claim_margin_seconds
+
+def claim_calls(db: Session, limit: int, min_age_seconds: float = 0, project_id: Optional[int] = None,
+                company_id: Optional[int] = None, call_ids: Optional[List[int]] = None) -> List[Tuple[int, datetime]]:
+    """Atomically move up to `limit` of the oldest uploaded calls to processing.
+
+    Safe across processes: PostgreSQL skips rows another claimer has locked,
+    other databases only keep rows whose conditional status update won.
+    Returns (call_id, uploaded_at) for the calls this caller now owns.
+    """
+    if limit <= 0:
+        return []
+    postgres = db.bind.dialect.name == 'postgresql'
+    candidates = select(Call.id, Call.uploaded_at).where(Call.status == "uploaded")
+    if min_age_seconds:
+        candidates = candidates.where(Call.uploaded_at <= _cutoff(db, min_age_seconds))
+    if project_id:
+        candidates = candidates.where(Call.project_id == project_id)
+    if company_id:
+        candidates = candidates.where(Call.company_id == company_id)
+    if call_ids is not None:
+        candidates = candidates.where(Call.id.in_(call_ids))
+    candidates = candidates.order_by(Call.uploaded_at.asc(), Call.id.asc()).limit(limit)
+
+    if postgres:
+        ids = candidates.with_only_columns(Call.id).with_for_update(skip_locked=True, of=Call)
+        rows = db.execute(
+            update(Call).where(Call.id.in_(ids.scalar_subquery())).values(status="processing", claimed_at=func.now())
+            .returning(Call.id, Call.uploaded_at).execution_options(synchronize_session=False)
+        ).all()
+    else:
+        rows = []
+        for call_id, uploaded_at in db.execute(candidates).all():
+            result = db.execute(
+                update(Call).where(Call.id == call_id, Call.status == "uploaded")
+                .values(status="processing", claimed_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                rows.append((call_id, uploaded_at))
+    db.commit()
+    return [(row[0], row[1]) for row in rows]
+
+def release_call(db: Session, call_id: int):
+    """Hand a claimed call back to the queue"""
+    db.execute(
+        update(Call).where(Call.id == call_id, Call.status == "processing").values(status="uploaded", claimed_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+def requeue_stale_calls(db: Session, older_than_seconds: float, company_id: Optional[int] = None) -> int:
+    """Put calls claimed longer ago than `older_than_seconds` back to uploaded.
+
+    A claim lives only as long as the process holding it: after a restart or
+    crash nothing finishes or releases the call, and claim_calls only takes
+    uploaded ones. Returns how many calls were requeued.
+    """
+    stale = update(Call).where(Call.status == "processing", Call.claimed_at < _cutoff(db, older_than_seconds))
+    if company_id:
+        stale = stale.where(Call.company_id == company_id)
+    requeued = db.execute(
+        stale.values(status="uploaded", claimed_at=None).execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    if requeued:
+        logger.warning(f"Requeued {requeued} calls stuck in processing for over {older_than_seconds:.0f}s")
+    return requeued
+
+class CallDispatcher:
+    """Continuously feeds uploaded calls into the analysis pipeline.
+
+    Each pass claims as many calls as the pipeline can admit (capped at
+    `dispatcher_max_claim`), so several instances drain one backlog in
+    parallel without double-processing. The pipeline runs claimed calls
+    concurrently. The loop goes straight into the next pass while claims come
+    back full, and backs off exponentially up to
+    `dispatcher_max_idle_seconds` while the queue is empty. `wake()` cuts a
+    back-off short. About once a minute it also requeues calls whose claim
+    went stale (see requeue_stale_calls).
+    """
+
+    def __init__(self, pipeline: Optional[AnalysisPipeline] = None):
+        self.pipeline = pipeline or get_pipeline()
+        self.max_claim = settings.dispatcher_max_claim
+        self.min_age_seconds = settings.dispatcher_min_age_seconds
+        self.idle_seconds = settings.dispatcher_idle_seconds
+        self.max_idle_seconds = settings.dispatcher_max_idle_seconds
+        self.window_seconds = 60.0
+        self.requeue_interval_seconds = 60.0
+        self._next_requeue = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.passes = 0
+        self.claimed = 0
+        self.released = 0
+        self.failed = 0
+        self.requeued = 0
+        self.last_queue_age_seconds: Optional[float] = None
+        self.max_queue_age_seconds = 0.0
+        self.sleep_seconds = self.idle_seconds
+        # (timestamp, calls claimed) and (timestamp, pipeline finished counter)
+        self._claims: Deque[Tuple[float, int]] = deque()
+        self._finished: Deque[Tuple[float, int]] = deque()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="call-dispatcher", daemon=True)
+            self._thread.start()
+            logger.info("Call dispatcher started")
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            logger.info("Call dispatcher stopped")
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
             try:
-                process_call_analysis(call_id)
-                logger.info(f"Processed call {call_id}")
+                claimed, requested = self.dispatch_once()
             except Exception as e:
-                logger.error(f"Failed to process call {call_id}: {e}")
-                # Reset status on failure
-                call = db.query(Call).filter(Call.id == call_id).first()
-                if call:
-                    call.status = "failed"
-                    call.error_message = str(e)
+                logger.error(f"Call dispatcher pass failed: {e}")
+                claimed, requested = 0, -1
+
+            if claimed and claimed == requested:
+                # Full claim: there is probably more waiting
+                continue
+            with self._lock:
+                if claimed or requested == 0:
+                    # Work was found, or the pipeline is full and will free up soon
+                    self.sleep_seconds = self.idle_seconds
+                else:
+                    self.sleep_seconds = min(self.sleep_seconds * 2, self.max_idle_seconds)
+                sleep_seconds = self.sleep_seconds
+            self._wake.wait(sleep_seconds)
+            self._wake.clear()
+
+    def dispatch_once(self) -> Tuple[int, int]:
+        """Claim up to the pipeline's free capacity and submit it; returns (claimed, requested)"""
+        self._requeue_stale()
+        requested = min(self.pipeline.free_capacity(), self.max_claim)
+        self._sample()
+        if requested <= 0:
+            return 0, 0
+
+        db = pipeline_session()
+        try:
+            rows = claim_calls(db, requested, self.min_age_seconds)
+            now = datetime.now(timezone.utc)
+            released, failed = 0, 0
+            for call_id, _uploaded_at in rows:
+                try:
+                    self.pipeline.submit(call_id)
+                except PipelineBusy:
+                    # Someone else filled the pipeline since we sized the claim
+                    release_call(db, call_id)
+                    released += 1
+                except Exception as e:
+                    logger.error(f"Failed to queue call {call_id}: {e}")
+                    db.execute(
+                        update(Call).where(Call.id == call_id).values(status="failed", error_message=str(e))
+                        .execution_options(synchronize_session=False)
+                    )
                     db.commit()
-        
-        if call_ids:
-            logger.info(f"Processed {len(call_ids)} pending calls")
-            
-    except Exception as e:
-        logger.error(f"Scheduler job failed: {e}")
-    finally:
-        db.close()
+                    failed += 1
+        finally:
+            db.close()
+
+        with self._lock:
+            self.passes += 1
+            self.claimed += len(rows)
+            self.released += released
+            self.failed += failed
+            if rows:
+                self._claims.append((time.monotonic(), len(rows)))
+                oldest = min((_as_utc(uploaded_at) for _, uploaded_at in rows if uploaded_at), default=now)
+                self.last_queue_age_seconds = (now - oldest).total_seconds()
+                self.max_queue_age_seconds = max(self.max_queue_age_seconds, self.last_queue_age_seconds)
+        if rows:
+            logger.info(f"Dispatched {len(rows) - released - failed} of {len(rows)} claimed calls")
+        return len(rows), requested
+
+    def _requeue_stale(self):
+        if time.monotonic() < self._next_requeue:
+            return
+        self._next_requeue = time.monotonic() + self.requeue_interval_seconds
+        db = pipeline_session()
+        try:
+            requeued = requeue_stale_calls(db, stale_claim_seconds())
+        finally:
+            db.close()
+        with self._lock:
+            self.requeued += requeued
+
+    def _sample(self):
+        now = time.monotonic()
+        with self._lock:
+            self._finished.append((now, self.pipeline.finished))
+            cutoff = now - self.window_seconds
+            while self._claims and self._claims[0][0] < cutoff:
+                self._claims.popleft()
+            while len(self._finished) > 1 and self._finished[0][0] < cutoff:
+                self._finished.popleft()
+
+    def stats(self) -> Dict[str, object]:
+        self._sample()
+        with self._lock:
+            (first_at, first_finished), (last_at, last_finished) = self._finished[0], self._finished[-1]
+            elapsed = last_at - first_at
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "passes": self.passes,
+                "claimed": self.claimed,
+                "released": self.released,
+                "failed": self.failed,
+                "requeued": self.requeued,
+                "max_claim": self.max_claim,
+                "min_age_seconds": self.min_age_seconds,
+                "sleep_seconds": self.sleep_seconds,
+                "claim_rate_per_minute": sum(n for _, n in self._claims) * 60.0 / self.window_seconds,
+                "throughput_per_minute": (last_finished - first_finished) * 60.0 / elapsed if elapsed > 0 else 0.0,
+                "last_queue_age_seconds": self.last_queue_age_seconds,
+                "max_queue_age_seconds": self.max_queue_age_seconds,
+            }
+
+def pending_queue_stats(db: Session) -> Dict[str, object]:
+    """Depth and age of the uploaded-call backlog shared by all instances"""
+    pending, oldest = db.query(func.count(Call.id), func.min(Call.uploaded_at)).filter(
+        Call.status == "uploaded"
+    ).one()
+    age = (datetime.now(timezone.utc) - _as_utc(oldest)).total_seconds() if oldest else None
+    return {"pending_calls": pending, "oldest_pending_age_seconds": age}
+
+_dispatcher: Optional[CallDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+def get_dispatcher() -> CallDispatcher:
+    """Process-wide dispatcher, created lazily on first use"""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = CallDispatcher()
+    return _dispatcher
+
+def start_dispatcher():
+    get_dispatcher().start()
+
+def stop_dispatcher():
+    if _dispatcher is not None:
+        _dispatcher.stop()
 
 def start_scheduler():
     """Start the background scheduler"""
     if not scheduler.running:
-        # Process pending calls every hour
+        # Pick up finished bulk scoring batches
         scheduler.add_job(
-            func=process_pending_calls_job,
-            trigger=IntervalTrigger(hours=1),
-            id='process_pending_calls',
-            name='Process pending calls',
+            func=poll_scoring_batches,
+            trigger=IntervalTrigger(seconds=settings.batch_scoring_poll_interval_seconds),
+            id='poll_scoring_batches',
+            name='Poll scoring batches',
             replace_existing=True
         )
-        
+
         scheduler.start()
         logger.info("Background scheduler started")
 
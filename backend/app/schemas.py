@@ -1,7 +1,9 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 
+PipelineMode = Literal["two_pass", "single_pass", "score_only"]
+
 # User schemas
 class UserBase(BaseModel):
     email: EmailStr
@@ -45,6 +47,7 @@ class Company(CompanyBase):
 class ProjectBase(BaseModel):
     name: str
     description: Optional[str] = None
+    pipeline_mode: Optional[PipelineMode] = None
 
 class ProjectCreate(ProjectBase):
     company_id: int
@@ -52,6 +55,7 @@ class ProjectCreate(ProjectBase):
 class ProjectUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
+    pipeline_mode: Optional[PipelineMode] = None
     is_active: Optional[bool] = None
 
 class Project(ProjectBase):
@@ -87,6 +91,7 @@ class Call(CallBase):
     id: int
     project_id: int
     s3_key: str
+    content_fingerprint: Optional[str] = None
     s3_output_key: Optional[str] = None
     transcription_job_name: Optional[str] = None
     status: str
@@ -94,10 +99,22 @@ class Call(CallBase):
     uploaded_at: datetime
     processed_at: Optional[datetime] = None
     error_message: Optional[str] = None
+    scoring_batch_id: Optional[int] = None
     
     class Config:
         from_attributes = True
 
+class CallPage(BaseModel):
+    items: List[Call]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+class CallSearchHit(BaseModel):
+    call: Call
+    report_id: int
+    rank: float
+
 # QA Report schemas
 class QAReportBase(BaseModel):
     transcript: Optional[str] = None
@@ -111,6 +128,11 @@ class QAReportBase(BaseModel):
     neutral_count: int = 0
     model_used: Optional[str] = None
     processing_time_seconds: Optional[float] = None
+    pipeline_mode: Optional[str] = None
+    prompt_version: Optional[str] = None
+    llm_latency_seconds: Optional[float] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
 
 class QAReportCreate(QAReportBase):
     call_id: int
@@ -133,6 +155,40 @@ class UploadResponse(BaseModel):
     s3_key: str
     call_id: int
 
+class UploadBatchRequest(BaseModel):
+    files: List[UploadRequest]
+
+class UploadBatchResponse(BaseModel):
+    uploads: List[UploadResponse]  # in request order
+
+class AnalyzeBatchRequest(BaseModel):
+    call_ids: List[int]
+    model: str = "gpt-4o"
+    mode: Optional[PipelineMode] = None
+
+# Bulk scoring schemas
+class ScoringBatchCreate(BaseModel):
+    project_id: int
+    model: str = "gpt-4o"
+    call_ids: Optional[List[int]] = None
+
+class ScoringBatch(BaseModel):
+    id: int
+    project_id: int
+    model: str
+    status: str
+    openai_batch_id: Optional[str] = None
+    call_count: int = 0
+    request_count: int = 0
+    scored_count: int = 0
+    failed_count: int = 0
+    error_message: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
 # Auth schemas
 class Token(BaseModel):
     access_token: str
@@ -150,6 +206,13 @@ class DashboardStats(BaseModel):
     average_score: Optional[float] = None
     total_processing_time: Optional[float] = None
 
+class PipelineModeStats(BaseModel):
+    pipeline_mode: str
+    reports: int
+    average_llm_latency_seconds: Optional[float] = None
+    average_prompt_tokens: Optional[float] = None
+    average_completion_tokens: Optional[float] = None
+
 class AgentPerformance(BaseModel):
     agent_name: str
     total_calls: int
@@ -0,0 +1,310 @@
+"""Indexed text search over calls and their QA reports.
+
+The `q` and `agent` call filters are substring matches. On PostgreSQL they
+stay ILIKE and are served by pg_trgm GIN indexes. On SQLite they go through
+an FTS5 trigram table (`calls_search`) that triggers keep in step with
+`calls`, and fall back to ILIKE if the table or any trigger is missing.
+
+Report search covers the corrected transcript and feedback of each call's
+newest report. Each call has one row in `qa_report_search`: a tsvector with
+a GIN index on PostgreSQL, an FTS5 table ranked by bm25 on SQLite. Every
+flush through SessionLocal keeps it current. Backfill or repair with:
+
+    python -m app.search rebuild
+
+None of these objects are in Base.metadata. They are created with the
+tables (and by migration 0009), and the migration environment ignores them.
+"""
+import sys
+import logging
+from typing import List, Optional, Tuple
+from sqlalchemy import bindparam, column, event, func, inspect, literal_column, or_, select, table, text
+from sqlalchemy.orm import Session, selectinload
+from .database import Base, SessionLocal
+from .models import Call, QAReport, ReportTranscript
+
+logger = logging.getLogger(__name__)
+
+# Trigram tokens need at least three characters; shorter terms use ILIKE
+MIN_TRIGRAM_LENGTH = 3
+TS_CONFIG = literal_column("'english'")
+
+report_search = table("qa_report_search", column("call_id"), column("report_id"), column("document"))
+# FTS5 keys rows by rowid, which holds the call id
+report_search_fts = table("qa_report_search", column("rowid"), column("report_id"), column("body"))
+calls_search_fts = table("calls_search", column("rowid"))
+
+POSTGRESQL_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_calls_filename_trgm ON calls USING gin (filename gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_calls_agent_name_trgm ON calls USING gin (agent_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_calls_customer_name_trgm ON calls USING gin (customer_name gin_trgm_ops)",
+    """CREATE TABLE IF NOT EXISTS qa_report_search (
+        call_id INTEGER PRIMARY KEY REFERENCES calls (id) ON DELETE CASCADE,
+        report_id INTEGER NOT NULL,
+        document TSVECTOR NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_qa_report_search_document ON qa_report_search USING gin (document)",
+]
+
+SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS calls_search USING fts5(
+        filename, agent_name, customer_name, content='calls', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS calls_search_insert AFTER INSERT ON calls BEGIN
+        INSERT INTO calls_search (rowid, filename, agent_name, customer_name)
+        VALUES (new.id, new.filename, new.agent_name, new.customer_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS calls_search_delete AFTER DELETE ON calls BEGIN
+        INSERT INTO calls_search (calls_search, rowid, filename, agent_name, customer_name)
+        VALUES ('delete', old.id, old.filename, old.agent_name, old.customer_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS calls_search_update AFTER UPDATE OF filename, agent_name, customer_name ON calls BEGIN
+        INSERT INTO calls_search (calls_search, rowid, filename, agent_name, customer_name)
+        VALUES ('delete', old.id, old.filename, old.agent_name, old.customer_name);
+        INSERT INTO calls_search (rowid, filename, agent_name, customer_name)
+        VALUES (new.id, new.filename, new.agent_name, new.customer_name);
+    END""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS qa_report_search USING fts5(
+        report_id UNINDEXED, body, tokenize='porter unicode61'
+    )""",
+]
+
+POSTGRESQL_DROP = [
+    "DROP TABLE IF EXISTS qa_report_search",
+    "DROP INDEX IF EXISTS ix_calls_customer_name_trgm",
+    "DROP INDEX IF EXISTS ix_calls_agent_name_trgm",
+    "DROP INDEX IF EXISTS ix_calls_filename_trgm",
+]
+
+SQLITE_DROP = [
+    "DROP TABLE IF EXISTS qa_report_search",
+    "DROP TRIGGER IF EXISTS calls_search_update",
+    "DROP TRIGGER IF EXISTS calls_search_delete",
+    "DROP TRIGGER IF EXISTS calls_search_insert",
+    "DROP TABLE IF EXISTS calls_search",
+]
+
+SEARCH_TABLES = ("calls_search", "qa_report_search")
+SEARCH_INDEXES = ("ix_calls_filename_trgm", "ix_calls_agent_name_trgm", "ix_calls_customer_name_trgm",
+                  "ix_qa_report_search_document")
+
+def is_search_object(name: Optional[str]) -> bool:
+    """Whether a reflected table or index belongs to the search subsystem (and FTS5 shadow tables)"""
+    if not name:
+        return False
+    return name in SEARCH_INDEXES or any(name == t or name.startswith(f"{t}_") for t in SEARCH_TABLES)
+
+def _sqlite_objects(connection, names) -> int:
+    """How many of these tables/triggers exist in an SQLite database"""
+    return connection.execute(
+        text("SELECT count(*) FROM sqlite_master WHERE name IN :names").bindparams(bindparam("names", expanding=True)),
+        {"names": list(names)}
+    ).scalar()
+
+def create_search_objects(connection):
+    dialect_name = connection.dialect.name
+    # calls_search is external-content: created next to existing calls it starts out empty
+    fill_calls_search = dialect_name == "sqlite" and not _sqlite_objects(connection, ["calls_search"])
+    for statement in {"postgresql": POSTGRESQL_DDL, "sqlite": SQLITE_DDL}.get(dialect_name, []):
+        connection.exec_driver_sql(statement)
+    if fill_calls_search:
+        connection.exec_driver_sql("INSERT INTO calls_search (calls_search) VALUES ('rebuild')")
+    _forget_search_objects(connection.engine.url)
+
+def drop_search_objects(connection):
+    statements = {"postgresql": POSTGRESQL_DROP, "sqlite": SQLITE_DROP}.get(connection.dialect.name, [])
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+    _forget_search_objects(connection.engine.url)
+
+def _after_create(target, connection, **kw):
+    try:
+        with connection.begin_nested():
+            create_search_objects(connection)
+    except Exception as e:
+        # e.g. an SQLite build without FTS5 or a role that may not create extensions
+        logger.warning(f"Search indexes unavailable, falling back to ILIKE: {e}")
+
+event.listen(Base.metadata, "after_create", _after_create)
+event.listen(Base.metadata, "before_drop", lambda target, connection, **kw: drop_search_objects(connection))
+
+# The triggers are what keep calls_search current; without any of them it goes stale
+CALLS_SEARCH_OBJECTS = ("calls_search", "calls_search_insert", "calls_search_delete", "calls_search_update")
+
+_has_index = {}
+_has_calls_search = {}
+
+def _forget_search_objects(url):
+    _has_index.pop(url, None)
+    _has_calls_search.pop(url, None)
+
+def has_search_index(db: Session) -> bool:
+    """Whether qa_report_search exists in this database, checked once per engine"""
+    url = db.bind.url
+    if url not in _has_index:
+        if db.bind.dialect.name == "sqlite":
+            found = _sqlite_objects(db, ["qa_report_search"])
+        elif db.bind.dialect.name == "postgresql":
+            found = db.execute(text("SELECT to_regclass('qa_report_search') IS NOT NULL")).scalar()
+        else:
+            found = False
+        _has_index[url] = bool(found)
+    return _has_index[url]
+
+def has_calls_search(db: Session) -> bool:
+    """Whether SQLite's calls_search and all its triggers exist, checked once per engine"""
+    url = db.bind.url
+    if url not in _has_calls_search:
+        sqlite = db.bind.dialect.name == "sqlite"
+        found = sqlite and _sqlite_objects(db, CALLS_SEARCH_OBJECTS) == len(CALLS_SEARCH_OBJECTS)
+        if sqlite and not found:
+            logger.warning("calls_search or its triggers are missing; call filters fall back to ILIKE "
+                           "until `python -m app.search rebuild`")
+        _has_calls_search[url] = found
+    return _has_calls_search[url]
+
+def _fts_phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+def _fts_terms(value: str) -> str:
+    """Free text as an FTS5 query: every word must appear, no operators"""
+    return " ".join(_fts_phrase(word) for word in value.split())
+
+def _use_calls_fts(db: Session, value: str) -> bool:
+    return db.bind.dialect.name == "sqlite" and len(value) >= MIN_TRIGRAM_LENGTH and has_calls_search(db)
+
+def calls_text_filter(db: Session, q: str):
+    """Substring match of filename, agent or customer"""
+    if _use_calls_fts(db, q):
+        return Call.id.in_(
+            select(calls_search_fts.c.rowid).where(text("calls_search MATCH :calls_q").bindparams(calls_q=_fts_phrase(q)))
+        )
+    like = f"%{q}%"
+    return or_(Call.filename.ilike(like), Call.agent_name.ilike(like), Call.customer_name.ilike(like))
+
+def agent_filter(db: Session, agent: str):
+    """Substring match of the agent name"""
+    if _use_calls_fts(db, agent):
+        return Call.id.in_(
+            select(calls_search_fts.c.rowid).where(
+                text("calls_search MATCH :agent_q").bindparams(agent_q=f"agent_name : {_fts_phrase(agent)}")
+            )
+        )
+    return Call.agent_name.ilike(f"%{agent}%")
+
+def report_body(report: QAReport) -> str:
+    return "\n".join(part for part in (report.corrected_transcript or report.transcript, report.qa_feedback) if part)
+
+def search_reports(db: Session, q: str, limit: int, project_id: Optional[int] = None,
+                   company_id: Optional[int] = None) -> List[Tuple[Call, int, float]]:
+    """Calls whose current report matches `q`, best first, as (call, report_id, rank)"""
+    dialect_name = db.bind.dialect.name
+    if dialect_name == "postgresql" and has_search_index(db):
+        tsquery = func.websearch_to_tsquery(TS_CONFIG, q)
+        rank = func.ts_rank_cd(report_search.c.document, tsquery).label("rank")
+        query = db.query(Call, report_search.c.report_id, rank).join(
+            report_search, report_search.c.call_id == Call.id
+        ).filter(report_search.c.document.op("@@")(tsquery))
+    elif dialect_name == "sqlite" and has_search_index(db) and _fts_terms(q):
+        # bm25 is lower for better matches
+        rank = (-func.bm25(literal_column("qa_report_search"))).label("rank")
+        query = db.query(Call, report_search_fts.c.report_id, rank).join(
+            report_search_fts, report_search_fts.c.rowid == Call.id
+        ).filter(text("qa_report_search MATCH :report_q").bindparams(report_q=_fts_terms(q)))
+    else:
+        # Transcripts are stored compressed; without an index only feedback is searchable
+        rank = literal_column("0.0").label("rank")
+        query = db.query(Call, QAReport.id, rank).join(QAReport, QAReport.call_id == Call.id).filter(
+            QAReport.qa_feedback.ilike(f"%{q}%")
+        )
+    if project_id:
+        query = query.filter(Call.project_id == project_id)
+    if company_id:
+        query = query.filter(Call.company_id == company_id)
+    rows = query.order_by(rank.desc(), Call.id.desc()).limit(limit).all()
+    return [(call, int(report_id), float(score or 0)) for call, report_id, score in rows]
+
+def index_reports(connection, reports: List[QAReport]):
+    """Make each report the indexed one for its call unless a newer report already is"""
+    postgres = connection.dialect.name == "postgresql"
+    for report in reports:
+        body = report_body(report)
+        if postgres:
+            connection.execute(text("""
+                INSERT INTO qa_report_search (call_id, report_id, document)
+                VALUES (:call_id, :report_id, to_tsvector('english', :body))
+                ON CONFLICT (call_id) DO UPDATE SET report_id = excluded.report_id, document = excluded.document
+                WHERE qa_report_search.report_id <= excluded.report_id
+            """), {"call_id": report.call_id, "report_id": report.id, "body": body})
+            continue
+        current = connection.execute(
+            text("SELECT report_id FROM qa_report_search WHERE rowid = :call_id"), {"call_id": report.call_id}
+        ).scalar()
+        if current is not None and int(current) > report.id:
+            continue
+        connection.execute(text("DELETE FROM qa_report_search WHERE rowid = :call_id"), {"call_id": report.call_id})
+        connection.execute(
+            text("INSERT INTO qa_report_search (rowid, report_id, body) VALUES (:call_id, :report_id, :body)"),
+            {"call_id": report.call_id, "report_id": report.id, "body": body}
+        )
+
+def unindex_reports(connection, report_ids: List[int]):
+    for report_id in report_ids:
+        connection.execute(text("DELETE FROM qa_report_search WHERE report_id = :report_id"), {"report_id": report_id})
+
+def _changed_reports(session: Session) -> List[QAReport]:
+    changed = {obj for obj in session.new if isinstance(obj, QAReport)}
+    for obj in session.dirty:
+        if isinstance(obj, QAReport) and inspect(obj).attrs.qa_feedback.history.has_changes():
+            changed.add(obj)
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, ReportTranscript) and session.is_modified(obj) and obj.report is not None:
+            changed.add(obj.report)
+    return [report for report in changed if report not in session.deleted]
+
+@event.listens_for(SessionLocal, "after_flush")
+def _maintain_search(session: Session, flush_context):
+    if session.bind is None or not has_search_index(session):
+        return
+    changed = _changed_reports(session)
+    deleted = [obj.id for obj in session.deleted if isinstance(obj, QAReport)]
+    if not changed and not deleted:
+        return
+    connection = session.connection()
+    if deleted:
+        unindex_reports(connection, deleted)
+    if changed:
+        index_reports(connection, sorted(changed, key=lambda report: report.id))
+
+def rebuild(db: Session) -> int:
+    """Re-index every call's newest report (and the SQLite calls_search table)"""
+    connection = db.connection()
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("INSERT INTO calls_search (calls_search) VALUES ('rebuild')")
+    connection.exec_driver_sql("DELETE FROM qa_report_search")
+    latest = db.query(func.max(QAReport.id)).group_by(QAReport.call_id)
+    indexed = 0
+    reports = db.query(QAReport).options(selectinload(QAReport.transcript_blob)).filter(QAReport.id.in_(latest))
+    for report in reports.yield_per(500):
+        index_reports(connection, [report])
+        indexed += 1
+    db.commit()
+    return indexed
+
+def main(argv: List[str]):
+    if argv[1:] != ["rebuild"]:
+        print("usage: python -m app.search rebuild")
+        return 2
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        create_search_objects(db.connection())
+        rows = rebuild(db)
+    finally:
+        db.close()
+    logger.info(f"Rebuilt qa_report_search: {rows} reports")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,157 @@
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import Dict, Optional, Set
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Every job started by the pipeline uses this prefix, which lets one
+# ListTranscriptionJobs sweep cover all of our outstanding jobs.
+JOB_NAME_PREFIX = "qa-call-"
+
+class _TrackedJob:
+    def __init__(self, job_name: str, deadline: float):
+        self.job_name = job_name
+        self.deadline = deadline
+        self.future: Future = Future()
+
+class TranscriptionTracker:
+    """Watch all outstanding Transcribe jobs from a single background thread.
+
+    Callers register a job with `watch()` and get a Future that resolves to the
+    transcript text (or None on failure/timeout). Each sweep lists the jobs that
+    are still QUEUED or IN_PROGRESS in one paginated call; only jobs that have
+    dropped out of that set are looked up individually and fetched from S3.
+    """
+
+    def __init__(self, qa_service, poll_interval: Optional[float] = None, max_wait: Optional[float] = None):
+        self.qa_service = qa_service
+        self.poll_interval = poll_interval or settings.transcribe_poll_interval_seconds
+        self.max_wait = max_wait or settings.transcribe_max_wait_seconds
+        self._jobs: Dict[str, _TrackedJob] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, job_name: str) -> Future:
+        """Register a job and return a Future for its transcript"""
+        with self._lock:
+            job = self._jobs.get(job_name)
+            if job is None:
+                job = _TrackedJob(job_name, time.monotonic() + self.max_wait)
+                self._jobs[job_name] = job
+            self._ensure_started()
+        return job.future
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval * 2)
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="transcription-tracker", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Transcription tracker sweep failed: {e}")
+
+    def _list_active_job_names(self) -> Set[str]:
+        """Names of our jobs that are still QUEUED or IN_PROGRESS"""
+        client = self.qa_service.transcribe_client
+        active: Set[str] = set()
+        for status in ("QUEUED", "IN_PROGRESS"):
+            kwargs = {"Status": status, "JobNameContains": JOB_NAME_PREFIX, "MaxResults": 100}
+            while True:
+                response = client.list_transcription_jobs(**kwargs)
+                for summary in response.get("TranscriptionJobSummaries", []):
+                    active.add(summary["TranscriptionJobName"])
+                next_token = response.get("NextToken")
+                if not next_token:
+                    break
+                kwargs["NextToken"] = next_token
+        return active
+
+    def sweep(self):
+        """Run one status sweep over every tracked job"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        if not jobs:
+            return
+
+        active = self._list_active_job_names()
+        now = time.monotonic()
+        for job in jobs:
+            if job.job_name in active:
+                if now >= job.deadline:
+                    logger.error(f"Transcription timeout for job: {job.job_name}")
+                    self._resolve(job, None)
+                continue
+            self._check_job(job, now)
+
+        logger.info(f"Transcription sweep: {len(active)} active, {self.pending_count()} tracked")
+
+    def _check_job(self, job: _TrackedJob, now: float):
+        """Confirm the terminal state of a job that left the active listing"""
+        try:
+            response = self.qa_service.transcribe_client.get_transcription_job(
+                TranscriptionJobName=job.job_name
+            )
+            status = response['TranscriptionJob']['TranscriptionJobStatus']
+        except Exception as e:
+            logger.error(f"Error checking transcription job {job.job_name}: {e}")
+            status = None
+
+        if status == 'COMPLETED':
+            try:
+                transcript = self.qa_service.fetch_transcript(job.job_name)
+                logger.info(f"Transcription completed for job: {job.job_name}")
+                self._resolve(job, transcript)
+                return
+            except Exception as e:
+                logger.error(f"Failed to retrieve transcript: {e}")
+        elif status == 'FAILED':
+            logger.error(f"Transcription failed for job: {job.job_name}")
+            self._resolve(job, None)
+            return
+
+        # Still running (listing lag) or transiently unreadable; retry next sweep
+        if now >= job.deadline:
+            logger.error(f"Transcription timeout for job: {job.job_name}")
+            self._resolve(job, None)
+
+    def _resolve(self, job: _TrackedJob, transcript: Optional[str]):
+        with self._lock:
+            self._jobs.pop(job.job_name, None)
+        if not job.future.done():
+            job.future.set_result(transcript)
+
+_tracker: Optional[TranscriptionTracker] = None
+_tracker_lock = threading.Lock()
+
+def get_transcription_tracker() -> TranscriptionTracker:
+    """Process-wide tracker, created lazily on first use"""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                from .qa_service import get_qa_service
+                _tracker = TranscriptionTracker(get_qa_service())
+    return _tracker
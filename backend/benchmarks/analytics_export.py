@@ -0,0 +1,115 @@
+"""Size and load time of the analytics export, CSV + JSON scores vs Parquet/Arrow.
+
+Builds a throwaway SQLite database of completed calls with one report each,
+exports the joined rows as CSV with qa_scores as a JSON column (what
+analysts used to rebuild offline) and through app.analytics_export, then
+loads each file back into an Arrow table with flattened scores:
+
+    python backend/benchmarks/analytics_export.py --calls 200000
+
+Point DATABASE_URL at a scratch PostgreSQL database to measure there instead;
+its tables are dropped and recreated.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_analytics_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+import pyarrow as pa  # noqa: E402
+import pyarrow.csv as pa_csv  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.models import Call, Company, Project, QAReport  # noqa: E402
+from app.qa_service import QA_SCORE_DIMENSIONS  # noqa: E402
+from app.analytics_export import SCHEMA, SCORE_COLUMNS, joined_rows, stream  # noqa: E402
+from app.routers.calls import _export_rows  # noqa: E402
+
+ADMIN = SimpleNamespace(role="admin", company_id=None)
+NO_FILTERS = (None, None, None, None, None, None)
+
+def populate(calls: int, chunk: int = 50000):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(3)
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": 1, "name": "Bench"}])
+        conn.execute(insert(Project), [{"id": 1, "name": "Bench", "company_id": 1}])
+        for start in range(0, calls, chunk):
+            ids = range(start + 1, min(start + chunk, calls) + 1)
+            conn.execute(insert(Call), [
+                {"id": i, "project_id": 1, "company_id": 1, "filename": f"{i}.wav", "s3_key": f"uploads/1/{i}.wav",
+                 "status": "completed", "agent_name": f"agent-{i % 50}", "customer_name": f"customer-{i}",
+                 "call_duration": rng.uniform(60, 900)}
+                for i in ids
+            ])
+            conn.execute(insert(QAReport), [
+                {"id": i, "call_id": i, "company_id": 1, "overall_score": rng.randint(40, 100), "model_used": "gpt-4o",
+                 "pipeline_mode": "two_pass", "prompt_version": "v2", "processing_time_seconds": rng.uniform(5, 60),
+                 "prompt_tokens": rng.randint(800, 6000), "completion_tokens": rng.randint(200, 600),
+                 "positive_count": 3, "negative_count": 1, "neutral_count": 2,
+                 "qa_scores": {dim: rng.randint(40, 100) for dim in QA_SCORE_DIMENSIONS}}
+                for i in ids
+            ])
+
+def csv_export() -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(SCHEMA.names[:-len(SCORE_COLUMNS)] + ["qa_scores"])
+    for row in _export_rows(ADMIN, NO_FILTERS, joined_rows):
+        *values, scores = row
+        writer.writerow([("" if v is None else v) for v in values] + [json.dumps(scores)])
+    return buffer.getvalue().encode()
+
+def columnar_export(export_format: str) -> bytes:
+    return b"".join(stream(_export_rows(ADMIN, NO_FILTERS, joined_rows), export_format))
+
+def load_csv(data: bytes) -> pa.Table:
+    table = pa_csv.read_csv(io.BytesIO(data))
+    scores = [json.loads(value) for value in table.column("qa_scores").to_pylist()]
+    table = table.drop(["qa_scores"])
+    for dimension, name in zip(QA_SCORE_DIMENSIONS, SCORE_COLUMNS):
+        table = table.append_column(name, pa.array([s.get(dimension) for s in scores], pa.float64()))
+    return table
+
+def load_parquet(data: bytes) -> pa.Table:
+    return pq.read_table(io.BytesIO(data))
+
+def load_arrow(data: bytes) -> pa.Table:
+    return pa.ipc.open_stream(data).read_all()
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    populate(args.calls)
+    print(f"{args.calls} calls with reports")
+    print(f"{'format':<10} {'MiB':>8} {'export s':>9} {'load s':>8}")
+    for name, export, load in (
+        ("csv+json", csv_export, load_csv),
+        ("parquet", lambda: columnar_export("parquet"), load_parquet),
+        ("arrow", lambda: columnar_export("arrow"), load_arrow),
+    ):
+        data, export_seconds = timed(export)
+        table, load_seconds = timed(load, data)
+        assert table.num_rows == args.calls
+        print(f"{name:<10} {len(data) / 2**20:>8.1f} {export_seconds:>9.2f} {load_seconds:>8.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Request throughput of one worker, sync Session vs AsyncSession in `async def` handlers.
+
+Both handlers run the same statement, which waits `--query-ms` inside the
+database connection (a SQLite function that sleeps, standing in for the
+round trip to PostgreSQL). The legacy handler calls a SessionLocal session
+straight from the event loop, as the routers used to; the other awaits
+get_async_db. A single uvicorn worker serves both over TCP while a probe
+keeps requesting an endpoint that never touches the database:
+
+    python backend/benchmarks/async_db.py --requests 400 --concurrency 25
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_async_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from app.database import async_engine, engine, get_async_db, get_db  # noqa: E402
+
+QUERY = text("SELECT bench_wait(:ms)")
+
+def _wait(ms):
+    time.sleep(ms / 1000)
+    return ms
+
+def _register_wait(dbapi_connection, connection_record):
+    dbapi_connection.create_function("bench_wait", 1, _wait)
+
+def build_app(query_ms: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/legacy")
+    async def legacy(db: Session = Depends(get_db)):
+        return {"waited": db.execute(QUERY, {"ms": query_ms}).scalar()}
+
+    @app.get("/async")
+    async def current(db: AsyncSession = Depends(get_async_db)):
+        return {"waited": (await db.execute(QUERY, {"ms": query_ms})).scalar()}
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    return app
+
+def serve(app: FastAPI) -> str:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="off", timeout_keep_alive=300))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[max(int(len(values) * fraction) - 1, 0)] * 1000 if values else float("nan")
+
+async def run(base_url: str, path: str, requests: int, concurrency: int):
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    ping_latencies = []
+    limits = httpx.Limits(max_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        async def one():
+            async with gate:
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        async def probe(stop: asyncio.Event):
+            while not stop.is_set():
+                start = time.perf_counter()
+                await client.get("/ping")
+                ping_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await prober
+
+    return {
+        "req/s": requests / elapsed,
+        "p50 ms": statistics.median(latencies) * 1000,
+        "p99 ms": percentile(latencies, 0.99),
+        "ping p50 ms": statistics.median(ping_latencies) * 1000,
+        "ping p99 ms": percentile(ping_latencies, 0.99),
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--query-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    event.listen(engine, "connect", _register_wait)
+    event.listen(async_engine.sync_engine, "connect", _register_wait)
+    base_url = serve(build_app(args.query_ms))
+
+    results = {name: asyncio.run(run(base_url, path, args.requests, args.concurrency))
+               for name, path in (("sync", "/legacy"), ("async", "/async"))}
+
+    print(f"{args.requests} requests at concurrency {args.concurrency}, {args.query_ms:g} ms per query, one worker")
+    print(f"{'':<14} {'sync':>10} {'async':>10}")
+    for metric in results["sync"]:
+        print(f"{metric:<14} {results['sync'][metric]:>10.1f} {results['async'][metric]:>10.1f}")
+
+if __name__ == "__main__":
+    main()
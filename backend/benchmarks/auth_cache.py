@@ -0,0 +1,79 @@
+"""Per-request cost of get_current_user with and without the verified-token cache.
+
+Creates a few users in a throwaway SQLite database, issues them tokens and
+resolves the tokens round-robin through the dependency the routers use:
+
+    python backend/benchmarks/auth_cache.py --requests 20000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_auth_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+from sqlalchemy import insert  # noqa: E402
+from app import auth  # noqa: E402
+from app.auth_cache import get_auth_cache  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import AsyncSessionLocal, Base, async_engine, engine  # noqa: E402
+from app.models import Company, User  # noqa: E402
+
+def populate(users: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": 1, "name": "Bench"}])
+        conn.execute(insert(User), [
+            {"id": i, "email": f"agent{i}@example.com", "hashed_password": "x", "role": "agent",
+             "company_id": 1, "is_active": True}
+            for i in range(1, users + 1)
+        ])
+
+async def resolve(tokens, requests: int):
+    latencies = []
+    for n in range(requests):
+        # A session per request, as get_async_db opens one
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await auth.get_current_user(tokens[n % len(tokens)], db)
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "mean us": statistics.mean(latencies) * 1e6,
+        "p50 us": statistics.median(latencies) * 1e6,
+        "p99 us": latencies[int(len(latencies) * 0.99) - 1] * 1e6,
+    }
+
+async def compare(tokens, requests: int):
+    results = {}
+    for name, enabled in (("uncached", False), ("cached", True)):
+        settings.auth_cache_enabled = enabled
+        get_auth_cache().clear()
+        results[name] = await resolve(tokens, requests)
+    await async_engine.dispose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    populate(args.users)
+    tokens = [auth.create_access_token({"sub": f"agent{i}@example.com"}) for i in range(1, args.users + 1)]
+    results = asyncio.run(compare(tokens, args.requests))
+
+    print(f"{args.requests} authenticated requests over {args.users} users")
+    print(f"{'':<10} {'uncached':>10} {'cached':>10}")
+    for metric in results["uncached"]:
+        print(f"{metric:<10} {results['uncached'][metric]:>10.1f} {results['cached'][metric]:>10.1f}")
+    print(get_auth_cache().stats())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Per-request cost of building AWS/OpenAI clients versus the shared registry.
+
+No network traffic: this measures client construction only (credential
+resolution, endpoint and service-model loading, HTTP pool setup).
+
+    AWS_ACCESS_KEY_ID=x AWS_SECRET_ACCESS_KEY=x OPENAI_API_KEY=fake \\
+        python backend/benchmarks/client_overhead.py --iterations 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import boto3
+from openai import OpenAI
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.config import settings  # noqa: E402
+from app.clients import get_client_registry  # noqa: E402
+from app.qa_service import EnhancedQAService  # noqa: E402
+
+def per_call_clients():
+    """What every analysis and upload-url request used to pay"""
+    OpenAI(api_key=os.getenv("OPENAI_API_KEY", "fake"))
+    boto3.client('s3', region_name=settings.aws_region)
+    boto3.client('transcribe', region_name=settings.aws_region)
+
+def registry_clients():
+    EnhancedQAService()
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    # Warm the registry so its one-time construction is not counted
+    get_client_registry().s3()
+    get_client_registry().transcribe()
+    get_client_registry().openai()
+
+    fresh = timed(per_call_clients, args.iterations)
+    shared = timed(registry_clients, args.iterations)
+    print(f"new clients per request: {fresh * 1000:8.3f} ms")
+    print(f"shared registry:         {shared * 1000:8.3f} ms")
+    print(f"saved per request:       {(fresh - shared) * 1000:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Dashboard request latency and bytes: re-aggregated, served from the cache, and revalidated (304).
+
+Builds calls and reports for one company in a throwaway SQLite database,
+then replays the Dashboard page's two requests as a company manager:
+
+    python backend/benchmarks/dashboard_cache.py --calls 200000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_dashboard_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from app import auth  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.models import Call, Company, Project, QAReport, User  # noqa: E402
+from app.routers import dashboard  # noqa: E402
+from app import rollup  # noqa: E402
+
+PATHS = [
+    "/dashboard/stats?project_id=1",
+    # Not on whole days, so agent performance aggregates the raw calls
+    "/dashboard/agent-performance?project_id=1&start_date=2025-01-01T08:00:00&end_date=2025-12-31T08:00:00",
+]
+
+def populate(calls: int, chunk: int = 20000):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(3)
+    start = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": 1, "name": "Bench"}])
+        conn.execute(insert(Project), [{"id": 1, "name": "Bench", "company_id": 1}])
+        conn.execute(insert(User), [{"id": 1, "email": "manager@example.com", "hashed_password": "x",
+                                     "role": "company_manager", "company_id": 1, "is_active": True}])
+        for first in range(1, calls + 1, chunk):
+            ids = range(first, min(first + chunk, calls + 1))
+            conn.execute(insert(Call), [
+                {"id": i, "project_id": 1, "company_id": 1, "filename": f"{i}.wav", "s3_key": f"uploads/{i}.wav",
+                 "status": "completed", "agent_name": f"agent-{i % 80}",
+                 "uploaded_at": start + timedelta(seconds=i * 60)}
+                for i in ids
+            ])
+            conn.execute(insert(QAReport), [
+                {"call_id": i, "company_id": 1, "overall_score": rng.randint(40, 100), "processing_time_seconds": 12.0}
+                for i in ids
+            ])
+    db = SessionLocal()
+    try:
+        rollup.rebuild(db)
+    finally:
+        db.close()
+
+async def timed(client, headers, repeat: int, etags=None):
+    """Median ms per page view (both requests) and bytes received per view"""
+    latencies, received = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in PATHS:
+            request_headers = dict(headers)
+            if etags is not None:
+                request_headers["If-None-Match"] = etags[path]
+            response = await client.get(path, headers=request_headers)
+            received += len(response.content)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000, received / repeat
+
+async def compare(repeat: int):
+    app = FastAPI()
+    app.include_router(dashboard.router, prefix="/dashboard")
+    headers = {"Authorization": f"Bearer {auth.create_access_token({'sub': 'manager@example.com'})}"}
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        settings.dashboard_cache_enabled = False
+        results["uncached"] = await timed(client, headers, repeat)
+        settings.dashboard_cache_enabled = True
+        etags = {path: (await client.get(path, headers=headers)).headers["etag"] for path in PATHS}
+        results["cache hit"] = await timed(client, headers, repeat)
+        results["304"] = await timed(client, headers, repeat, etags)
+    await async_engine.dispose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    populate(args.calls)
+    results = asyncio.run(compare(args.repeat))
+    print(f"{args.calls} calls; one page view = stats + agent performance")
+    print(f"{'':<12} {'ms/view':>10} {'bytes/view':>11}")
+    for name, (ms, received) in results.items():
+        print(f"{name:<12} {ms:>10.2f} {received:>11.0f}")
+
+if __name__ == "__main__":
+    main()
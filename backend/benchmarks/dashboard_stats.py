@@ -0,0 +1,110 @@
+"""Time and peak Python memory of /dashboard/stats, legacy vs single aggregate.
+
+Builds a throwaway SQLite database per size (about 80% of calls completed
+with one report each) and runs both implementations against it:
+
+    python backend/benchmarks/dashboard_stats.py --sizes 10000 100000 1000000
+
+Point DATABASE_URL at a scratch PostgreSQL database to measure there instead;
+its tables are dropped and recreated.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_dashboard_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+from sqlalchemy import func, insert  # noqa: E402
+from app.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine  # noqa: E402
+from app.models import Call, Company, Project, QAReport  # noqa: E402
+from app.routers.dashboard import _dashboard_stats  # noqa: E402
+
+ADMIN = SimpleNamespace(role="admin", company_id=None)
+STATUSES = ["completed"] * 8 + ["uploaded", "failed"]
+
+def populate(calls: int, chunk: int = 50000):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": 1, "name": "Bench"}])
+        conn.execute(insert(Project), [{"id": 1, "name": "Bench", "company_id": 1}])
+        for start in range(0, calls, chunk):
+            ids = range(start + 1, min(start + chunk, calls) + 1)
+            conn.execute(insert(Call), [
+                {"id": i, "project_id": 1, "company_id": 1, "filename": f"{i}.wav", "s3_key": f"uploads/1/{i}.wav",
+                 "status": STATUSES[i % len(STATUSES)], "agent_name": f"agent-{i % 50}"}
+                for i in ids
+            ])
+            conn.execute(insert(QAReport), [
+                {"call_id": i, "company_id": 1, "overall_score": 50 + i % 50, "processing_time_seconds": 1.5}
+                for i in ids if STATUSES[i % len(STATUSES)] == "completed"
+            ])
+
+def legacy_stats(db):
+    """The previous implementation: four COUNTs plus every call id in an IN list"""
+    query = db.query(Call)
+    total_calls = query.count()
+    processed_calls = query.filter(Call.status == "completed").count()
+    pending_calls = query.filter(Call.status.in_(["uploaded", "processing"])).count()
+    failed_calls = query.filter(Call.status == "failed").count()
+    filtered_call_ids = [c.id for c in query.all()]
+    avg_score = total_time = None
+    if filtered_call_ids:
+        avg_score = db.query(func.avg(QAReport.overall_score)).join(Call).filter(
+            Call.id.in_(filtered_call_ids)
+        ).scalar()
+        total_time = db.query(func.sum(QAReport.processing_time_seconds)).join(Call).filter(
+            Call.id.in_(filtered_call_ids)
+        ).scalar()
+    return total_calls, processed_calls, pending_calls, failed_calls, avg_score, total_time
+
+async def _aggregate():
+    # The endpoint's query without its cache, on the async session it is served from
+    async with AsyncSessionLocal() as session:
+        stats = await _dashboard_stats(session, ADMIN, None, None, None)
+    await async_engine.dispose()
+    return stats
+
+def aggregate_stats(db):
+    stats = asyncio.run(_aggregate())
+    return (stats.total_calls, stats.processed_calls, stats.pending_calls, stats.failed_calls,
+            stats.average_score, stats.total_processing_time)
+
+def measure(fn):
+    db = SessionLocal()
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            result = fn(db)
+        except Exception as e:
+            # SQLite refuses IN lists past its bound-parameter limit
+            result = f"error: {type(e).__name__}"
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak, result
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'calls':>9}  {'impl':<9} {'seconds':>8} {'peak MiB':>9}  result")
+    for size in args.sizes:
+        populate(size)
+        for name, fn in (("legacy", legacy_stats), ("aggregate", aggregate_stats)):
+            elapsed, peak, result = measure(fn)
+            print(f"{size:>9}  {name:<9} {elapsed:>8.3f} {peak / 2**20:>9.1f}  {result}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""API checkout latency while background work holds database sessions.
+
+Background threads each hold a session for a while, as pipeline work used
+to do across the transcription wait. Meanwhile API threads run short
+queries. The script compares one shared pool at SQLAlchemy's defaults (5 +
+10 overflow) with separate API and pipeline pools at the configured sizes:
+
+    python backend/benchmarks/db_pool.py --holders 30 --hold-seconds 3 --requests 400
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_pool_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.exc import TimeoutError as PoolTimeout  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import _create_engine, database_url, pool_stats  # noqa: E402
+
+def hold(engine, seconds: float, stop: threading.Event):
+    """Keep a session checked out, queueing for the pool again after a timeout"""
+    while not stop.is_set():
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                stop.wait(seconds)
+        except PoolTimeout:
+            continue
+
+def request(engine) -> float:
+    start = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            time.sleep(0.005)
+    except PoolTimeout:
+        return float("inf")
+    return time.perf_counter() - start
+
+def scenario(name: str, api_engine, background_engine, args):
+    stop = threading.Event()
+    holders = [threading.Thread(target=hold, args=(background_engine, args.hold_seconds, stop))
+               for _ in range(args.holders)]
+    for thread in holders:
+        thread.start()
+    time.sleep(0.2)
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        latencies = list(executor.map(lambda _: request(api_engine), range(args.requests)))
+    stop.set()
+    for thread in holders:
+        thread.join()
+
+    served = sorted(latency for latency in latencies if latency != float("inf"))
+    timeouts = len(latencies) - len(served)
+    p50 = statistics.median(served) * 1000 if served else float("nan")
+    p99 = served[int(len(served) * 0.99) - 1] * 1000 if served else float("nan")
+    stats = pool_stats(api_engine.pool)
+    print(f"{name:<10} {p50:>9.1f} {p99:>9.1f} {timeouts:>9} {stats['max_wait_ms']:>12.1f}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--holders", type=int, default=30)
+    parser.add_argument("--hold-seconds", type=float, default=3.0)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    args = parser.parse_args()
+    settings.db_pool_timeout_seconds = args.timeout
+
+    print(f"{args.holders} background sessions held {args.hold_seconds}s, "
+          f"{args.requests} API requests at concurrency {args.concurrency}")
+    print(f"{'pools':<10} {'p50 ms':>9} {'p99 ms':>9} {'timeouts':>9} {'max wait ms':>12}")
+    shared = _create_engine(database_url, 5, 10)
+    scenario("shared", shared, shared, args)
+    shared.dispose()
+
+    api = _create_engine(database_url, settings.db_pool_size, settings.db_max_overflow)
+    background = _create_engine(database_url, settings.db_pipeline_pool_size, settings.db_pipeline_max_overflow)
+    scenario("split", api, background, args)
+    api.dispose()
+    background.dispose()
+
+if __name__ == "__main__":
+    main()
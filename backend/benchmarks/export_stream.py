@@ -0,0 +1,95 @@
+"""Time to first byte, total time and peak Python memory of /calls/export.
+
+Compares the previous build-everything-then-send export with the streamed
+one for several table sizes in a throwaway SQLite database:
+
+    python backend/benchmarks/export_stream.py --sizes 10000 100000 1000000
+
+Point DATABASE_URL at a scratch PostgreSQL database to measure there instead;
+its tables are dropped and recreated.
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_export_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+from sqlalchemy import insert  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import Call, Company, Project  # noqa: E402
+from app.routers.calls import _csv_chunks, _csv_columns, _export_rows, _filtered_calls, _gzip_chunks  # noqa: E402
+
+ADMIN = SimpleNamespace(role="admin", company_id=None)
+NO_FILTERS = (None, None, None, None, None, None)
+
+def populate(calls: int, chunk: int = 50000):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": 1, "name": "Bench"}])
+        conn.execute(insert(Project), [{"id": 1, "name": "Bench", "company_id": 1}])
+        for start in range(0, calls, chunk):
+            conn.execute(insert(Call), [
+                {"id": i, "project_id": 1, "company_id": 1, "filename": f"{i}.wav", "s3_key": f"uploads/1/{i}.wav",
+                 "status": "completed", "agent_name": f"agent-{i % 50}", "customer_name": f"customer-{i}",
+                 "call_duration": 300}
+                for i in range(start + 1, min(start + chunk, calls) + 1)
+            ])
+
+def legacy_export():
+    """The previous implementation: every ORM row and the whole CSV text in memory, then one chunk"""
+    db = SessionLocal()
+    try:
+        rows = _filtered_calls(db, ADMIN, *NO_FILTERS).order_by(Call.uploaded_at.desc()).all()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for c in rows:
+            writer.writerow([c.id, c.project_id, c.filename, c.agent_name or "", c.customer_name or "", c.status,
+                             c.uploaded_at.isoformat() if c.uploaded_at else "",
+                             c.processed_at.isoformat() if c.processed_at else "",
+                             c.call_duration if c.call_duration is not None else "", c.error_message or ""])
+        yield buffer.getvalue().encode()
+    finally:
+        db.close()
+
+def streamed_export():
+    return _csv_chunks(_export_rows(ADMIN, NO_FILTERS, _csv_columns))
+
+def gzip_export():
+    return _gzip_chunks(streamed_export())
+
+def measure(make_chunks):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_byte, size = None, 0
+    for chunk in make_chunks():
+        if first_byte is None and chunk:
+            first_byte = time.perf_counter() - start
+        size += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_byte, elapsed, peak, size
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'calls':>9}  {'impl':<9} {'ttfb ms':>9} {'seconds':>8} {'peak MiB':>9} {'MiB sent':>9}")
+    for size in args.sizes:
+        populate(size)
+        for name, fn in (("legacy", legacy_export), ("streamed", streamed_export), ("gzip", gzip_export)):
+            first_byte, elapsed, peak, sent = measure(fn)
+            print(f"{size:>9}  {name:<9} {first_byte * 1000:>9.1f} {elapsed:>8.2f} {peak / 2**20:>9.1f} {sent / 2**20:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare sync-thread and async LLM scoring throughput against the fake endpoint.
+
+    python -m uvicorn app.fake_openai:app --app-dir backend --port 8001 &
+    OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=fake \\
+        python backend/benchmarks/llm_throughput.py --requests 500 --threads 16
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+# Measure the clients, not the response cache
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+
+from app.config import settings  # noqa: E402
+from app.qa_service import EnhancedQAService  # noqa: E402
+from app.llm_async import get_llm_runner  # noqa: E402
+
+TRANSCRIPT = "Agent: Thank you for calling, how can I help? Customer: My invoice looks wrong. " * 20
+
+def transcript(run: str, index: int) -> str:
+    """Distinct per request so nothing is served from the cache even when it is on"""
+    return f"Call {run}-{index}. {TRANSCRIPT}"
+
+def run_sync(requests: int, threads: int) -> float:
+    service = EnhancedQAService()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda i: service.generate_feedback(transcript("sync", i)), range(requests)))
+    return time.perf_counter() - start
+
+def run_async(requests: int) -> float:
+    service = EnhancedQAService()
+    runner = get_llm_runner()
+
+    async def batch():
+        await asyncio.gather(*(service.agenerate_feedback(transcript("async", i)) for i in range(requests)))
+
+    start = time.perf_counter()
+    runner.submit(batch()).result()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    print(f"llm cache: {'on' if settings.llm_cache_enabled else 'off'}")
+    sync_elapsed = run_sync(args.requests, args.threads)
+    print(f"sync  ({args.threads} threads): {args.requests / sync_elapsed:8.1f} req/s  ({sync_elapsed:.2f}s)")
+    async_elapsed = run_async(args.requests)
+    print(f"async (1 loop):      {args.requests / async_elapsed:8.1f} req/s  ({async_elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Login storm: sign-in throughput and latency of other requests, bcrypt on the loop vs the hashing pool.
+
+A single uvicorn worker serves /auth/login twice: the legacy way, verifying
+the bcrypt hash inline on the event loop, and through the current router,
+which verifies on app.hashing's pool and answers 429 when it is full. Every
+agent signs in at once and retries after Retry-After on a 429; meanwhile a
+probe keeps requesting an endpoint that needs no password check:
+
+    python backend/benchmarks/login_storm.py --agents 100
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_login_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import Depends, FastAPI, HTTPException  # noqa: E402
+from fastapi.security import OAuth2PasswordRequestForm  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from app import auth  # noqa: E402
+from app.database import Base, engine, get_async_db  # noqa: E402
+from app.hashing import get_hashing_pool  # noqa: E402
+from app.models import Company, User  # noqa: E402
+from app.routers import auth as auth_router  # noqa: E402
+
+PASSWORD = "storm-password"
+
+def populate(agents: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    hashed = auth.pwd_context.hash(PASSWORD)
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": 1, "name": "Bench"}])
+        conn.execute(insert(User), [
+            {"id": i, "email": f"agent{i}@example.com", "hashed_password": hashed, "role": "agent",
+             "company_id": 1, "is_active": True}
+            for i in range(1, agents + 1)
+        ])
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(auth_router.router, prefix="/auth")
+
+    @app.post("/legacy/login")
+    async def legacy_login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+        user = await auth.get_user(db, form_data.username)
+        if not user or not auth.pwd_context.verify(form_data.password, user.hashed_password):
+            raise HTTPException(status_code=401)
+        return {"access_token": auth.create_access_token({"sub": user.email}), "token_type": "bearer"}
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    return app
+
+def serve(app: FastAPI) -> str:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="off", timeout_keep_alive=300))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values)
+    return values[max(int(len(values) * fraction) - 1, 0)] * 1000 if values else float("nan")
+
+async def storm(base_url: str, path: str, agents: int):
+    sign_ins = []
+    rejections = 0
+    ping_latencies = []
+
+    async with httpx.AsyncClient(base_url=base_url, limits=httpx.Limits(max_connections=agents + 1), timeout=300) as client:
+        async def agent(n: int):
+            nonlocal rejections
+            start = time.perf_counter()
+            while True:
+                response = await client.post(path, data={"username": f"agent{n}@example.com", "password": PASSWORD})
+                if response.status_code != 429:
+                    response.raise_for_status()
+                    break
+                rejections += 1
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+            sign_ins.append(time.perf_counter() - start)
+
+        async def probe(stop: asyncio.Event):
+            while not stop.is_set():
+                start = time.perf_counter()
+                await client.get("/ping")
+                ping_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.02)
+
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(agent(n) for n in range(1, agents + 1)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await prober
+
+    return {
+        "sign-ins/s": agents / elapsed,
+        "sign-in p50 ms": statistics.median(sign_ins) * 1000,
+        "sign-in p99 ms": percentile(sign_ins, 0.99),
+        "429 responses": rejections,
+        "ping p50 ms": statistics.median(ping_latencies) * 1000,
+        "ping p99 ms": percentile(ping_latencies, 0.99),
+        "ping max ms": max(ping_latencies) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agents", type=int, default=100)
+    args = parser.parse_args()
+
+    populate(args.agents)
+    base_url = serve(build_app())
+    results = {name: asyncio.run(storm(base_url, path, args.agents))
+               for name, path in (("on loop", "/legacy/login"), ("pool", "/auth/login"))}
+
+    pool = get_hashing_pool()
+    print(f"{args.agents} agents signing in at once, hashing pool {pool.workers} workers + {pool.max_queued} queued, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'':<16} {'on loop':>10} {'pool':>10}")
+    for metric in results["pool"]:
+        print(f"{metric:<16} {results['on loop'][metric]:>10.1f} {results['pool'][metric]:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Query plans and latencies of the hot paths without and with the 0007 indexes.
+
+Builds a synthetic dataset (a year of uploads, ~2% still pending, ~90% with
+a report) in a throwaway SQLite database, runs each hot query without the
+hot-path indexes, creates them, and runs everything again:
+
+    python backend/benchmarks/query_indexes.py --calls 1000000
+
+Point DATABASE_URL at a scratch PostgreSQL database to measure there instead;
+its tables are dropped and recreated.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_index_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+from sqlalchemy import insert, text  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.models import Call, Company, Project, QAReport  # noqa: E402
+
+HOT_PATH_INDEXES = [
+    index for table in (Call.__table__, QAReport.__table__) for index in table.indexes
+    if index.name in {
+        "ix_calls_pending_queue", "ix_calls_status_uploaded_at", "ix_calls_project_uploaded_at",
+        "ix_calls_uploaded_at", "ix_calls_agent_uploaded_at", "ix_qa_reports_call_created_at",
+    }
+]
+
+QUERIES = {
+    "dispatcher claim": (
+        "SELECT id, uploaded_at FROM calls WHERE status = 'uploaded' AND uploaded_at <= :cutoff "
+        "ORDER BY uploaded_at, id LIMIT 100"
+    ),
+    "pending stats": "SELECT count(id), min(uploaded_at) FROM calls WHERE status = 'uploaded'",
+    "project call list": "SELECT * FROM calls WHERE project_id = :project_id ORDER BY uploaded_at DESC LIMIT 50",
+    "admin call list": "SELECT * FROM calls ORDER BY uploaded_at DESC LIMIT 50",
+    "failed calls": (
+        "SELECT * FROM calls WHERE status = 'failed' AND uploaded_at >= :since ORDER BY uploaded_at DESC LIMIT 50"
+    ),
+    "latest report": (
+        "SELECT * FROM qa_reports WHERE call_id = :call_id ORDER BY created_at DESC, id DESC LIMIT 1"
+    ),
+    "agent performance, 1 week": (
+        "SELECT calls.agent_name, count(DISTINCT calls.id), avg(qa_reports.overall_score) FROM calls "
+        "LEFT OUTER JOIN qa_reports ON qa_reports.call_id = calls.id "
+        "WHERE calls.agent_name IS NOT NULL AND calls.uploaded_at >= :since GROUP BY calls.agent_name"
+    ),
+}
+
+def populate(calls: int, chunk: int = 50000):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for index in HOT_PATH_INDEXES:
+            index.drop(conn)
+        conn.execute(insert(Company), [{"id": 1, "name": "Bench"}])
+        conn.execute(insert(Project), [{"id": p, "name": f"P{p}", "company_id": 1} for p in range(1, 21)])
+        rng = random.Random(7)
+        start = datetime(2025, 1, 1)
+        for first in range(1, calls + 1, chunk):
+            ids = range(first, min(first + chunk, calls + 1))
+            rows = []
+            for i in ids:
+                pending = rng.random() < 0.02
+                rows.append({
+                    "id": i, "project_id": rng.randint(1, 20), "company_id": 1, "filename": f"{i}.wav",
+                    "s3_key": f"uploads/{i}.wav",
+                    "status": "uploaded" if pending else rng.choice(["completed"] * 9 + ["failed"]),
+                    "agent_name": f"agent-{rng.randint(1, 200)}",
+                    "uploaded_at": start + timedelta(seconds=i * 31536000 // calls)
+                })
+            conn.execute(insert(Call), rows)
+            conn.execute(insert(QAReport), [
+                {"call_id": r["id"], "company_id": 1, "overall_score": rng.randint(40, 100),
+                 "created_at": r["uploaded_at"]}
+                for r in rows if r["status"] == "completed"
+            ])
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+def params(calls: int):
+    end = datetime(2025, 1, 1) + timedelta(days=365)
+    return {
+        "cutoff": end, "project_id": 7, "since": end - timedelta(days=7), "call_id": calls // 2,
+    }
+
+def plan(conn, sql: str, values) -> str:
+    if conn.dialect.name == "postgresql":
+        rows = conn.execute(text(f"EXPLAIN {sql}"), values).all()
+        return " | ".join(row[0].strip() for row in rows[:3])
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), values).all()
+    return " | ".join(row[-1] for row in rows)
+
+def timed(conn, sql: str, values, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(text(sql), values).all()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(label: str, values, repeat: int):
+    print(f"\n== {label}")
+    with engine.connect() as conn:
+        for name, sql in QUERIES.items():
+            print(f"{name:<28} {timed(conn, sql, values, repeat) * 1000:10.2f} ms   {plan(conn, sql, values)}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    populate(args.calls)
+    values = params(args.calls)
+    run(f"{args.calls} calls, without hot-path indexes", values, args.repeat)
+    with engine.begin() as conn:
+        for index in HOT_PATH_INDEXES:
+            index.create(conn)
+        conn.execute(text("ANALYZE"))
+    run(f"{args.calls} calls, with hot-path indexes", values, args.repeat)
+
+if __name__ == "__main__":
+    main()
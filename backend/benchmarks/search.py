@@ -0,0 +1,132 @@
+"""Latency of the call filters and report search, ILIKE vs the search indexes.
+
+Builds a synthetic dataset (calls with agent/customer names and one report
+of a few hundred words each, a rare term in 0.1% of them) in a throwaway
+SQLite database, then runs every search both as the plain ILIKE it used to
+be and through app.search:
+
+    python backend/benchmarks/search.py --calls 200000
+
+Point DATABASE_URL at a scratch PostgreSQL database to measure there instead;
+its tables are dropped and recreated.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_search_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+from sqlalchemy import insert, or_  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import Call, Company, Project, QAReport  # noqa: E402
+from app import search  # noqa: E402
+
+FIRST_NAMES = ["alice", "bruno", "chen", "dalia", "emeka", "farah", "goran", "hana", "ivan", "julia"]
+LAST_NAMES = ["smith", "okafor", "tanaka", "haddad", "novak", "silva", "kowalski", "nguyen", "rossi", "larsen"]
+WORDS = (
+    "account billing refund charge card payment plan upgrade cancel router outage signal technician "
+    "appointment delivery package address password reset login verify identity balance invoice late fee "
+    "discount loyalty transfer supervisor escalate apologize understand thank help issue resolve"
+).split()
+
+def populate(calls: int, chunk: int = 20000):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(11)
+    start = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": 1, "name": "Bench"}])
+        conn.execute(insert(Project), [{"id": 1, "name": "Bench", "company_id": 1}])
+        for first in range(1, calls + 1, chunk):
+            ids = range(first, min(first + chunk, calls + 1))
+            conn.execute(insert(Call), [
+                {"id": i, "project_id": 1, "company_id": 1, "filename": f"rec_{i:08d}.wav",
+                 "s3_key": f"uploads/{i}.wav",
+                 "status": "completed", "agent_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                 "customer_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{i % 997}",
+                 "uploaded_at": start + timedelta(seconds=i)}
+                for i in ids
+            ])
+            conn.execute(insert(QAReport), [
+                {"call_id": i, "company_id": 1, "overall_score": rng.randint(40, 100),
+                 "corrected_transcript": " ".join(rng.choice(WORDS) for _ in range(300))
+                 + (" warranty claim" if i % 1000 == 0 else ""),
+                 "qa_feedback": " ".join(rng.choice(WORDS) for _ in range(40))}
+                for i in ids
+            ])
+    db = SessionLocal()
+    try:
+        # Bulk inserts bypass the ORM hook; index the reports in one pass
+        search.rebuild(db)
+    finally:
+        db.close()
+
+def ilike_calls(db, q=None, agent=None):
+    query = db.query(Call.id)
+    if agent:
+        query = query.filter(Call.agent_name.ilike(f"%{agent}%"))
+    if q:
+        like = f"%{q}%"
+        query = query.filter(or_(Call.filename.ilike(like), Call.agent_name.ilike(like), Call.customer_name.ilike(like)))
+    return query.order_by(Call.uploaded_at.desc()).limit(50).all()
+
+def indexed_calls(db, q=None, agent=None):
+    query = db.query(Call.id)
+    if agent:
+        query = query.filter(search.agent_filter(db, agent))
+    if q:
+        query = query.filter(search.calls_text_filter(db, q))
+    return query.order_by(Call.uploaded_at.desc()).limit(50).all()
+
+def ilike_reports(db, q):
+    like = f"%{q}%"
+    return db.query(Call.id).join(QAReport, QAReport.call_id == Call.id).filter(
+        or_(QAReport.corrected_transcript.ilike(like), QAReport.qa_feedback.ilike(like))
+    ).limit(20).all()
+
+def indexed_reports(db, q):
+    return search.search_reports(db, q, 20)
+
+CASES = [
+    ("q: rare customer", lambda fn: lambda db: fn(db, q="larsen996")),
+    ("q: filename", lambda fn: lambda db: fn(db, q="rec_0001234")),
+    ("agent: full name", lambda fn: lambda db: fn(db, agent="hana rossi")),
+    ("q: no match", lambda fn: lambda db: fn(db, q="zzzqqq")),
+]
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            fn(db)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            db.close()
+    return best
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    populate(args.calls)
+    print(f"{args.calls} calls")
+    print(f"{'search':<28} {'ILIKE ms':>10} {'indexed ms':>11}")
+    for name, case in CASES:
+        print(f"{name:<28} {timed(case(ilike_calls), args.repeat) * 1000:>10.2f} "
+              f"{timed(case(indexed_calls), args.repeat) * 1000:>11.2f}")
+    for term in ("warranty", "supervisor", "zzzqqq"):
+        print(f"{'report: ' + term:<28} {timed(lambda db: ilike_reports(db, term), args.repeat) * 1000:>10.2f} "
+              f"{timed(lambda db: indexed_reports(db, term), args.repeat) * 1000:>11.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Tenant-scoped queries joining projects vs filtering on the denormalized calls.company_id.
+
+Builds a multi-tenant synthetic dataset (a year of uploads spread over
+companies of very different sizes, a few projects each, ~90% of calls with
+a report) in a throwaway SQLite database, then runs the call list, failed
+calls, dashboard stats and agent performance queries for the largest and
+for a small tenant, once scoped through the projects join and once on the
+tenant key:
+
+    python backend/benchmarks/tenant_scope.py --calls 1000000 --companies 200
+
+Point DATABASE_URL at a scratch PostgreSQL database to measure there instead;
+its tables are dropped and recreated.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_tenant_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+
+from sqlalchemy import insert, text  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.models import Call, Company, Project, QAReport  # noqa: E402
+
+PROJECTS_PER_COMPANY = 4
+
+# {scope} is the tenant filter; each query runs with both forms
+SCOPES = {
+    "projects join": ("JOIN projects ON projects.id = calls.project_id", "projects.company_id = :company_id"),
+    "tenant key": ("", "calls.company_id = :company_id"),
+}
+QUERIES = {
+    "call list": (
+        "SELECT calls.* FROM calls {join} WHERE {scope} ORDER BY calls.uploaded_at DESC, calls.id DESC LIMIT 50"
+    ),
+    "failed calls, 30 days": (
+        "SELECT calls.* FROM calls {join} WHERE {scope} AND calls.status = 'failed' "
+        "AND calls.uploaded_at >= :since ORDER BY calls.uploaded_at DESC LIMIT 50"
+    ),
+    "dashboard stats": (
+        "SELECT count(DISTINCT calls.id), count(DISTINCT CASE WHEN calls.status = 'completed' THEN calls.id END), "
+        "avg(qa_reports.overall_score), sum(qa_reports.processing_time_seconds) FROM calls {join} "
+        "LEFT OUTER JOIN qa_reports ON qa_reports.call_id = calls.id WHERE {scope}"
+    ),
+    "agent performance, 30 days": (
+        "SELECT calls.agent_name, count(DISTINCT calls.id), avg(qa_reports.overall_score) FROM calls {join} "
+        "LEFT OUTER JOIN qa_reports ON qa_reports.call_id = calls.id "
+        "WHERE {scope} AND calls.agent_name IS NOT NULL AND calls.uploaded_at >= :since GROUP BY calls.agent_name"
+    ),
+}
+
+def tenant_weights(companies: int):
+    """Zipf-like sizes: company 1 is the largest tenant, the tail is small"""
+    return [1 / rank for rank in range(1, companies + 1)]
+
+def populate(calls: int, companies: int, chunk: int = 50000):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(11)
+    weights = tenant_weights(companies)
+    start = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": c, "name": f"C{c}"} for c in range(1, companies + 1)])
+        conn.execute(insert(Project), [
+            {"id": (c - 1) * PROJECTS_PER_COMPANY + p, "name": f"C{c} P{p}", "company_id": c}
+            for c in range(1, companies + 1) for p in range(1, PROJECTS_PER_COMPANY + 1)
+        ])
+        for first in range(1, calls + 1, chunk):
+            ids = range(first, min(first + chunk, calls + 1))
+            tenants = rng.choices(range(1, companies + 1), weights, k=len(ids))
+            rows = [{
+                "id": i, "company_id": company,
+                "project_id": (company - 1) * PROJECTS_PER_COMPANY + rng.randint(1, PROJECTS_PER_COMPANY),
+                "filename": f"{i}.wav", "s3_key": f"uploads/{i}.wav",
+                "status": rng.choice(["completed"] * 9 + ["failed"]),
+                "agent_name": f"agent-{company}-{rng.randint(1, 40)}",
+                "uploaded_at": start + timedelta(seconds=i * 31536000 // calls)
+            } for i, company in zip(ids, tenants)]
+            conn.execute(insert(Call), rows)
+            conn.execute(insert(QAReport), [
+                {"call_id": r["id"], "company_id": r["company_id"], "overall_score": rng.randint(40, 100),
+                 "processing_time_seconds": 12.0, "created_at": r["uploaded_at"]}
+                for r in rows if r["status"] == "completed"
+            ])
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+def plan(conn, sql: str, values) -> str:
+    if conn.dialect.name == "postgresql":
+        rows = conn.execute(text(f"EXPLAIN {sql}"), values).all()
+        return " | ".join(row[0].strip() for row in rows[:3])
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), values).all()
+    return " | ".join(row[-1] for row in rows)
+
+def timed(conn, sql: str, values, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(text(sql), values).all()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(company_id: int, calls: int, repeat: int, show_plans: bool):
+    values = {"company_id": company_id, "since": datetime(2025, 1, 1) + timedelta(days=335)}
+    with engine.connect() as conn:
+        tenant_calls = conn.execute(text("SELECT count(*) FROM calls WHERE company_id = :company_id"), values).scalar()
+        print(f"\n== company {company_id}: {tenant_calls} of {calls} calls")
+        print(f"{'':<28} {'join ms':>10} {'key ms':>10} {'speedup':>8}")
+        for name, template in QUERIES.items():
+            sql = {scope: template.format(join=join, scope=where) for scope, (join, where) in SCOPES.items()}
+            joined = timed(conn, sql["projects join"], values, repeat)
+            keyed = timed(conn, sql["tenant key"], values, repeat)
+            print(f"{name:<28} {joined * 1000:>10.2f} {keyed * 1000:>10.2f} {joined / keyed:>7.1f}x")
+            if show_plans:
+                for scope, statement in sql.items():
+                    print(f"    {scope:<14} {plan(conn, statement, values)}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500000)
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--plans", action="store_true", help="print the query plans too")
+    args = parser.parse_args()
+
+    populate(args.calls, args.companies)
+    # The largest tenant, and one from the long tail
+    for company_id in (1, args.companies // 2):
+        run(company_id, args.calls, args.repeat, args.plans)
+
+if __name__ == "__main__":
+    main()
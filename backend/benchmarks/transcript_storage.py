@@ -0,0 +1,132 @@
+"""Storage size, qa_reports row width and query time, inline vs offloaded transcripts.
+
+Builds two throwaway SQLite databases with the same calls and reports (a
+few KB of transcript text per report): one with the old layout, where
+transcript and corrected_transcript are plain Text columns of qa_reports,
+and one with the current layout (compressed report_transcripts rows):
+
+    python backend/benchmarks/transcript_storage.py --calls 50000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'qa_unused.db')}")
+
+from sqlalchemy import Column, MetaData, Text, create_engine, insert, text  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models import Call, Company, Project, QAReport, ReportTranscript  # noqa: E402
+
+WORDS = (
+    "hello thank you for calling how can I help today my bill is higher than last month let me check "
+    "that account for you I see a late fee was applied I can remove it this time is there anything else"
+).split()
+
+QUERIES = {
+    # What db.query(QAReport) selects; the old layout drags the transcripts along
+    "report rows, 500 newest": (
+        "SELECT * FROM qa_reports ORDER BY id DESC LIMIT 500"
+    ),
+    "dashboard stats": (
+        "SELECT count(DISTINCT calls.id), avg(qa_reports.overall_score), sum(qa_reports.processing_time_seconds) "
+        "FROM calls LEFT OUTER JOIN qa_reports ON qa_reports.call_id = calls.id"
+    ),
+    "agent performance": (
+        "SELECT calls.agent_name, count(DISTINCT calls.id), avg(qa_reports.overall_score) FROM calls "
+        "LEFT OUTER JOIN qa_reports ON qa_reports.call_id = calls.id "
+        "WHERE calls.agent_name IS NOT NULL GROUP BY calls.agent_name"
+    ),
+}
+
+def legacy_metadata() -> MetaData:
+    """The schema before transcripts moved out of qa_reports"""
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        if table.name != ReportTranscript.__tablename__:
+            table.to_metadata(metadata)
+    metadata.tables["qa_reports"].append_column(Column("transcript", Text))
+    metadata.tables["qa_reports"].append_column(Column("corrected_transcript", Text))
+    return metadata
+
+def transcript(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(400, 1200)))
+
+def populate(engine, metadata: MetaData, legacy: bool, calls: int, chunk: int = 5000):
+    metadata.drop_all(bind=engine)
+    metadata.create_all(bind=engine)
+    rng = random.Random(5)
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": 1, "name": "Bench"}])
+        conn.execute(insert(Project), [{"id": 1, "name": "Bench", "company_id": 1}])
+        for start in range(0, calls, chunk):
+            ids = range(start + 1, min(start + chunk, calls) + 1)
+            conn.execute(insert(Call), [
+                {"id": i, "project_id": 1, "filename": f"{i}.wav", "s3_key": f"uploads/1/{i}.wav",
+                 "status": "completed", "agent_name": f"agent-{i % 50}"}
+                for i in ids
+            ])
+            texts = {i: transcript(rng) for i in ids}
+            reports = [
+                {"id": i, "call_id": i, "overall_score": rng.randint(40, 100), "processing_time_seconds": 12.0,
+                 "agent_summary": "Resolved the billing question", "qa_feedback": "Good empathy, confirm identity earlier"}
+                for i in ids
+            ]
+            if legacy:
+                for report in reports:
+                    report["transcript"] = texts[report["id"]].lower()
+                    report["corrected_transcript"] = texts[report["id"]]
+                conn.execute(metadata.tables["qa_reports"].insert(), reports)
+            else:
+                conn.execute(insert(QAReport), reports)
+                conn.execute(insert(ReportTranscript), [
+                    {"report_id": i, "transcript": texts[i].lower(), "corrected_transcript": texts[i]} for i in ids
+                ])
+    with engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+        conn.exec_driver_sql("ANALYZE")
+
+def table_bytes(conn, name: str) -> int:
+    return conn.execute(text("SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name = :name"), {"name": name}).scalar()
+
+def timed(conn, sql: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(text(sql)).all()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {}
+    for name, legacy, metadata in (("inline", True, legacy_metadata()), ("offloaded", False, Base.metadata)):
+        path = os.path.join(tempfile.gettempdir(), f"qa_transcript_bench_{name}.db")
+        if os.path.exists(path):
+            os.remove(path)
+        engine = create_engine(f"sqlite:///{path}")
+        populate(engine, metadata, legacy, args.calls)
+        with engine.connect() as conn:
+            results[name] = {
+                "file MiB": os.path.getsize(path) / 2**20,
+                "qa_reports MiB": table_bytes(conn, "qa_reports") / 2**20,
+                "qa_reports bytes/row": table_bytes(conn, "qa_reports") / args.calls,
+                "report_transcripts MiB": table_bytes(conn, "report_transcripts") / 2**20,
+                **{f"{query} ms": timed(conn, sql, args.repeat) * 1000 for query, sql in QUERIES.items()},
+            }
+        engine.dispose()
+
+    print(f"{args.calls} calls, one report each")
+    print(f"{'':<32} {'inline':>10} {'offloaded':>10}")
+    for metric in results["inline"]:
+        print(f"{metric:<32} {results['inline'][metric]:>10.1f} {results['offloaded'][metric]:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Registering a nightly drop: one /calls/upload-url request per file vs /calls/upload-url/batch.
+
+Presigns URLs with dummy AWS credentials (signing is local, nothing is sent
+to S3) and inserts the calls into a throwaway SQLite database, then times
+both ways of registering the same files, requests sent in-process:
+
+    python backend/benchmarks/upload_batch.py --files 5000
+
+Per-request network latency comes on top of the single-file path only, so
+the real gap is wider than measured here.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+_scratch = os.path.join(tempfile.gettempdir(), "qa_upload_bench.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+from app import auth  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import Base, async_engine, engine  # noqa: E402
+from app.models import Call, Company, Project, User  # noqa: E402
+from app.routers import calls  # noqa: E402
+
+def populate():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": 1, "name": "Bench"}])
+        conn.execute(insert(Project), [{"id": 1, "name": "Bench", "company_id": 1}])
+        conn.execute(insert(User), [{"id": 1, "email": "manager@example.com", "hashed_password": "x",
+                                     "role": "company_manager", "company_id": 1, "is_active": True}])
+
+def call_count() -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count(Call.id))).scalar()
+
+async def one_by_one(client, headers, files):
+    for file in files:
+        response = await client.post("/calls/upload-url", params={"project_id": 1}, json=file, headers=headers)
+        response.raise_for_status()
+    return len(files)
+
+async def batched(client, headers, files):
+    requests = 0
+    for first in range(0, len(files), settings.upload_batch_max_files):
+        response = await client.post("/calls/upload-url/batch", params={"project_id": 1},
+                                     json={"files": files[first:first + settings.upload_batch_max_files]},
+                                     headers=headers)
+        response.raise_for_status()
+        requests += 1
+    return requests
+
+async def compare(count: int):
+    app = FastAPI()
+    app.include_router(calls.router, prefix="/calls")
+    headers = {"Authorization": f"Bearer {auth.create_access_token({'sub': 'manager@example.com'})}"}
+    files = [{"filename": f"rec_{i:05d}.wav", "content_type": "audio/wav"} for i in range(count)]
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=600) as client:
+        for name, register in (("one by one", one_by_one), ("batch", batched)):
+            before = call_count()
+            start = time.perf_counter()
+            requests = await register(client, headers, files)
+            elapsed = time.perf_counter() - start
+            assert call_count() - before == count
+            results[name] = (requests, elapsed)
+    await async_engine.dispose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=5000)
+    args = parser.parse_args()
+
+    populate()
+    results = asyncio.run(compare(args.files))
+    print(f"{args.files} files registered")
+    print(f"{'':<12} {'requests':>9} {'seconds':>9} {'files/s':>9}")
+    for name, (requests, elapsed) in results.items():
+        print(f"{name:<12} {requests:>9} {elapsed:>9.2f} {args.files / elapsed:>9.0f}")
+
+if __name__ == "__main__":
+    main()
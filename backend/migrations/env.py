@@ -0,0 +1,51 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+from app.database import Base, database_url
+from app import models  # noqa: F401  (registers tables on Base.metadata)
+from app.search import is_search_object
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# ConfigParser treats % as interpolation, which breaks URL-encoded passwords
+config.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
+target_metadata = Base.metadata
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # Search tables, FTS5 shadow tables and trigram indexes are managed outside the metadata
+    return not (reflected and compare_to is None and is_search_object(name))
+
+def run_migrations_offline():
+    context.configure(
+        url=database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=database_url.startswith("sqlite"),
+        include_object=include_object
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool
+    )
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_object=include_object
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
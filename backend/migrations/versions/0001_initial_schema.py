@@ -0,0 +1,96 @@
+"""Initial schema
+
+Matches the tables the app created with create_all() before migrations were
+introduced. Existing deployments should run `alembic stamp 0001` once, then
+`alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "companies",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("is_active", sa.Boolean()),
+    )
+    op.create_index("ix_companies_id", "companies", ["id"])
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("full_name", sa.String(255)),
+        sa.Column("role", sa.String(50)),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id")),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("is_active", sa.Boolean()),
+    )
+    op.create_index("ix_projects_id", "projects", ["id"])
+
+    op.create_table(
+        "calls",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id")),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("s3_key", sa.String(500), nullable=False),
+        sa.Column("s3_output_key", sa.String(500)),
+        sa.Column("transcription_job_name", sa.String(255)),
+        sa.Column("status", sa.String(50)),
+        sa.Column("agent_name", sa.String(255)),
+        sa.Column("customer_name", sa.String(255)),
+        sa.Column("call_duration", sa.Float()),
+        sa.Column("uploaded_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("processed_at", sa.DateTime(timezone=True)),
+        sa.Column("error_message", sa.Text()),
+    )
+    op.create_index("ix_calls_id", "calls", ["id"])
+
+    op.create_table(
+        "qa_reports",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("call_id", sa.Integer(), sa.ForeignKey("calls.id")),
+        sa.Column("transcript", sa.Text()),
+        sa.Column("corrected_transcript", sa.Text()),
+        sa.Column("agent_summary", sa.Text()),
+        sa.Column("qa_scores", sa.JSON()),
+        sa.Column("qa_feedback", sa.Text()),
+        sa.Column("overall_score", sa.Float()),
+        sa.Column("positive_count", sa.Integer()),
+        sa.Column("negative_count", sa.Integer()),
+        sa.Column("neutral_count", sa.Integer()),
+        sa.Column("model_used", sa.String(100)),
+        sa.Column("processing_time_seconds", sa.Float()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_qa_reports_id", "qa_reports", ["id"])
+
+def downgrade():
+    op.drop_table("qa_reports")
+    op.drop_table("calls")
+    op.drop_table("projects")
+    op.drop_table("users")
+    op.drop_table("companies")
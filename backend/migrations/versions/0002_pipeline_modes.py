@@ -0,0 +1,29 @@
+"""Pipeline modes and per-report LLM usage
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("projects", sa.Column("pipeline_mode", sa.String(20)))
+    op.add_column("qa_reports", sa.Column("pipeline_mode", sa.String(20)))
+    op.add_column("qa_reports", sa.Column("llm_latency_seconds", sa.Float()))
+    op.add_column("qa_reports", sa.Column("prompt_tokens", sa.Integer()))
+    op.add_column("qa_reports", sa.Column("completion_tokens", sa.Integer()))
+
+def downgrade():
+    with op.batch_alter_table("qa_reports") as batch:
+        batch.drop_column("completion_tokens")
+        batch.drop_column("prompt_tokens")
+        batch.drop_column("llm_latency_seconds")
+        batch.drop_column("pipeline_mode")
+    with op.batch_alter_table("projects") as batch:
+        batch.drop_column("pipeline_mode")
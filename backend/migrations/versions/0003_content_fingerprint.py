@@ -0,0 +1,25 @@
+"""Audio content fingerprint on calls and prompt version on reports
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("calls", sa.Column("content_fingerprint", sa.String(100)))
+    op.create_index("ix_calls_content_fingerprint", "calls", ["content_fingerprint"])
+    op.add_column("qa_reports", sa.Column("prompt_version", sa.String(20)))
+
+def downgrade():
+    with op.batch_alter_table("qa_reports") as batch:
+        batch.drop_column("prompt_version")
+    op.drop_index("ix_calls_content_fingerprint", table_name="calls")
+    with op.batch_alter_table("calls") as batch:
+        batch.drop_column("content_fingerprint")
@@ -0,0 +1,30 @@
+"""LLM response cache table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "llm_cache_entries",
+        sa.Column("cache_key", sa.String(64), primary_key=True),
+        sa.Column("model", sa.String(100)),
+        sa.Column("temperature", sa.Float()),
+        sa.Column("response", sa.Text(), nullable=False),
+        sa.Column("hits", sa.Integer()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_llm_cache_entries_last_used_at", "llm_cache_entries", ["last_used_at"])
+
+def downgrade():
+    op.drop_index("ix_llm_cache_entries_last_used_at", table_name="llm_cache_entries")
+    op.drop_table("llm_cache_entries")
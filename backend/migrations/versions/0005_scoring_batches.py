@@ -0,0 +1,48 @@
+"""Bulk scoring batches
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "scoring_batches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id")),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("status", sa.String(20)),
+        sa.Column("openai_batch_id", sa.String(100)),
+        sa.Column("input_file_id", sa.String(100)),
+        sa.Column("output_file_id", sa.String(100)),
+        sa.Column("error_file_id", sa.String(100)),
+        sa.Column("call_count", sa.Integer()),
+        sa.Column("request_count", sa.Integer()),
+        sa.Column("scored_count", sa.Integer()),
+        sa.Column("failed_count", sa.Integer()),
+        sa.Column("error_message", sa.Text()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("completed_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_scoring_batches_id", "scoring_batches", ["id"])
+    op.create_index("ix_scoring_batches_openai_batch_id", "scoring_batches", ["openai_batch_id"])
+    with op.batch_alter_table("calls") as batch:
+        batch.add_column(sa.Column("scoring_batch_id", sa.Integer()))
+        batch.create_foreign_key("fk_calls_scoring_batch_id", "scoring_batches", ["scoring_batch_id"], ["id"])
+    op.create_index("ix_calls_scoring_batch_id", "calls", ["scoring_batch_id"])
+
+def downgrade():
+    op.drop_index("ix_calls_scoring_batch_id", table_name="calls")
+    with op.batch_alter_table("calls") as batch:
+        batch.drop_constraint("fk_calls_scoring_batch_id", type_="foreignkey")
+        batch.drop_column("scoring_batch_id")
+    op.drop_index("ix_scoring_batches_openai_batch_id", table_name="scoring_batches")
+    op.drop_index("ix_scoring_batches_id", table_name="scoring_batches")
+    op.drop_table("scoring_batches")
@@ -0,0 +1,51 @@
+"""Agent daily stats rollup
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "agent_daily_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("company_id", sa.Integer(), sa.ForeignKey("companies.id"), nullable=False),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=False),
+        sa.Column("agent_name", sa.String(255), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("total_calls", sa.Integer(), nullable=False),
+        sa.Column("completed_calls", sa.Integer(), nullable=False),
+        sa.Column("score_sum", sa.Float(), nullable=False),
+        sa.Column("score_count", sa.Integer(), nullable=False),
+        sa.UniqueConstraint("company_id", "project_id", "agent_name", "day", name="uq_agent_daily_stats_key"),
+    )
+
+    # Backfill from existing calls; the app keeps it current from here on
+    if op.get_bind().dialect.name == "postgresql":
+        day = "date(timezone('UTC', calls.uploaded_at))"
+    else:
+        day = "date(calls.uploaded_at)"
+    op.execute(f"""
+        INSERT INTO agent_daily_stats
+            (company_id, project_id, agent_name, day, total_calls, completed_calls, score_sum, score_count)
+        SELECT projects.company_id, calls.project_id, calls.agent_name, {day},
+               count(DISTINCT calls.id),
+               count(DISTINCT CASE WHEN calls.status = 'completed' THEN calls.id END),
+               coalesce(sum(qa_reports.overall_score), 0),
+               count(qa_reports.overall_score)
+        FROM calls
+        JOIN projects ON calls.project_id = projects.id
+        LEFT OUTER JOIN qa_reports ON qa_reports.call_id = calls.id
+        WHERE calls.agent_name IS NOT NULL AND projects.company_id IS NOT NULL
+        GROUP BY projects.company_id, calls.project_id, calls.agent_name, {day}
+    """)
+
+def downgrade():
+    op.drop_table("agent_daily_stats")
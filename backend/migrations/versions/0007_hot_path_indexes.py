@@ -0,0 +1,34 @@
+"""Indexes for the calls and qa_reports hot paths
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+PENDING = sa.text("status = 'uploaded'")
+HAS_AGENT = sa.text("agent_name IS NOT NULL")
+
+def upgrade():
+    op.create_index("ix_calls_pending_queue", "calls", ["uploaded_at", "id"],
+                    postgresql_where=PENDING, sqlite_where=PENDING)
+    op.create_index("ix_calls_status_uploaded_at", "calls", ["status", "uploaded_at"])
+    op.create_index("ix_calls_project_uploaded_at", "calls", ["project_id", "uploaded_at"])
+    op.create_index("ix_calls_uploaded_at", "calls", ["uploaded_at"])
+    op.create_index("ix_calls_agent_uploaded_at", "calls", ["agent_name", "uploaded_at"],
+                    postgresql_where=HAS_AGENT, sqlite_where=HAS_AGENT)
+    op.create_index("ix_qa_reports_call_created_at", "qa_reports", ["call_id", "created_at"])
+
+def downgrade():
+    op.drop_index("ix_qa_reports_call_created_at", table_name="qa_reports")
+    op.drop_index("ix_calls_agent_uploaded_at", table_name="calls")
+    op.drop_index("ix_calls_uploaded_at", table_name="calls")
+    op.drop_index("ix_calls_project_uploaded_at", table_name="calls")
+    op.drop_index("ix_calls_status_uploaded_at", table_name="calls")
+    op.drop_index("ix_calls_pending_queue", table_name="calls")
@@ -0,0 +1,24 @@
+"""Add id to the call list indexes for keyset pagination
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.drop_index("ix_calls_project_uploaded_at", table_name="calls")
+    op.create_index("ix_calls_project_uploaded_at", "calls", ["project_id", "uploaded_at", "id"])
+    op.drop_index("ix_calls_uploaded_at", table_name="calls")
+    op.create_index("ix_calls_uploaded_at", "calls", ["uploaded_at", "id"])
+
+def downgrade():
+    op.drop_index("ix_calls_uploaded_at", table_name="calls")
+    op.create_index("ix_calls_uploaded_at", "calls", ["uploaded_at"])
+    op.drop_index("ix_calls_project_uploaded_at", table_name="calls")
+    op.create_index("ix_calls_project_uploaded_at", "calls", ["project_id", "uploaded_at"])
@@ -0,0 +1,82 @@
+"""Search indexes for call filters and report text
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+POSTGRESQL_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_calls_filename_trgm ON calls USING gin (filename gin_trgm_ops)",
+    "CREATE INDEX ix_calls_agent_name_trgm ON calls USING gin (agent_name gin_trgm_ops)",
+    "CREATE INDEX ix_calls_customer_name_trgm ON calls USING gin (customer_name gin_trgm_ops)",
+    """CREATE TABLE qa_report_search (
+        call_id INTEGER PRIMARY KEY REFERENCES calls (id) ON DELETE CASCADE,
+        report_id INTEGER NOT NULL,
+        document TSVECTOR NOT NULL
+    )""",
+    """INSERT INTO qa_report_search (call_id, report_id, document)
+        SELECT DISTINCT ON (call_id) call_id, id, to_tsvector('english',
+            concat_ws(E'\\n', coalesce(corrected_transcript, transcript), qa_feedback))
+        FROM qa_reports ORDER BY call_id, id DESC""",
+    "CREATE INDEX ix_qa_report_search_document ON qa_report_search USING gin (document)",
+]
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE calls_search USING fts5(
+        filename, agent_name, customer_name, content='calls', content_rowid='id', tokenize='trigram'
+    )""",
+    "INSERT INTO calls_search (calls_search) VALUES ('rebuild')",
+    """CREATE TRIGGER calls_search_insert AFTER INSERT ON calls BEGIN
+        INSERT INTO calls_search (rowid, filename, agent_name, customer_name)
+        VALUES (new.id, new.filename, new.agent_name, new.customer_name);
+    END""",
+    """CREATE TRIGGER calls_search_delete AFTER DELETE ON calls BEGIN
+        INSERT INTO calls_search (calls_search, rowid, filename, agent_name, customer_name)
+        VALUES ('delete', old.id, old.filename, old.agent_name, old.customer_name);
+    END""",
+    """CREATE TRIGGER calls_search_update AFTER UPDATE OF filename, agent_name, customer_name ON calls BEGIN
+        INSERT INTO calls_search (calls_search, rowid, filename, agent_name, customer_name)
+        VALUES ('delete', old.id, old.filename, old.agent_name, old.customer_name);
+        INSERT INTO calls_search (rowid, filename, agent_name, customer_name)
+        VALUES (new.id, new.filename, new.agent_name, new.customer_name);
+    END""",
+    """CREATE VIRTUAL TABLE qa_report_search USING fts5(
+        report_id UNINDEXED, body, tokenize='porter unicode61'
+    )""",
+    """INSERT INTO qa_report_search (rowid, report_id, body)
+        SELECT call_id, id, coalesce(corrected_transcript, transcript, '') || char(10) || coalesce(qa_feedback, '')
+        FROM qa_reports WHERE id IN (SELECT max(id) FROM qa_reports GROUP BY call_id)""",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP TABLE qa_report_search",
+    "DROP INDEX ix_calls_customer_name_trgm",
+    "DROP INDEX ix_calls_agent_name_trgm",
+    "DROP INDEX ix_calls_filename_trgm",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TABLE qa_report_search",
+    "DROP TRIGGER calls_search_update",
+    "DROP TRIGGER calls_search_delete",
+    "DROP TRIGGER calls_search_insert",
+    "DROP TABLE calls_search",
+]
+
+def _run(statements):
+    for statement in statements.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+
+def upgrade():
+    # Other databases keep the plain ILIKE filters
+    _run({"postgresql": POSTGRESQL_UPGRADE, "sqlite": SQLITE_UPGRADE})
+
+def downgrade():
+    _run({"postgresql": POSTGRESQL_DOWNGRADE, "sqlite": SQLITE_DOWNGRADE})
@@ -0,0 +1,85 @@
+"""Move report transcripts to a compressed side table
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+import zlib
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+BATCH = 500
+
+reports = sa.table(
+    "qa_reports", sa.column("id", sa.Integer), sa.column("transcript", sa.Text),
+    sa.column("corrected_transcript", sa.Text)
+)
+transcripts = sa.table(
+    "report_transcripts", sa.column("report_id", sa.Integer), sa.column("transcript", sa.LargeBinary),
+    sa.column("corrected_transcript", sa.LargeBinary)
+)
+
+def _compress(value):
+    return None if value is None else zlib.compress(value.encode("utf-8"), 6)
+
+def _decompress(value):
+    return None if value is None else zlib.decompress(value).decode("utf-8")
+
+def upgrade():
+    op.create_table(
+        "report_transcripts",
+        sa.Column("report_id", sa.Integer(), sa.ForeignKey("qa_reports.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("transcript", sa.LargeBinary()),
+        sa.Column("corrected_transcript", sa.LargeBinary()),
+    )
+
+    # Compress in Python, a batch at a time, so large tables never sit in memory
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(reports.c.id, reports.c.transcript, reports.c.corrected_transcript).where(
+                reports.c.id > last_id,
+                sa.or_(reports.c.transcript.isnot(None), reports.c.corrected_transcript.isnot(None))
+            ).order_by(reports.c.id).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(transcripts.insert(), [
+            {"report_id": row.id, "transcript": _compress(row.transcript),
+             "corrected_transcript": _compress(row.corrected_transcript)}
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+    with op.batch_alter_table("qa_reports") as batch:
+        batch.drop_column("corrected_transcript")
+        batch.drop_column("transcript")
+
+def downgrade():
+    with op.batch_alter_table("qa_reports") as batch:
+        batch.add_column(sa.Column("transcript", sa.Text()))
+        batch.add_column(sa.Column("corrected_transcript", sa.Text()))
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(transcripts).where(transcripts.c.report_id > last_id)
+            .order_by(transcripts.c.report_id).limit(BATCH)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            bind.execute(reports.update().where(reports.c.id == row.report_id).values(
+                transcript=_decompress(row.transcript),
+                corrected_transcript=_decompress(row.corrected_transcript)
+            ))
+        last_id = rows[-1].report_id
+
+    op.drop_table("report_transcripts")
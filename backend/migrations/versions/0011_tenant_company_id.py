@@ -0,0 +1,102 @@
+"""Denormalize the tenant onto calls and reports
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+BATCH = 5000
+
+projects = sa.table("projects", sa.column("id", sa.Integer), sa.column("company_id", sa.Integer))
+calls = sa.table(
+    "calls", sa.column("id", sa.Integer), sa.column("project_id", sa.Integer), sa.column("company_id", sa.Integer)
+)
+reports = sa.table(
+    "qa_reports", sa.column("id", sa.Integer), sa.column("call_id", sa.Integer), sa.column("company_id", sa.Integer)
+)
+
+# Batch mode rebuilds the table on SQLite, which drops the calls_search triggers from 0009
+CALLS_SEARCH_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS calls_search_insert AFTER INSERT ON calls BEGIN
+        INSERT INTO calls_search (rowid, filename, agent_name, customer_name)
+        VALUES (new.id, new.filename, new.agent_name, new.customer_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS calls_search_delete AFTER DELETE ON calls BEGIN
+        INSERT INTO calls_search (calls_search, rowid, filename, agent_name, customer_name)
+        VALUES ('delete', old.id, old.filename, old.agent_name, old.customer_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS calls_search_update AFTER UPDATE OF filename, agent_name, customer_name ON calls BEGIN
+        INSERT INTO calls_search (calls_search, rowid, filename, agent_name, customer_name)
+        VALUES ('delete', old.id, old.filename, old.agent_name, old.customer_name);
+        INSERT INTO calls_search (rowid, filename, agent_name, customer_name)
+        VALUES (new.id, new.filename, new.agent_name, new.customer_name);
+    END""",
+    "INSERT INTO calls_search (calls_search) VALUES ('rebuild')",
+]
+
+def _sqlite() -> bool:
+    return op.get_bind().dialect.name == "sqlite"
+
+def _add_company_id(table_name: str, fk_name: str):
+    if _sqlite():
+        # ADD COLUMN may carry an inline REFERENCES on SQLite; no table rebuild needed
+        op.execute(f"ALTER TABLE {table_name} ADD COLUMN company_id INTEGER REFERENCES companies (id)")
+    else:
+        op.add_column(table_name, sa.Column("company_id", sa.Integer()))
+        op.create_foreign_key(fk_name, table_name, "companies", ["company_id"], ["id"])
+
+def _drop_company_id(table_name: str, fk_name: str):
+    if not _sqlite():
+        op.drop_constraint(fk_name, table_name, type_="foreignkey")
+        op.drop_column(table_name, "company_id")
+        return
+    # SQLite cannot drop a column with a foreign key in place
+    with op.batch_alter_table(table_name) as batch:
+        batch.drop_column("company_id")
+    if table_name == "calls" and op.get_bind().exec_driver_sql(
+        "SELECT count(*) FROM sqlite_master WHERE name = 'calls_search'"
+    ).scalar():
+        for statement in CALLS_SEARCH_TRIGGERS:
+            op.execute(statement)
+
+def _backfill(bind, table, value):
+    """Copy the tenant into `table` an id range at a time, keeping each transaction short"""
+    last_id = bind.scalar(sa.select(sa.func.max(table.c.id))) or 0
+    for first in range(1, last_id + 1, BATCH):
+        bind.execute(
+            table.update().where(table.c.id.between(first, first + BATCH - 1)).values(company_id=value)
+        )
+
+def upgrade():
+    _add_company_id("calls", "fk_calls_company_id")
+    _add_company_id("qa_reports", "fk_qa_reports_company_id")
+
+    # Calls first: reports copy the tenant from their call
+    bind = op.get_bind()
+    _backfill(bind, calls, sa.select(projects.c.company_id).where(projects.c.id == calls.c.project_id)
+              .scalar_subquery())
+    _backfill(bind, reports, sa.select(calls.c.company_id).where(calls.c.id == reports.c.call_id)
+              .scalar_subquery())
+
+    op.create_index("ix_calls_company_uploaded_at", "calls", ["company_id", "uploaded_at", "id"])
+    op.create_index("ix_calls_company_status_uploaded_at", "calls", ["company_id", "status", "uploaded_at"])
+    op.create_index(
+        "ix_calls_company_uploaded_agent", "calls", ["company_id", "uploaded_at", "agent_name"],
+        postgresql_where=sa.text("agent_name IS NOT NULL"), sqlite_where=sa.text("agent_name IS NOT NULL")
+    )
+    op.create_index("ix_qa_reports_company_call_created_at", "qa_reports", ["company_id", "call_id", "created_at"])
+
+def downgrade():
+    op.drop_index("ix_qa_reports_company_call_created_at", table_name="qa_reports")
+    op.drop_index("ix_calls_company_uploaded_agent", table_name="calls")
+    op.drop_index("ix_calls_company_status_uploaded_at", table_name="calls")
+    op.drop_index("ix_calls_company_uploaded_at", table_name="calls")
+    _drop_company_id("qa_reports", "fk_qa_reports_company_id")
+    _drop_company_id("calls", "fk_calls_company_id")
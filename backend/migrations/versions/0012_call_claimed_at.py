@@ -0,0 +1,22 @@
+"""Claim time on calls, so stranded processing calls can be requeued
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("calls", sa.Column("claimed_at", sa.DateTime(timezone=True)))
+    # Calls already processing start their clock now
+    op.execute("UPDATE calls SET claimed_at = CURRENT_TIMESTAMP WHERE status = 'processing'")
+
+def downgrade():
+    # A plain DROP COLUMN (SQLite 3.35+); batch mode would rebuild calls and drop the calls_search triggers
+    op.drop_column("calls", "claimed_at")
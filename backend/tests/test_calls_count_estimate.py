@@ -0,0 +1,63 @@
+"""/calls/page include_total: the PostgreSQL planner-estimate branch of _estimate_count"""
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'qa_tests.db')}")
+
+from sqlalchemy import literal, tuple_  # noqa: E402
+from sqlalchemy.dialects.postgresql import asyncpg, psycopg2  # noqa: E402
+from sqlalchemy.orm import Query  # noqa: E402
+from app.models import Call  # noqa: E402
+from app.routers.calls import _estimate_count  # noqa: E402
+
+PLAN = [{"Plan": {"Node Type": "Index Scan", "Plan Rows": 4321}}]
+
+def page_query():
+    """A filtered, keyset-paged call list as /calls/page builds it"""
+    return Query(Call).filter(
+        Call.company_id == 7,
+        Call.status == "failed",
+        Call.uploaded_at >= datetime(2025, 1, 1, tzinfo=timezone.utc),
+        Call.agent_name.ilike("%o'brien: team a%"),
+        tuple_(Call.uploaded_at, Call.id) < tuple_(datetime(2025, 2, 1), literal(99)),
+    )
+
+class FakeSession:
+    """Just enough of a sync Session for _estimate_count; records the statement it runs"""
+
+    def __init__(self, dialect, plan):
+        self.bind = SimpleNamespace(dialect=dialect)
+        self.plan = plan
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(scalar=lambda: self.plan)
+
+def run(dialect, plan):
+    db = FakeSession(dialect, plan)
+    estimate = _estimate_count(db, page_query())
+    assert len(db.statements) == 1
+    compiled = db.statements[0].compile(dialect=dialect)
+    return estimate, str(compiled), compiled.params
+
+def test_asyncpg_explain_has_no_driver_placeholders():
+    # asyncpg returns json undecoded
+    (total, is_estimate), sql, params = run(asyncpg.dialect(), json.dumps(PLAN))
+    assert (total, is_estimate) == (4321, True)
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert params == {}
+    assert "$1" not in sql
+    assert "calls.company_id = 7" in sql
+    assert "'%o''brien: team a%'" in sql
+
+def test_psycopg2_explain_with_decoded_plan():
+    (total, is_estimate), sql, params = run(psycopg2.dialect(), PLAN)
+    assert (total, is_estimate) == (4321, True)
+    assert params == {}
+    assert "%(" not in sql
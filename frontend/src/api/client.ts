@@ -1,5 +1,6 @@
 import axios from 'axios';
 import { getToken, clearToken } from '../auth';
+import type { CallPage, CallSearchHit, PipelineMode } from '../types';
 
 const baseURL = (import.meta as any).env?.VITE_API_BASE_URL || import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 
@@ -65,8 +66,24 @@ export async function getCalls(params: { project_id?: number; status?: string; s
   return res.data;
 }
 
+export async function getCallsPage(params: { project_id?: number; status?: string; start_date?: string; end_date?: string; agent?: string; q?: string; cursor?: string; limit?: number; include_total?: boolean } = {}) {
+  const res = await api.get('/calls/page', { params });
+  return res.data as CallPage;
+}
+
+export async function searchCalls(params: { q: string; project_id?: number; limit?: number }) {
+  const res = await api.get('/calls/search', { params });
+  return res.data as CallSearchHit[];
+}
+
 export async function exportCalls(params: { project_id?: number; status?: string; start_date?: string; end_date?: string; agent?: string; q?: string } = {}) {
-  const res = await api.get('/calls/export', { params, responseType: 'blob' });
+  // The browser undoes the gzip Content-Encoding transparently
+  const res = await api.get('/calls/export', { params: { ...params, gzip: true }, responseType: 'blob' });
+  return res.data as Blob;
+}
+
+export async function exportCallsAnalytics(params: { project_id?: number; status?: string; start_date?: string; end_date?: string; agent?: string; q?: string; format?: 'parquet' | 'arrow' } = {}) {
+  const res = await api.get('/calls/export/analytics', { params, responseType: 'blob' });
   return res.data as Blob;
 }
 
@@ -75,6 +92,11 @@ export async function createUploadUrl(projectId: number, req: { filename: string
   return res.data as { upload_url: string; s3_key: string; call_id: number };
 }
 
+export async function createUploadUrls(projectId: number, files: { filename: string; content_type: string }[]) {
+  const res = await api.post('/calls/upload-url/batch', { files }, { params: { project_id: projectId } });
+  return res.data.uploads as { upload_url: string; s3_key: string; call_id: number }[];
+}
+
 export async function uploadToPresignedUrl(url: string, file: File) {
   const contentType = file.type || 'application/octet-stream';
   // Use plain axios to avoid baseURL
@@ -82,11 +104,16 @@ export async function uploadToPresignedUrl(url: string, file: File) {
   return res.status;
 }
 
-export async function analyzeCall(callId: number, model = 'gpt-4o') {
-  const res = await api.post(`/calls/${callId}/analyze`, null, { params: { model } });
+export async function analyzeCall(callId: number, model = 'gpt-4o', mode?: PipelineMode) {
+  const res = await api.post(`/calls/${callId}/analyze`, null, { params: { model, mode } });
   return res.data;
 }
 
+export async function analyzeCalls(callIds: number[], model = 'gpt-4o', mode?: PipelineMode) {
+  const res = await api.post('/calls/analyze/batch', { call_ids: callIds, model, mode });
+  return res.data as { calls_requested: number; calls_queued: number; pipeline_free_capacity: number };
+}
+
 export async function getCall(callId: number) {
   const res = await api.get(`/calls/${callId}`);
   return res.data;
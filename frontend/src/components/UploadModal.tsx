@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react';
-import { analyzeCall, createUploadUrl, uploadToPresignedUrl } from '../api/client';
+import { analyzeCalls, createUploadUrls, uploadToPresignedUrl } from '../api/client';
 import type { Project } from '../types';
 
 interface Props {
@@ -7,12 +7,17 @@ interface Props {
   onClose: () => void;
   projects: Project[];
   defaultProjectId?: number;
-  onUploaded?: (callId: number) => void;
+  onUploaded?: (callIds: number[]) => void;
 }
 
+// Matches the server's upload_batch_max_files default
+const BATCH_SIZE = 5000;
+// Parallel PUTs to S3; browsers allow about six connections per host
+const UPLOAD_CONCURRENCY = 6;
+
 export default function UploadModal({ open, onClose, projects, defaultProjectId, onUploaded }: Props) {
   const [projectId, setProjectId] = useState<number | ''>(defaultProjectId ?? '');
-  const [file, setFile] = useState<File | null>(null);
+  const [files, setFiles] = useState<File[]>([]);
   const [status, setStatus] = useState<string | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [busy, setBusy] = useState(false);
@@ -20,7 +25,7 @@ export default function UploadModal({ open, onClose, projects, defaultProjectId,
   useEffect(() => {
     if (open) {
       setProjectId(defaultProjectId ?? '');
-      setFile(null);
+      setFiles([]);
       setStatus(null);
       setError(null);
       setBusy(false);
@@ -30,17 +35,49 @@ export default function UploadModal({ open, onClose, projects, defaultProjectId,
   if (!open) return null;
 
   async function startUpload() {
-    if (!file || !projectId) { setError('Select project and file'); return; }
-    setBusy(true); setError(null); setStatus('Requesting upload URL...');
+    if (!files.length || !projectId) { setError('Select project and files'); return; }
+    setBusy(true); setError(null); setStatus('Requesting upload URLs...');
     try {
-      const content_type = file.type || 'application/octet-stream';
-      const { upload_url, call_id } = await createUploadUrl(projectId as number, { filename: file.name, content_type });
-      setStatus('Uploading to S3...');
-      await uploadToPresignedUrl(upload_url, file);
-      setStatus('Starting analysis...');
-      await analyzeCall(call_id);
-      setStatus('Upload and analysis started');
-      onUploaded?.(call_id);
+      // One request registers up to BATCH_SIZE files
+      const uploads: { upload_url: string; call_id: number }[] = [];
+      for (let i = 0; i < files.length; i += BATCH_SIZE) {
+        const chunk = files.slice(i, i + BATCH_SIZE).map(f => ({
+          filename: f.name, content_type: f.type || 'application/octet-stream',
+        }));
+        uploads.push(...await createUploadUrls(projectId as number, chunk));
+      }
+
+      const uploaded: number[] = [];
+      let next = 0, failed = 0;
+      setStatus(`Uploading to S3... 0/${files.length}`);
+      async function worker() {
+        while (next < files.length) {
+          const i = next++;
+          try {
+            await uploadToPresignedUrl(uploads[i].upload_url, files[i]);
+            uploaded.push(uploads[i].call_id);
+          } catch {
+            failed++;
+          }
+          setStatus(`Uploading to S3... ${uploaded.length + failed}/${files.length}`);
+        }
+      }
+      await Promise.all(Array.from({ length: Math.min(UPLOAD_CONCURRENCY, files.length) }, worker));
+
+      if (uploaded.length) {
+        setStatus('Starting analysis...');
+        // Calls the pipeline cannot take yet stay pending and are picked up later
+        for (let i = 0; i < uploaded.length; i += BATCH_SIZE) {
+          await analyzeCalls(uploaded.slice(i, i + BATCH_SIZE));
+        }
+        onUploaded?.(uploaded);
+      }
+      if (failed) {
+        setError(`${failed} of ${files.length} uploads failed`);
+        setStatus(uploaded.length ? `${uploaded.length} uploaded, analysis started` : null);
+        return;
+      }
+      setStatus(files.length > 1 ? `${files.length} uploads done, analysis started` : 'Upload and analysis started');
       setTimeout(onClose, 800);
     } catch (e: any) {
       setError(e?.response?.data?.detail || e?.message || 'Upload failed');
@@ -52,7 +89,7 @@ export default function UploadModal({ open, onClose, projects, defaultProjectId,
   return (
     <div className="modal-overlay" onClick={onClose}>
       <div className="modal" onClick={e=>e.stopPropagation()}>
-        <h2>Upload Call</h2>
+        <h2>Upload Calls</h2>
         <div style={{marginTop:12}}>
           <label>Project</label>
           <select value={projectId} onChange={e=>setProjectId(e.target.value ? Number(e.target.value) : '')}>
@@ -61,8 +98,8 @@ export default function UploadModal({ open, onClose, projects, defaultProjectId,
           </select>
         </div>
         <div style={{marginTop:12}}>
-          <label>Audio File</label>
-          <input type="file" accept="audio/*" onChange={e=>setFile(e.target.files?.[0] || null)} />
+          <label>Audio Files</label>
+          <input type="file" accept="audio/*" multiple onChange={e=>setFiles(Array.from(e.target.files || []))} />
         </div>
         {status && <div style={{marginTop:12, color:'#22c55e'}}>{status}</div>}
         {error && <div style={{marginTop:12, color:'var(--danger)'}}>{error}</div>}
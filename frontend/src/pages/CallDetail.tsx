@@ -113,11 +113,11 @@ export default function CallDetail() {
                 </table>
               </div>
             )}
-            {report.corrected_transcript && (
+            {(report.corrected_transcript || report.transcript) && (
               <div style={{marginTop:12}}>
-                <label>Corrected Transcript</label>
+                <label>{report.corrected_transcript ? 'Corrected Transcript' : 'Transcript'}</label>
                 <div style={{whiteSpace:'pre-wrap', maxHeight:300, overflow:'auto', padding:12, background:'#0b1220', border:'1px solid #253042', borderRadius:8}}>
-                  {report.corrected_transcript}
+                  {report.corrected_transcript || report.transcript}
                 </div>
               </div>
             )}
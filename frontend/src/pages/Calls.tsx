@@ -1,6 +1,6 @@
 import { useEffect, useMemo, useState } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
-import { getCalls, getProjects, exportCalls } from '../api/client';
+import { getCallsPage, getProjects, exportCalls, exportCallsAnalytics, searchCalls } from '../api/client';
 import type { Call, Project } from '../types';
 import UploadModal from '../components/UploadModal';
 
@@ -12,7 +12,11 @@ export default function Calls() {
   const [dateTo, setDateTo] = useState<string>('');
   const [agent, setAgent] = useState<string>('');
   const [q, setQ] = useState<string>('');
+  const [inReports, setInReports] = useState(false);
   const [calls, setCalls] = useState<Call[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [total, setTotal] = useState<{ count: number; estimate: boolean } | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [showUpload, setShowUpload] = useState(false);
@@ -31,27 +35,74 @@ export default function Calls() {
   function isoStart(d: string) { return d ? `${d}T00:00:00Z` : undefined; }
   function isoEnd(d: string) { return d ? `${d}T23:59:59Z` : undefined; }
 
+  function filters() {
+    return {
+      project_id: projectId as number,
+      status: status || undefined,
+      start_date: isoStart(dateFrom),
+      end_date: isoEnd(dateTo),
+      agent: agent || undefined,
+      q: q || undefined,
+      limit: 100,
+    };
+  }
+
   async function loadCalls() {
     if (projectId === '') return;
     setLoading(true);
     try {
-      const data = await getCalls({
+      if (inReports && q.trim().length >= 2) {
+        // Ranked matches in transcripts and feedback; no paging
+        const hits = await searchCalls({ q, project_id: projectId as number, limit: 100 });
+        setCalls(hits.map(h => h.call));
+        setNextCursor(null);
+        setTotal(null);
+        setError(null);
+        return;
+      }
+      const page = await getCallsPage({ ...filters(), include_total: true });
+      setCalls(page.items);
+      setNextCursor(page.next_cursor || null);
+      setTotal(page.total != null ? { count: page.total, estimate: page.total_is_estimate } : null);
+      setError(null);
+    } catch (e: any) {
+      setError(e?.response?.data?.detail || 'Failed to load calls');
+    } finally { setLoading(false); }
+  }
+
+  async function loadMore() {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await getCallsPage({ ...filters(), cursor: nextCursor });
+      setCalls(prev => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor || null);
+    } catch (e: any) {
+      setError(e?.response?.data?.detail || 'Failed to load calls');
+    } finally { setLoadingMore(false); }
+  }
+
+  async function download(kind: 'csv' | 'parquet') {
+    if (projectId === '') return;
+    try {
+      const params = {
         project_id: projectId as number,
         status: status || undefined,
         start_date: isoStart(dateFrom),
         end_date: isoEnd(dateTo),
         agent: agent || undefined,
         q: q || undefined,
-        limit: 100,
-      });
-      setCalls(data);
-      setError(null);
-    } catch (e: any) {
-      setError(e?.response?.data?.detail || 'Failed to load calls');
-    } finally { setLoading(false); }
+      };
+      const blob = kind === 'csv' ? await exportCalls(params) : await exportCallsAnalytics({ ...params, format: 'parquet' });
+      const url = URL.createObjectURL(blob);
+      const a = document.createElement('a');
+      a.href = url; a.download = `calls_${new Date().toISOString().slice(0,10)}.${kind}`;
+      document.body.appendChild(a); a.click(); a.remove();
+      URL.revokeObjectURL(url);
+    } catch (e) { /* noop */ }
   }
 
-  useEffect(() => { if (projectId !== '') loadCalls(); }, [projectId, status, dateFrom, dateTo, agent, q]);
+  useEffect(() => { if (projectId !== '') loadCalls(); }, [projectId, status, dateFrom, dateTo, agent, q, inReports]);
 
   const statusOptions = useMemo(() => ([
     { value: '', label: 'All' },
@@ -95,6 +146,10 @@ export default function Calls() {
           <div>
             <label>Search</label>
             <input type="text" placeholder="Filename, customer..." value={q} onChange={e=>setQ(e.target.value)} />
+            <label style={{display:'flex', alignItems:'center', gap:4, marginTop:4}}>
+              <input type="checkbox" checked={inReports} onChange={e=>setInReports(e.target.checked)} />
+              In transcripts &amp; feedback
+            </label>
           </div>
           <div>
             <label>&nbsp;</label>
@@ -102,24 +157,9 @@ export default function Calls() {
           </div>
           <div style={{textAlign:'right'}}>
             <label>&nbsp;</label>
-            <button className="button secondary" onClick={async ()=>{
-              if (projectId === '') return;
-              try {
-                const blob = await exportCalls({
-                  project_id: projectId as number,
-                  status: status || undefined,
-                  start_date: isoStart(dateFrom),
-                  end_date: isoEnd(dateTo),
-                  agent: agent || undefined,
-                  q: q || undefined,
-                });
-                const url = URL.createObjectURL(blob);
-                const a = document.createElement('a');
-                a.href = url; a.download = `calls_${new Date().toISOString().slice(0,10)}.csv`;
-                document.body.appendChild(a); a.click(); a.remove();
-                URL.revokeObjectURL(url);
-              } catch (e) { /* noop */ }
-            }}>Export CSV</button>
+            <button className="button secondary" onClick={()=>download('csv')}>Export CSV</button>
+            <span style={{marginLeft:8}}/>
+            <button className="button secondary" onClick={()=>download('parquet')}>Export Parquet</button>
             <span style={{marginLeft:8}}/>
             <button className="button" onClick={()=>setShowUpload(true)}>Upload Call</button>
           </div>
@@ -159,6 +199,16 @@ export default function Calls() {
               )}
             </tbody>
           </table>
+          <div style={{display:'flex', justifyContent:'space-between', alignItems:'center', marginTop:12}}>
+            <span style={{color:'var(--muted)'}}>
+              Showing {calls.length}{total ? ` of ${total.estimate ? '~' : ''}${total.count}` : ''}
+            </span>
+            {nextCursor && (
+              <button className="button secondary" disabled={loadingMore} onClick={loadMore}>
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            )}
+          </div>
         </div>
       )}
 
@@ -17,10 +17,13 @@ export interface Project {
   name: string;
   description?: string | null;
   company_id: number;
+  pipeline_mode?: PipelineMode | null;
   created_at?: string;
   is_active: boolean;
 }
 
+export type PipelineMode = 'two_pass' | 'single_pass' | 'score_only';
+
 export interface Call {
   id: number;
   project_id: number;
@@ -28,6 +31,7 @@ export interface Call {
   agent_name?: string | null;
   customer_name?: string | null;
   s3_key: string;
+  content_fingerprint?: string | null;
   s3_output_key?: string | null;
   transcription_job_name?: string | null;
   status: 'uploaded' | 'processing' | 'completed' | 'failed';
@@ -35,6 +39,20 @@ export interface Call {
   uploaded_at: string;
   processed_at?: string | null;
   error_message?: string | null;
+  scoring_batch_id?: number | null;
+}
+
+export interface CallPage {
+  items: Call[];
+  next_cursor?: string | null;
+  total?: number | null;
+  total_is_estimate: boolean;
+}
+
+export interface CallSearchHit {
+  call: Call;
+  report_id: number;
+  rank: number;
 }
 
 export interface QAReport {
@@ -51,5 +69,10 @@ export interface QAReport {
   neutral_count: number;
   model_used?: string | null;
   processing_time_seconds?: number | null;
+  pipeline_mode?: PipelineMode | null;
+  prompt_version?: string | null;
+  llm_latency_seconds?: number | null;
+  prompt_tokens?: number | null;
+  completion_tokens?: number | null;
   created_at: string;
 }